@@ -0,0 +1,95 @@
+"""
+Time and peak memory of decoding raw project returned by PEPhub.
+
+Compares previous path (requests' json decoder + ProjectDict(...).model_dump)
+with current one (fast decoder if installed + ProjectDict.to_raw_dict).
+
+Usage:
+    python -m benchmarks.bench_decode [--samples 1000 10000 100000] [--repeat 3]
+"""
+
+import argparse
+import json
+import time
+import tracemalloc
+from typing import Callable, Tuple
+
+import requests
+
+from pephubclient.helpers import RequestManager, _fast_json_loads
+from pephubclient.models import ProjectDict
+
+
+def build_response(number_of_samples: int) -> requests.Response:
+    project = {
+        "config": {"name": "benchmark", "description": "benchmark project"},
+        "subsample_list": [],
+        "sample_list": [
+            {
+                "sample_name": f"sample{number}",
+                "organism": "human",
+                "protocol": "RNA-seq",
+                "file_path": f"/data/sample{number}.fastq.gz",
+                "read_length": 150,
+            }
+            for number in range(number_of_samples)
+        ],
+    }
+    response = requests.Response()
+    response.status_code = 200
+    response._content = json.dumps(project).encode("utf-8")
+    return response
+
+
+def previous_decode(response: requests.Response) -> dict:
+    return ProjectDict(**response.json()).model_dump(by_alias=True)
+
+
+def current_decode(response: requests.Response) -> dict:
+    return ProjectDict.to_raw_dict(
+        RequestManager.decode_response(response, output_json=True)
+    )
+
+
+def _measure(
+    decode: Callable[[requests.Response], dict],
+    response: requests.Response,
+    repeat: int,
+) -> Tuple[float, float]:
+    best_time = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        decode(response)
+        best_time = min(best_time, time.perf_counter() - start)
+
+    tracemalloc.start()
+    decode(response)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return best_time, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--samples", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    decoder = getattr(_fast_json_loads, "__module__", None) or "json (stdlib)"
+    print(f"fast decoder: {decoder}")
+    for number_of_samples in args.samples:
+        response = build_response(number_of_samples)
+        size = len(response.content) / 1024**2
+        for label, decode in (
+            ("previous", previous_decode),
+            ("current", current_decode),
+        ):
+            best_time, peak = _measure(decode, response, args.repeat)
+            print(
+                f"{number_of_samples:>7} samples ({size:6.1f} MB) {label:<9} "
+                f"time {best_time * 1000:8.1f} ms | peak memory {peak / 1024**2:7.1f} MB"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,260 @@
+"""
+End-to-end benchmark of the client against local PEPhub stand-in (benchmarks/server.py).
+
+Pull, push, search and sample CRUD are run at every project size. Every scenario runs
+in its own process, so that peak RSS is measured per scenario; the server runs in
+this process. Reported are throughput (operations and samples per second), latency
+percentiles of single operations and peak RSS of the client process. Peak RSS includes
+imported modules, which is reported as the "idle" row.
+
+Scenarios:
+    pull     load_raw_pep of project with N samples
+    push     upload (force) of project with N samples
+    search   iter_projects over namespace with N / 10 projects (pages of 100)
+    sample-* create, get, update and remove of --sample-ops samples of project with N samples
+
+Usage:
+    python -m benchmarks.bench_e2e [--samples 1000 10000 100000] [--repeat 5]
+        [--sample-ops 500] [--latency 0.0] [--columns 6] [--scenarios pull push search samples]
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+from typing import Callable, Dict, List
+
+from benchmarks.server import generate_samples, start_server
+
+try:
+    import resource
+except ImportError:
+    # not available on Windows
+    resource = None
+
+NAMESPACE = "benchmark"
+SEARCH_NAMESPACE = "search"
+SCENARIOS = ("pull", "push", "search", "samples")
+
+
+def _peak_rss_mib() -> float:
+    # ru_maxrss of a process started by subprocess can include the RSS of the parent
+    # (server) at fork time on Linux, high water mark of /proc is reset at exec
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    if resource is None:
+        return float("nan")
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # bytes on macOS, kilobytes elsewhere
+    return peak / 1024**2 if sys.platform == "darwin" else peak / 1024
+
+
+def _percentile(timings: List[float], q: float) -> float:
+    timings = sorted(timings)
+    return timings[min(int(len(timings) * q), len(timings) - 1)]
+
+
+def _measure(operation: Callable[[], object], repeat: int) -> List[float]:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        operation()
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def _row(
+    scenario: str, samples: int, timings: List[float], samples_per_op: int
+) -> dict:
+    total_time = sum(timings)
+    return {
+        "scenario": scenario,
+        "samples": samples,
+        "ops": len(timings),
+        "ops_per_s": len(timings) / total_time,
+        "samples_per_s": len(timings) * samples_per_op / total_time,
+        "p50_ms": _percentile(timings, 0.5) * 1000,
+        "p95_ms": _percentile(timings, 0.95) * 1000,
+        "p99_ms": _percentile(timings, 0.99) * 1000,
+    }
+
+
+def run_worker(scenario: str, args: argparse.Namespace) -> List[dict]:
+    """
+    Run one scenario against the server set in PEPHUB_BASE_URL
+
+    :param scenario: name of the scenario (see SCENARIOS), or idle
+    :param args: parsed arguments
+    :return: rows of results
+    """
+    # imported here, after PEPHUB_BASE_URL was set by the parent process
+    import peppy
+
+    from pephubclient import PEPHubClient
+
+    client = PEPHubClient()
+    project_name = f"project{args.samples}"
+    registry_path = f"{NAMESPACE}/{project_name}:default"
+    rows = []
+
+    if scenario == "pull":
+        timings = _measure(lambda: client.load_raw_pep(registry_path), args.repeat)
+        rows.append(_row("pull", args.samples, timings, args.samples))
+
+    elif scenario == "push":
+        project = peppy.Project.from_dict(
+            {
+                "_config": {"pep_version": "2.1.0", "name": "pushed"},
+                "_sample_dict": generate_samples(args.samples, args.columns),
+                "_subsample_list": [],
+            }
+        )
+        timings = _measure(
+            lambda: client.upload(project, namespace=NAMESPACE, force=True),
+            args.repeat,
+        )
+        rows.append(_row("push", args.samples, timings, args.samples))
+
+    elif scenario == "search":
+        number_of_projects = max(args.samples // 10, 1)
+        timings = _measure(
+            lambda: sum(1 for _ in client.iter_projects(SEARCH_NAMESPACE)), args.repeat
+        )
+        rows.append(_row("search", args.samples, timings, number_of_projects))
+
+    elif scenario == "samples":
+        names = [f"new_sample{number}" for number in range(args.sample_ops)]
+        sample = generate_samples(1, args.columns)[0]
+        operations = {
+            "sample-create": lambda name: client.sample.create(
+                NAMESPACE, project_name, "default", name, dict(sample)
+            ),
+            "sample-get": lambda name: client.sample.get(
+                NAMESPACE, project_name, "default", name
+            ),
+            "sample-update": lambda name: client.sample.update(
+                NAMESPACE, project_name, "default", name, {"attr0": "updated"}
+            ),
+            "sample-remove": lambda name: client.sample.remove(
+                NAMESPACE, project_name, "default", name
+            ),
+        }
+        for label, operation in operations.items():
+            timings = []
+            for name in names:
+                start = time.perf_counter()
+                operation(name)
+                timings.append(time.perf_counter() - start)
+            rows.append(_row(label, args.samples, timings, 1))
+
+    client.close()
+    for row in rows:
+        row["peak_rss_mib"] = _peak_rss_mib()
+    if scenario == "idle":
+        rows.append({"scenario": "idle", "samples": 0, "peak_rss_mib": _peak_rss_mib()})
+    return rows
+
+
+def _run_in_subprocess(
+    scenario: str, args: argparse.Namespace, base_url: str
+) -> List[dict]:
+    command = [
+        sys.executable,
+        "-m",
+        "benchmarks.bench_e2e",
+        "--worker",
+        scenario,
+        "--samples",
+        str(args.samples),
+        "--repeat",
+        str(args.repeat),
+        "--sample-ops",
+        str(args.sample_ops),
+        "--columns",
+        str(args.columns),
+    ]
+    result = subprocess.run(
+        command,
+        env={**os.environ, "PEPHUB_BASE_URL": base_url},
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+        check=True,
+        text=True,
+    )
+    # client prints success messages, results are on the last line
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def _print_rows(rows: List[Dict]) -> None:
+    for row in rows:
+        if row["scenario"] == "idle":
+            print(
+                f"{'idle':>14} {'':>8} {'':>7} {'':>10} {'':>12} {'':>9} {'':>9} "
+                f"{'':>9} {row['peak_rss_mib']:>9.1f}"
+            )
+            continue
+        print(
+            f"{row['scenario']:>14} {row['samples']:>8} {row['ops']:>7} "
+            f"{row['ops_per_s']:>10.1f} {row['samples_per_s']:>12.0f} "
+            f"{row['p50_ms']:>9.2f} {row['p95_ms']:>9.2f} {row['p99_ms']:>9.2f} "
+            f"{row['peak_rss_mib']:>9.1f}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--samples", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--sample-ops", type=int, default=500)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--columns", type=int, default=6)
+    parser.add_argument("--scenarios", nargs="+", choices=SCENARIOS, default=SCENARIOS)
+    parser.add_argument("--worker", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        # --samples has a single value in worker processes
+        args.samples = args.samples[0]
+        print(json.dumps(run_worker(args.worker, args)))
+        return None
+
+    base_url, server = start_server(latency=args.latency)
+    print(
+        f"{'scenario':>14} {'samples':>8} {'ops':>7} {'ops/s':>10} {'samples/s':>12} "
+        f"{'p50 [ms]':>9} {'p95 [ms]':>9} {'p99 [ms]':>9} {'RSS [MiB]':>9}"
+    )
+    try:
+        worker_args = argparse.Namespace(**{**vars(args), "samples": 0})
+        _print_rows(_run_in_subprocess("idle", worker_args, base_url))
+        for number_of_samples in args.samples:
+            server.pephub.add_project(
+                NAMESPACE,
+                f"project{number_of_samples}",
+                samples=generate_samples(number_of_samples, args.columns),
+            )
+            for number in range(max(number_of_samples // 10, 1)):
+                server.pephub.add_project(SEARCH_NAMESPACE, f"project{number}")
+
+            worker_args = argparse.Namespace(
+                **{**vars(args), "samples": number_of_samples}
+            )
+            for scenario in args.scenarios:
+                _print_rows(_run_in_subprocess(scenario, worker_args, base_url))
+
+            # free memory of the server before the next size
+            server.pephub.projects.clear()
+    finally:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
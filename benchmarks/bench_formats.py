@@ -0,0 +1,90 @@
+"""
+Reload time and size of sample tables saved by save_pep in csv, parquet and feather.
+
+Reload time is measured both for the table alone (pandas) and for the whole project
+(PEPHubClient.load_project from local directory). Columnar formats require pyarrow.
+
+Usage:
+    python -m benchmarks.bench_formats [--samples 1000 10000 100000] [--repeat 3]
+"""
+
+import argparse
+import os
+import tempfile
+import time
+from typing import Callable
+
+from pephubclient.files_manager import FilesManager
+from pephubclient.helpers import load_local_project, save_pep
+
+FORMATS = ("csv", "parquet", "feather")
+
+
+def build_project(number_of_samples: int) -> dict:
+    return {
+        "_config": {
+            "pep_version": "2.1.0",
+            "name": "benchmark",
+            "description": "benchmark project",
+        },
+        "_sample_dict": [
+            {
+                "sample_name": f"sample{number}",
+                "organism": "human",
+                "protocol": "RNA-seq",
+                "file_path": f"/data/sample{number}.fastq.gz",
+                "read_length": 150,
+                "quality": number / 7,
+            }
+            for number in range(number_of_samples)
+        ],
+        "_subsample_list": [],
+    }
+
+
+def _best_time(function: Callable[[], object], repeat: int) -> float:
+    best_time = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        best_time = min(best_time, time.perf_counter() - start)
+    return best_time
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--samples", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(
+        f"{'samples':>8} {'format':>8} {'size [KiB]':>11} "
+        f"{'table [ms]':>11} {'project [ms]':>13}"
+    )
+    for number_of_samples in args.samples:
+        project = build_project(number_of_samples)
+        for table_format in FORMATS:
+            with tempfile.TemporaryDirectory() as output:
+                try:
+                    save_pep(project, project_path=output, format=table_format)
+                except ImportError as err:
+                    print(f"{table_format}: {err}")
+                    continue
+                project_path = os.path.join(output, "benchmark")
+                table_path = os.path.join(project_path, f"sample_table.{table_format}")
+
+                size = os.path.getsize(table_path)
+                table_time = _best_time(
+                    lambda: FilesManager.load_table(table_path), args.repeat
+                )
+                project_time = _best_time(
+                    lambda: load_local_project(project_path), args.repeat
+                )
+            print(
+                f"{number_of_samples:>8} {table_format:>8} {size / 1024:>11.1f} "
+                f"{table_time * 1000:>11.1f} {project_time * 1000:>13.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
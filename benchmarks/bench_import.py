@@ -0,0 +1,64 @@
+"""
+Start-up time of the command line interface.
+
+Usage:
+    python -m benchmarks.bench_import [--runs 20] [--target 0.5]
+
+Every command is run in a fresh interpreter. Exits with status 1 if median
+time of `phc --help` is above the target (in seconds).
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+from typing import List
+
+COMMANDS = {
+    "python (baseline)": [sys.executable, "-c", "pass"],
+    "import pephubclient": [sys.executable, "-c", "import pephubclient"],
+    "import cli": [sys.executable, "-c", "import pephubclient.cli"],
+    "phc --version": [sys.executable, "-m", "pephubclient", "--version"],
+    "phc --help": [sys.executable, "-m", "pephubclient", "--help"],
+    "import PEPHubClient": [
+        sys.executable,
+        "-c",
+        "from pephubclient import PEPHubClient",
+    ],
+}
+
+
+def _measure(command: List[str], n: int) -> List[float]:
+    timings = []
+    for _ in range(n):
+        start = time.perf_counter()
+        subprocess.run(command, check=True, stdout=subprocess.DEVNULL)
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=20)
+    parser.add_argument(
+        "--target", type=float, default=0.5, help="target for `phc --help` [s]"
+    )
+    args = parser.parse_args()
+
+    medians = {}
+    for label, command in COMMANDS.items():
+        timings = _measure(command, args.runs)
+        medians[label] = statistics.median(timings)
+        print(
+            f"{label:<20} median {medians[label] * 1000:7.1f} ms | "
+            f"min {min(timings) * 1000:7.1f} ms"
+        )
+
+    if medians["phc --help"] > args.target:
+        print(f"`phc --help` is slower than target of {args.target * 1000:.0f} ms")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+Sample table built directly from raw project (PEPHubClient.load_sample_table) compared
+with sample table of peppy project (load_project(...).sample_table).
+
+Both paths start from the same raw project, as returned by load_raw_pep, so network
+time is not included. Reported are the best construction time and peak memory
+allocated during construction (tracemalloc, measured in a separate run), and size
+of the resulting sample table (DataFrame.memory_usage with deep=True).
+
+Usage:
+    python -m benchmarks.bench_sample_table [--samples 1000 10000 100000] [--repeat 3]
+        [--columns 6]
+"""
+
+import argparse
+import time
+import tracemalloc
+from typing import Callable, Tuple
+
+import peppy
+
+from benchmarks.server import generate_samples
+from pephubclient.helpers import build_sample_tables
+
+
+def build_project(number_of_samples: int, columns: int) -> dict:
+    samples = generate_samples(number_of_samples, columns)
+    for number, sample in enumerate(samples):
+        # low cardinality columns, that can be categorical
+        sample["organism"] = ("human", "mouse")[number % 2]
+        sample["protocol"] = ("RNA-seq", "ATAC-seq", "ChIP-seq")[number % 3]
+    return {
+        "_config": {"pep_version": "2.1.0", "name": "benchmark"},
+        "_sample_dict": samples,
+        "_subsample_list": [],
+    }
+
+
+def _measure(function: Callable[[], object], repeat: int) -> Tuple[float, float]:
+    best_time = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        best_time = min(best_time, time.perf_counter() - start)
+
+    tracemalloc.start()
+    function()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return best_time, peak / 1024**2
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--samples", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--columns", type=int, default=6)
+    args = parser.parse_args()
+
+    methods = {
+        "peppy": lambda raw: peppy.Project.from_dict(raw).sample_table,
+        "direct": lambda raw: build_sample_tables(raw)[0],
+        "categorical": lambda raw: build_sample_tables(raw, categorical=True)[0],
+    }
+    print(
+        f"{'samples':>8} {'method':>12} {'time [ms]':>10} {'peak [MiB]':>11} "
+        f"{'table [MiB]':>12}"
+    )
+    for number_of_samples in args.samples:
+        raw_project = build_project(number_of_samples, args.columns)
+        for name, method in methods.items():
+            best_time, peak = _measure(lambda: method(raw_project), args.repeat)
+            table_size = method(raw_project).memory_usage(deep=True).sum()
+            print(
+                f"{number_of_samples:>8} {name:>12} {best_time * 1000:>10.1f} "
+                f"{peak:>11.1f} {table_size / 1024**2:>12.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
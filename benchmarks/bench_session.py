@@ -0,0 +1,70 @@
+"""
+Per-request latency of one-off requests vs. pooled keep-alive session.
+
+Usage:
+    python -m benchmarks.bench_session [--requests 2000] [--url URL]
+
+Without --url, requests go to the local stand-in server (plain HTTP, so
+TLS handshake cost saved by the pool is not included in the numbers).
+"""
+
+import argparse
+import statistics
+import time
+from typing import Callable, List
+
+import requests
+
+from benchmarks.server import generate_samples, start_server
+from pephubclient.helpers import create_session
+
+
+def _measure(send: Callable[[], requests.Response], n: int) -> List[float]:
+    timings = []
+    for _ in range(n):
+        start = time.perf_counter()
+        send().content
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def _report(label: str, timings: List[float]) -> None:
+    timings = sorted(timings)
+    print(
+        f"{label:<18} mean {statistics.mean(timings) * 1000:7.3f} ms | "
+        f"p50 {timings[len(timings) // 2] * 1000:7.3f} ms | "
+        f"p95 {timings[int(len(timings) * 0.95)] * 1000:7.3f} ms"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--url", default=None, help="URL to benchmark against")
+    args = parser.parse_args()
+
+    server = None
+    url = args.url
+    if url is None:
+        base_url, server = start_server()
+        server.pephub.add_project("databio", "example", samples=generate_samples(2))
+        url = base_url + "api/v1/projects/databio/example/samples/sample1?tag=default"
+
+    session = create_session()
+    try:
+        _report(
+            "requests.request",
+            _measure(lambda: requests.request("GET", url, timeout=10), args.requests),
+        )
+        _report(
+            "pooled session",
+            _measure(lambda: session.request("GET", url, timeout=10), args.requests),
+        )
+    finally:
+        session.close()
+        if server:
+            server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,641 @@
+"""
+Local stand-in for PEPhub API used by benchmarks.
+
+Server speaks HTTP/1.1, so connections are kept alive between requests
+the same way PEPhub (behind its proxy) does. It keeps projects, samples, views
+and schemas in memory and implements endpoints used by the client
+(see pephubclient/constants.py and pephubclient/schemas/constants.py).
+Latency added to every response and size of generated projects are configurable.
+
+Client reads PEPhub url from PEPHUB_BASE_URL environment variable when it is imported,
+so point it to the server before importing pephubclient:
+    PEPHUB_BASE_URL=http://127.0.0.1:8000/ python my_script.py
+
+Usage:
+    python -m benchmarks.server [--port 8000] [--latency 0.01] [--samples 1000]
+"""
+
+import argparse
+import datetime
+import hashlib
+import json
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple, Union
+from urllib.parse import parse_qs, urlsplit
+
+# namespace and name of the project created by the stand-alone server
+DEFAULT_NAMESPACE = "benchmark"
+DEFAULT_PROJECT = "project"
+
+# status code and body (dict, or already serialized bytes) returned by request handlers
+_Response = Tuple[int, Union[dict, bytes]]
+
+
+def generate_samples(
+    number_of_samples: int, number_of_columns: int = 6, value_size: int = 16
+) -> List[dict]:
+    """
+    Generate sample table of a project
+
+    :param number_of_samples: number of samples
+    :param number_of_columns: number of attributes of each sample, besides sample_name
+    :param value_size: length of attribute values
+    :return: list of samples
+    """
+    return [
+        {
+            "sample_name": f"sample{number}",
+            **{
+                f"attr{column}": f"{number}_{column}".ljust(value_size, "x")
+                for column in range(number_of_columns)
+            },
+        }
+        for number in range(number_of_samples)
+    ]
+
+
+def _now() -> str:
+    return datetime.datetime.now(datetime.timezone.utc).isoformat()
+
+
+class _Project:
+    def __init__(
+        self,
+        namespace: str,
+        name: str,
+        tag: str,
+        config: dict,
+        samples: List[dict],
+        subsamples: List[dict],
+        is_private: bool = False,
+    ):
+        self.namespace = namespace
+        self.name = name
+        self.tag = tag
+        self.config = config
+        # samples by name, in order of the sample table
+        self.samples = {sample["sample_name"]: sample for sample in samples}
+        self.subsamples = subsamples
+        self.is_private = is_private
+        self.views: Dict[str, List[str]] = {}
+        self.submission_date = _now()
+        self.last_update_date = self.submission_date
+        self._payload: Optional[bytes] = None
+        self._digest: Optional[str] = None
+
+    def touch(self) -> None:
+        self.last_update_date = _now()
+        self._payload = None
+        self._digest = None
+
+    def payload(self) -> bytes:
+        # serialized project is reused until the project changes
+        if self._payload is None:
+            self._payload = json.dumps(
+                self.to_dict(list(self.samples.values()))
+            ).encode("utf-8")
+            self._digest = hashlib.md5(self._payload).hexdigest()
+        return self._payload
+
+    def to_dict(self, samples: List[dict]) -> dict:
+        return {
+            "config": self.config,
+            "sample_list": samples,
+            "subsample_list": self.subsamples,
+        }
+
+    def annotation(self) -> dict:
+        self.payload()
+        return {
+            "namespace": self.namespace,
+            "name": self.name,
+            "tag": self.tag,
+            "is_private": self.is_private,
+            "number_of_samples": len(self.samples),
+            "description": self.config.get("description") or "",
+            "last_update_date": self.last_update_date,
+            "submission_date": self.submission_date,
+            "digest": self._digest,
+        }
+
+
+class FakePEPhub:
+    """
+    In-memory state of the stand-in server, shared by handler threads
+    """
+
+    def __init__(self, latency: float = 0.0):
+        """
+        :param latency: number of seconds added to every response
+        """
+        self.latency = latency
+        self.lock = threading.Lock()
+        self.projects: Dict[Tuple[str, str, str], _Project] = {}
+        # (namespace, schema_name) -> record fields and versions
+        self.schemas: Dict[Tuple[str, str], dict] = {}
+
+    def add_project(
+        self,
+        namespace: str,
+        name: str,
+        tag: str = "default",
+        samples: Optional[List[dict]] = None,
+        config: Optional[dict] = None,
+        subsamples: Optional[List[dict]] = None,
+        is_private: bool = False,
+    ) -> None:
+        """
+        Add project, or replace existing one
+
+        :param namespace: namespace of the project
+        :param name: name of the project
+        :param tag: tag of the project
+        :param samples: sample table, e.g. from generate_samples
+        :param config: project config
+        :param subsamples: subsample table
+        :param is_private: privacy of the project
+        :return: None
+        """
+        config = config or {"pep_version": "2.1.0", "name": name, "description": ""}
+        with self.lock:
+            self.projects[(namespace, name, tag)] = _Project(
+                namespace,
+                name,
+                tag,
+                config,
+                list(samples or []),
+                list(subsamples or []),
+                is_private,
+            )
+
+    def add_schema(
+        self, namespace: str, schema_name: str, version: str, schema: dict
+    ) -> None:
+        """
+        Add schema version, creating schema record if needed
+
+        :param namespace: namespace of the schema
+        :param schema_name: name of the schema
+        :param version: version
+        :param schema: schema value
+        :return: None
+        """
+        with self.lock:
+            record = self.schemas.setdefault(
+                (namespace, schema_name), {"record": {}, "versions": {}}
+            )
+            record["versions"][version] = self._schema_version(
+                namespace, schema_name, version, schema
+            )
+
+    @staticmethod
+    def _schema_version(
+        namespace: str,
+        schema_name: str,
+        version: str,
+        schema: dict,
+        contributors: Optional[str] = None,
+        release_notes: Optional[str] = None,
+    ) -> dict:
+        return {
+            "schema": schema,
+            "annotation": {
+                "namespace": namespace,
+                "schema_name": schema_name,
+                "version": version,
+                "contributors": contributors or "",
+                "release_notes": release_notes or "",
+                "tags": {},
+                "release_date": _now(),
+                "last_update_date": _now(),
+            },
+        }
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # headers and body are written separately; without this, delayed ACKs
+    # stall every keep-alive response by ~40 ms
+    disable_nagle_algorithm = True
+
+    # (method, path pattern, handler method name), matched in order
+    ROUTES = [
+        ("GET", r"/api/v1/projects/([^/]+)/([^/]+)", "get_project"),
+        ("GET", r"/api/v1/projects/([^/]+)/([^/]+)/annotation", "get_annotation"),
+        ("GET", r"/api/v1/namespaces/([^/]+)/projects", "search_projects"),
+        ("POST", r"/api/v1/namespaces/([^/]+)/projects/json", "push_project"),
+        ("GET", r"/api/v1/projects/([^/]+)/([^/]+)/samples/([^/]+)", "get_sample"),
+        ("POST", r"/api/v1/projects/([^/]+)/([^/]+)/samples/([^/]+)", "create_sample"),
+        ("PATCH", r"/api/v1/projects/([^/]+)/([^/]+)/samples/([^/]+)", "update_sample"),
+        (
+            "DELETE",
+            r"/api/v1/projects/([^/]+)/([^/]+)/samples/([^/]+)",
+            "remove_sample",
+        ),
+        ("GET", r"/api/v1/projects/([^/]+)/([^/]+)/views/([^/]+)", "get_view"),
+        ("POST", r"/api/v1/projects/([^/]+)/([^/]+)/views/([^/]+)", "create_view"),
+        ("DELETE", r"/api/v1/projects/([^/]+)/([^/]+)/views/([^/]+)", "delete_view"),
+        (
+            "POST",
+            r"/api/v1/projects/([^/]+)/([^/]+)/views/([^/]+)/([^/]+)",
+            "add_view_sample",
+        ),
+        (
+            "DELETE",
+            r"/api/v1/projects/([^/]+)/([^/]+)/views/([^/]+)/([^/]+)",
+            "remove_view_sample",
+        ),
+        ("POST", r"/api/v1/schemas/([^/]+)/json", "create_schema"),
+        ("POST", r"/api/v1/schemas/([^/]+)/([^/]+)/versions/json", "add_version"),
+        ("GET", r"/api/v1/schemas/([^/]+)/([^/]+)/versions", "get_versions"),
+        ("GET", r"/api/v1/schemas/([^/]+)/([^/]+)/versions/([^/]+)", "get_schema"),
+        (
+            "PATCH",
+            r"/api/v1/schemas/([^/]+)/([^/]+)/versions/([^/]+)",
+            "update_version",
+        ),
+        (
+            "DELETE",
+            r"/api/v1/schemas/([^/]+)/([^/]+)/versions/([^/]+)",
+            "delete_version",
+        ),
+        ("PATCH", r"/api/v1/schemas/([^/]+)/([^/]+)", "update_record"),
+        ("DELETE", r"/api/v1/schemas/([^/]+)/([^/]+)", "delete_schema"),
+    ]
+    COMPILED_ROUTES = [
+        (method, re.compile(pattern), name) for method, pattern, name in ROUTES
+    ]
+
+    @property
+    def pephub(self) -> FakePEPhub:
+        return self.server.pephub
+
+    def _send(self, status: int, payload: bytes) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def _read_body(self):
+        length = int(self.headers.get("Content-Length", 0))
+        return json.loads(self.rfile.read(length)) if length else None
+
+    def _dispatch(self) -> None:
+        url = urlsplit(self.path)
+        self.query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        # body is read before routing, so that keep-alive connection stays usable
+        self.body = self._read_body()
+        if self.pephub.latency:
+            time.sleep(self.pephub.latency)
+        status, body = 404, {"detail": "Not Found"}
+        for method, pattern, name in self.COMPILED_ROUTES:
+            match = pattern.fullmatch(url.path)
+            if method == self.command and match:
+                # handlers return status and body (dict, or already serialized bytes)
+                with self.pephub.lock:
+                    status, body = getattr(self, name)(*match.groups())
+                    if not isinstance(body, bytes):
+                        body = json.dumps(body).encode("utf-8")
+                break
+        else:
+            body = json.dumps(body).encode("utf-8")
+        # response is written outside the lock, so that large projects don't block other requests
+        self._send(status, body)
+
+    do_GET = do_POST = do_PATCH = do_DELETE = _dispatch
+
+    def log_message(self, format, *args):
+        pass
+
+    def _project(self, namespace: str, name: str) -> Optional[_Project]:
+        return self.pephub.projects.get(
+            (namespace, name, self.query.get("tag", "default"))
+        )
+
+    # projects
+
+    def get_project(self, namespace: str, name: str) -> _Response:
+        project = self._project(namespace, name)
+        if project is None:
+            return 404, {"detail": "Project does not exist."}
+        return 200, project.payload()
+
+    def get_annotation(self, namespace: str, name: str) -> _Response:
+        project = self._project(namespace, name)
+        if project is None:
+            return 404, {"detail": "Project does not exist."}
+        return 200, project.annotation()
+
+    def search_projects(self, namespace: str) -> _Response:
+        query = self.query.get("q", "")
+        # client sends tag=None, if tag is not set
+        tag = self.query.get("tag", "None")
+        found = [
+            project
+            for (project_namespace, _, project_tag), project in sorted(
+                self.pephub.projects.items()
+            )
+            if project_namespace == namespace
+            and query in project.name
+            and (tag == "None" or project_tag == tag)
+        ]
+        limit = int(self.query.get("limit", 100))
+        offset = int(self.query.get("offset", 0))
+        return (
+            200,
+            {
+                "count": len(found),
+                "limit": limit,
+                "offset": offset,
+                "results": [
+                    project.annotation() for project in found[offset : offset + limit]
+                ],
+            },
+        )
+
+    def push_project(self, namespace: str) -> _Response:
+        pep_dict = self.body["pep_dict"]
+        config = pep_dict["config"]
+        tag = self.body.get("tag") or "default"
+        key = (namespace, config["name"], tag)
+        if key in self.pephub.projects and not self.body.get("overwrite"):
+            return 409, {"detail": "Project already exists."}
+        self.pephub.projects[key] = _Project(
+            namespace,
+            config["name"],
+            tag,
+            config,
+            pep_dict["sample_list"],
+            pep_dict.get("subsample_list") or [],
+            self.body.get("is_private", False),
+        )
+        return 202, {}
+
+    # samples
+
+    def get_sample(self, namespace: str, name: str, sample_name: str) -> _Response:
+        project = self._project(namespace, name)
+        if project is None or sample_name not in project.samples:
+            return 404, {"detail": "Sample does not exist."}
+        return 200, project.samples[sample_name]
+
+    def create_sample(self, namespace: str, name: str, sample_name: str) -> _Response:
+        project = self._project(namespace, name)
+        if project is None:
+            return 404, {"detail": "Project does not exist."}
+        if sample_name in project.samples and self.query.get("overwrite") != "true":
+            return 409, {"detail": "Sample already exists."}
+        project.samples[sample_name] = {**self.body, "sample_name": sample_name}
+        project.touch()
+        return 202, {}
+
+    def update_sample(self, namespace: str, name: str, sample_name: str) -> _Response:
+        project = self._project(namespace, name)
+        if project is None or sample_name not in project.samples:
+            return 404, {"detail": "Sample does not exist."}
+        project.samples[sample_name].update(self.body)
+        project.touch()
+        return 202, {}
+
+    def remove_sample(self, namespace: str, name: str, sample_name: str) -> _Response:
+        project = self._project(namespace, name)
+        if project is None or project.samples.pop(sample_name, None) is None:
+            return 404, {"detail": "Sample does not exist."}
+        project.touch()
+        return 202, {}
+
+    # views
+
+    def get_view(self, namespace: str, name: str, view_name: str) -> _Response:
+        project = self._project(namespace, name)
+        if project is None or view_name not in project.views:
+            return 404, {"detail": "View does not exist."}
+        return (
+            200,
+            project.to_dict(
+                [
+                    project.samples[sample_name]
+                    for sample_name in project.views[view_name]
+                    if sample_name in project.samples
+                ]
+            ),
+        )
+
+    def create_view(self, namespace: str, name: str, view_name: str) -> _Response:
+        project = self._project(namespace, name)
+        if project is None:
+            return 404, {"detail": "Project does not exist."}
+        if view_name in project.views:
+            return 409, {"detail": "View already exists."}
+        missing = [
+            sample_name
+            for sample_name in self.body
+            if sample_name not in project.samples
+        ]
+        if missing and self.query.get("no_fail") != "True":
+            return 404, {"detail": f"Samples not found: {missing}"}
+        project.views[view_name] = [
+            sample_name for sample_name in self.body if sample_name in project.samples
+        ]
+        return 202, {}
+
+    def delete_view(self, namespace: str, name: str, view_name: str) -> _Response:
+        project = self._project(namespace, name)
+        if project is None or project.views.pop(view_name, None) is None:
+            return 404, {"detail": "View does not exist."}
+        return 202, {}
+
+    def add_view_sample(
+        self, namespace: str, name: str, view_name: str, sample_name: str
+    ) -> _Response:
+        project = self._project(namespace, name)
+        if (
+            project is None
+            or view_name not in project.views
+            or sample_name not in project.samples
+        ):
+            return 404, {"detail": "View or sample does not exist."}
+        if sample_name in project.views[view_name]:
+            return 409, {"detail": "Sample already in view."}
+        project.views[view_name].append(sample_name)
+        return 202, {}
+
+    def remove_view_sample(
+        self, namespace: str, name: str, view_name: str, sample_name: str
+    ) -> _Response:
+        project = self._project(namespace, name)
+        view = project.views.get(view_name) if project else None
+        if view is None or sample_name not in view:
+            return 404, {"detail": "View or sample does not exist."}
+        view.remove(sample_name)
+        return 202, {}
+
+    # schemas
+
+    def _schema(self, namespace: str, schema_name: str) -> Optional[dict]:
+        return self.pephub.schemas.get((namespace, schema_name))
+
+    def create_schema(self, namespace: str) -> _Response:
+        body = self.body
+        key = (namespace, body["schema_name"])
+        if key in self.pephub.schemas:
+            return 409, {"detail": "Schema already exists."}
+        self.pephub.schemas[key] = {
+            "record": {
+                field: body.get(field)
+                for field in (
+                    "description",
+                    "maintainers",
+                    "lifecycle_stage",
+                    "private",
+                )
+            },
+            "versions": {
+                body["version"]: FakePEPhub._schema_version(
+                    namespace,
+                    body["schema_name"],
+                    body["version"],
+                    body["schema_value"],
+                    body.get("contributors"),
+                    body.get("release_notes"),
+                )
+            },
+        }
+        return 202, {}
+
+    def add_version(self, namespace: str, schema_name: str) -> _Response:
+        schema = self._schema(namespace, schema_name)
+        if schema is None:
+            return 404, {"detail": "Schema does not exist."}
+        schema["versions"][self.body["version"]] = FakePEPhub._schema_version(
+            namespace,
+            schema_name,
+            self.body["version"],
+            self.body["schema_value"],
+            self.body.get("contributors"),
+            self.body.get("release_notes"),
+        )
+        return 202, {}
+
+    def get_versions(self, namespace: str, schema_name: str) -> _Response:
+        schema = self._schema(namespace, schema_name)
+        if schema is None:
+            return 404, {"detail": "Schema does not exist."}
+        versions = [version["annotation"] for version in schema["versions"].values()]
+        return (
+            200,
+            {
+                "pagination": {
+                    "page": 0,
+                    "page_size": len(versions),
+                    "total": len(versions),
+                },
+                "results": versions,
+            },
+        )
+
+    def _version(self, namespace: str, schema_name: str, version: str):
+        schema = self._schema(namespace, schema_name)
+        if schema is None or not schema["versions"]:
+            return None
+        if version == "latest":
+            return max(
+                schema["versions"].values(),
+                key=lambda value: value["annotation"]["release_date"],
+            )
+        return schema["versions"].get(version)
+
+    def get_schema(self, namespace: str, schema_name: str, version: str) -> _Response:
+        found = self._version(namespace, schema_name, version)
+        if found is None:
+            return 404, {"detail": "Schema does not exist."}
+        return 200, found["schema"]
+
+    def update_version(
+        self, namespace: str, schema_name: str, version: str
+    ) -> _Response:
+        found = self._version(namespace, schema_name, version)
+        if found is None:
+            return 404, {"detail": "Schema does not exist."}
+        fields = dict(self.body)
+        if fields.get("schema_value"):
+            found["schema"] = json.loads(fields.pop("schema_value"))
+        found["annotation"].update(fields, last_update_date=_now())
+        return 202, {}
+
+    def delete_version(
+        self, namespace: str, schema_name: str, version: str
+    ) -> _Response:
+        schema = self._schema(namespace, schema_name)
+        if schema is None or schema["versions"].pop(version, None) is None:
+            return 404, {"detail": "Schema does not exist."}
+        return 202, {}
+
+    def update_record(self, namespace: str, schema_name: str) -> _Response:
+        schema = self._schema(namespace, schema_name)
+        if schema is None:
+            return 404, {"detail": "Schema does not exist."}
+        schema["record"].update(self.body)
+        return 202, {}
+
+    def delete_schema(self, namespace: str, schema_name: str) -> _Response:
+        if self.pephub.schemas.pop((namespace, schema_name), None) is None:
+            return 404, {"detail": "Schema does not exist."}
+        return 202, {}
+
+
+def start_server(
+    host: str = "127.0.0.1",
+    port: int = 0,
+    latency: float = 0.0,
+    pephub: Optional[FakePEPhub] = None,
+) -> Tuple[str, ThreadingHTTPServer]:
+    """
+    Start stand-in server in a background thread.
+
+    :param host: host to bind
+    :param port: port to bind. 0 picks a free port
+    :param latency: number of seconds added to every response
+    :param pephub: state of the server. Default: empty FakePEPhub
+    :return: (base url ending with "/", server object). State of the server is available
+        as server.pephub. Call server.shutdown() to stop it
+    """
+    server = ThreadingHTTPServer((host, port), _Handler)
+    server.daemon_threads = True
+    server.pephub = pephub or FakePEPhub(latency=latency)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return f"http://{host}:{server.server_address[1]}/", server
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--samples", type=int, default=1000)
+    parser.add_argument("--columns", type=int, default=6)
+    args = parser.parse_args()
+
+    base_url, server = start_server(args.host, args.port, latency=args.latency)
+    server.pephub.add_project(
+        DEFAULT_NAMESPACE,
+        DEFAULT_PROJECT,
+        samples=generate_samples(args.samples, args.columns),
+    )
+    print(
+        f"Serving PEPhub stand-in at {base_url} "
+        f"(project {DEFAULT_NAMESPACE}/{DEFAULT_PROJECT}:default)"
+    )
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
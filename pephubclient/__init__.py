@@ -1,7 +1,4 @@
-from pephubclient.pephubclient import PEPHubClient
-from pephubclient.helpers import is_registry_path, save_pep
-import logging
-import coloredlogs
+import importlib
 
 __app_name__ = "pephubclient"
 __version__ = "0.5.1"
@@ -9,7 +6,14 @@ __author__ = "Oleksandr Khoroshevskyi, Rafal Stepien"
 
 
 __all__ = [
+    "HistogramHook",
+    "LoggingHook",
     "PEPHubClient",
+    "ProjectCache",
+    "RequestHook",
+    "RetryPolicy",
+    "SchemaCache",
+    "TokenExpiryPolicy",
     __app_name__,
     __author__,
     __version__,
@@ -17,10 +21,29 @@ __all__ = [
     "save_pep",
 ]
 
+# Public objects are imported on first access, so that `import pephubclient`
+# (and the CLI) doesn't load peppy, pandas and pydantic until they are needed.
+_LAZY_IMPORTS = {
+    "HistogramHook": "pephubclient.instrumentation",
+    "LoggingHook": "pephubclient.instrumentation",
+    "PEPHubClient": "pephubclient.pephubclient",
+    "ProjectCache": "pephubclient.cache",
+    "RequestHook": "pephubclient.instrumentation",
+    "RetryPolicy": "pephubclient.models",
+    "SchemaCache": "pephubclient.schemas.cache",
+    "TokenExpiryPolicy": "pephubclient.models",
+    "is_registry_path": "pephubclient.helpers",
+    "save_pep": "pephubclient.helpers",
+}
 
-_LOGGER = logging.getLogger(__app_name__)
-coloredlogs.install(
-    logger=_LOGGER,
-    datefmt="%H:%M:%S",
-    fmt="[%(levelname)s] [%(asctime)s] %(message)s",
-)
+
+def __getattr__(name: str):
+    if name in _LAZY_IMPORTS:
+        value = getattr(importlib.import_module(_LAZY_IMPORTS[name]), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(list(globals()) + list(_LAZY_IMPORTS))
@@ -0,0 +1,18 @@
+try:
+    import httpx  # noqa: F401
+except ImportError as err:
+    raise ImportError(
+        "Async client requires 'httpx'. Install it with: pip install pephubclient[async]"
+    ) from err
+
+from pephubclient.aio.pephubclient import AsyncPEPHubClient
+from pephubclient.aio.sample import AsyncPEPHubSample
+from pephubclient.aio.schema import AsyncPEPHubSchema
+from pephubclient.aio.view import AsyncPEPHubView
+
+__all__ = [
+    "AsyncPEPHubClient",
+    "AsyncPEPHubSample",
+    "AsyncPEPHubSchema",
+    "AsyncPEPHubView",
+]
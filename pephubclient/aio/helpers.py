@@ -0,0 +1,161 @@
+import asyncio
+import logging
+import time
+from typing import Optional, Union
+
+import httpx
+
+from pephubclient.constants import DEFAULT_POOL_SIZE
+from pephubclient.exceptions import JWTExpiredError
+from pephubclient.helpers import RequestManager, get_jwt_expiration
+from pephubclient.models import RetryPolicy
+
+_LOGGER = logging.getLogger("pephubclient")
+
+# errors of connection or reading the response, that may succeed when retried
+RETRYABLE_EXCEPTIONS = (
+    httpx.TimeoutException,
+    httpx.NetworkError,
+    httpx.RemoteProtocolError,
+)
+
+
+def create_async_client(pool_size: int = DEFAULT_POOL_SIZE) -> httpx.AsyncClient:
+    """
+    Create httpx async client backed by keep-alive connection pool.
+
+    :param pool_size: maximum number of open connections
+    :return: httpx async client
+    """
+    return httpx.AsyncClient(
+        limits=httpx.Limits(
+            max_connections=pool_size, max_keepalive_connections=pool_size
+        ),
+        verify=False,
+        timeout=10,
+    )
+
+
+class AsyncRequestManager:
+    """
+    Asyncio counterpart of RequestManager. Requests are sent through shared httpx.AsyncClient.
+    """
+
+    parse_query_param = staticmethod(RequestManager.parse_query_param)
+    parse_header = staticmethod(RequestManager.parse_header)
+
+    def __init__(
+        self,
+        client: Optional[httpx.AsyncClient] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+    ):
+        """
+        :param client: httpx async client used to send requests. If not provided,
+            new client with its own connection pool is created.
+        :param retry_policy: policy of retrying failed requests. Default: RetryPolicy()
+        """
+        self._client = client or create_async_client()
+        self._retry_policy = retry_policy or RetryPolicy()
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        return self._client
+
+    @property
+    def retry_policy(self) -> RetryPolicy:
+        return self._retry_policy
+
+    @staticmethod
+    def decode_response(
+        response: httpx.Response, encoding: str = "utf-8", output_json: bool = False
+    ) -> Union[str, dict]:
+        """
+        Decode the response from PEPhub.
+
+        :param response: Response from PEPhub.
+        :param encoding: Response encoding [Default: utf-8]
+        :param output_json: If True, return response in json format
+        :return: Decoded response data.
+        """
+        return RequestManager.decode_response(
+            response, encoding=encoding, output_json=output_json
+        )
+
+    async def send_request(
+        self,
+        method: str,
+        url: str,
+        headers: Optional[dict] = None,
+        cookies: Optional[dict] = None,
+        params: Optional[dict] = None,
+        json: Optional[Union[dict, list]] = None,
+    ) -> httpx.Response:
+        if headers and headers.get("Authorization"):
+            expiration = get_jwt_expiration(headers["Authorization"])
+            if expiration is not None and expiration <= time.time():
+                raise JWTExpiredError()
+        if params:
+            # requests drops parameters set to None, httpx sends them as empty strings
+            params = {key: value for key, value in params.items() if value is not None}
+
+        policy = self._retry_policy
+        can_retry_method = policy.can_retry_method(method)
+        deadline = (
+            time.monotonic() + policy.total_timeout if policy.total_timeout else None
+        )
+
+        attempt = 0
+        while True:
+            connect_timeout, read_timeout = policy.connect_timeout, policy.read_timeout
+            if deadline:
+                remaining = max(deadline - time.monotonic(), 0.001)
+                connect_timeout = min(connect_timeout, remaining)
+                read_timeout = min(read_timeout, remaining)
+            try:
+                request_return = await self._client.request(
+                    method=method,
+                    url=url,
+                    cookies=cookies,
+                    headers=headers,
+                    params=params,
+                    json=json,
+                    timeout=httpx.Timeout(read_timeout, connect=connect_timeout),
+                )
+            except RETRYABLE_EXCEPTIONS as err:
+                # request that failed to connect never reached the server
+                if attempt >= policy.max_retries or not (
+                    can_retry_method
+                    or isinstance(err, (httpx.ConnectError, httpx.ConnectTimeout))
+                ):
+                    raise
+                delay = policy.get_backoff(attempt)
+                if deadline and time.monotonic() + delay >= deadline:
+                    raise
+                _LOGGER.debug(f"{method} {url} failed: {err}. Retrying in {delay:.2f}s")
+            else:
+                if (
+                    request_return.status_code not in policy.retry_statuses
+                    or not can_retry_method
+                    or attempt >= policy.max_retries
+                ):
+                    break
+                delay = policy.get_backoff(
+                    attempt, retry_after=request_return.headers.get("Retry-After")
+                )
+                if deadline and time.monotonic() + delay >= deadline:
+                    break
+                _LOGGER.debug(
+                    f"{method} {url} returned {request_return.status_code}. "
+                    f"Retrying in {delay:.2f}s"
+                )
+
+            await asyncio.sleep(delay)
+            attempt += 1
+
+        if request_return.status_code == 401:
+            if (
+                self.decode_response(request_return, output_json=True).get("detail")
+                == "JWT has expired"
+            ):
+                raise JWTExpiredError()
+        return request_return
@@ -0,0 +1,292 @@
+from typing import Literal, Optional
+
+import peppy
+from peppy.const import CONFIG_KEY, NAME_KEY
+
+from pephubclient.aio.helpers import AsyncRequestManager, create_async_client
+from pephubclient.aio.sample import AsyncPEPHubSample
+from pephubclient.aio.schema import AsyncPEPHubSchema
+from pephubclient.aio.view import AsyncPEPHubView
+from pephubclient.constants import (
+    DEFAULT_POOL_SIZE,
+    PATH_TO_FILE_WITH_JWT,
+    ResponseStatusCodes,
+)
+from pephubclient.exceptions import ResponseError
+from pephubclient.files_manager import FilesManager
+from pephubclient.helpers import MessageHandler
+from pephubclient.models import (
+    ProjectDict,
+    ProjectUploadData,
+    RetryPolicy,
+    SearchReturnModel,
+)
+from pephubclient.urls import (
+    build_project_search_url,
+    build_pull_request_url,
+    build_push_request_url,
+    parse_project_registry_path,
+)
+
+
+class AsyncPEPHubClient(AsyncRequestManager):
+    """
+    Asyncio counterpart of PEPHubClient.
+
+    All requests made by the client and its view, sample and schema
+    members share one httpx connection pool, so many requests can be
+    in flight from a single event loop, e.g.:
+
+        async with AsyncPEPHubClient() as phc:
+            projects = await asyncio.gather(
+                *[phc.load_raw_pep(path) for path in registry_paths]
+            )
+    """
+
+    def __init__(
+        self,
+        pool_size: int = DEFAULT_POOL_SIZE,
+        retry_policy: Optional[RetryPolicy] = None,
+    ):
+        """
+        :param pool_size: maximum number of open connections held by the client.
+            Connection pool is shared by view, sample and schema clients.
+        :param retry_policy: policy of retrying failed requests, shared by view, sample
+            and schema clients. Default: RetryPolicy()
+        """
+        super().__init__(
+            client=create_async_client(pool_size), retry_policy=retry_policy
+        )
+        self.__jwt_data = FilesManager.load_jwt_data_from_file(PATH_TO_FILE_WITH_JWT)
+
+        self.__view = AsyncPEPHubView(
+            self.__jwt_data, client=self.client, retry_policy=self.retry_policy
+        )
+        self.__sample = AsyncPEPHubSample(
+            self.__jwt_data, client=self.client, retry_policy=self.retry_policy
+        )
+        self.__schema = AsyncPEPHubSchema(
+            self.__jwt_data, client=self.client, retry_policy=self.retry_policy
+        )
+
+    async def __aenter__(self) -> "AsyncPEPHubClient":
+        return self
+
+    async def __aexit__(self, *args) -> None:
+        await self.aclose()
+
+    @property
+    def view(self) -> AsyncPEPHubView:
+        return self.__view
+
+    @property
+    def sample(self) -> AsyncPEPHubSample:
+        return self.__sample
+
+    @property
+    def schema(self) -> AsyncPEPHubSchema:
+        return self.__schema
+
+    async def aclose(self) -> None:
+        """
+        Close all keep-alive connections held by the client
+        """
+        await self.client.aclose()
+
+    async def load_raw_pep(
+        self,
+        registry_path: str,
+        query_param: Optional[dict] = None,
+    ) -> dict:
+        """
+        Request PEPhub and return the requested project as raw dict.
+
+        :param registry_path: Project namespace, eg. "geo/GSE124224:tag"
+        :param query_param: Optional variables to be passed to PEPhub
+        :return: Raw project in dict.
+        """
+        query_param = dict(query_param or {})
+        query_param["raw"] = "true"
+
+        pephub_response = await self.send_request(
+            method="GET",
+            url=build_pull_request_url(
+                parse_project_registry_path(registry_path),
+                query_param=query_param,
+            ),
+            headers=self.parse_header(self.__jwt_data),
+            cookies=None,
+        )
+        if pephub_response.status_code == ResponseStatusCodes.OK:
+            decoded_response = self.decode_response(pephub_response, output_json=True)
+            return ProjectDict.to_raw_dict(decoded_response)
+
+        if pephub_response.status_code == ResponseStatusCodes.NOT_EXIST:
+            raise ResponseError("File does not exist, or you are unauthorized.")
+        raise ResponseError(
+            f"Internal server error. Unexpected return value. Error: {pephub_response.status_code}"
+        )
+
+    async def load_project(
+        self,
+        project_registry_path: str,
+        query_param: Optional[dict] = None,
+    ) -> peppy.Project:
+        """
+        Load peppy project from PEPhub in peppy.Project object
+
+        :param project_registry_path: registry path of the project
+        :param query_param: query parameters used in get request
+        :return Project: peppy project.
+        """
+        raw_pep = await self.load_raw_pep(project_registry_path, query_param)
+        return peppy.Project().from_dict(raw_pep)
+
+    async def push(
+        self,
+        cfg: str,
+        namespace: str,
+        name: Optional[str] = None,
+        tag: Optional[str] = None,
+        is_private: Optional[bool] = False,
+        force: Optional[bool] = False,
+    ) -> None:
+        """
+        Push (upload/update) project to Pephub using config/csv path
+
+        :param str cfg: Project config file (YAML) or sample table (CSV/TSV)
+            with one row per sample to constitute project
+        :param str namespace: namespace
+        :param str name: project name
+        :param str tag: project tag
+        :param bool is_private: Specifies whether project should be private [Default= False]
+        :param bool force: Force push to the database. Use it to update, or upload project. [Default= False]
+        :return: None
+        """
+        await self.upload(
+            project=peppy.Project(cfg=cfg),
+            namespace=namespace,
+            name=name,
+            tag=tag,
+            is_private=is_private,
+            force=force,
+        )
+
+    async def upload(
+        self,
+        project: peppy.Project,
+        namespace: str,
+        name: str = None,
+        tag: str = None,
+        is_private: bool = False,
+        force: bool = True,
+    ) -> None:
+        """
+        Upload peppy project to the PEPhub.
+
+        :param peppy.Project project: Project object that has to be uploaded to the DB
+        :param namespace: namespace
+        :param name: project name
+        :param tag: project tag
+        :param is_private: Make project private
+        :param force: overwrite project if it exists
+        :return: None
+        """
+        pep_dict = project.to_dict(
+            extended=True,
+            orient="records",
+        )
+        if name:
+            pep_dict[CONFIG_KEY][NAME_KEY] = name
+
+        upload_data = ProjectUploadData(
+            pep_dict=pep_dict,
+            tag=tag,
+            is_private=is_private,
+            overwrite=force,
+        )
+        pephub_response = await self.send_request(
+            method="POST",
+            url=build_push_request_url(namespace=namespace),
+            headers=self.parse_header(self.__jwt_data),
+            json=upload_data.model_dump(),
+            cookies=None,
+        )
+        if pephub_response.status_code == ResponseStatusCodes.ACCEPTED:
+            MessageHandler.print_success(
+                f"Project '{namespace}/{name}:{upload_data.tag}' was successfully uploaded"
+            )
+        elif pephub_response.status_code == ResponseStatusCodes.CONFLICT:
+            raise ResponseError(
+                "Project already exists. Set force to overwrite project."
+            )
+        elif pephub_response.status_code == ResponseStatusCodes.UNAUTHORIZED:
+            raise ResponseError("Unauthorized! Failure in uploading project.")
+        elif pephub_response.status_code == ResponseStatusCodes.FORBIDDEN:
+            raise ResponseError(
+                "User does not have permission to write to this namespace!"
+            )
+        else:
+            detail = ""
+            try:
+                detail = self.decode_response(pephub_response, output_json=True).get(
+                    "detail", ""
+                )
+            except Exception:
+                pass
+            raise ResponseError(
+                f"Unexpected Response Error. {pephub_response.status_code}: {detail}"
+                if detail
+                else f"Unexpected Response Error. {pephub_response.status_code}"
+            )
+        return None
+
+    async def find_project(
+        self,
+        namespace: str,
+        query_string: str = "",
+        tag: str = None,
+        limit: int = 100,
+        offset: int = 0,
+        filter_by: Literal["submission_date", "last_update_date"] = None,
+        start_date: str = None,
+        end_date: str = None,
+    ) -> SearchReturnModel:
+        """
+        Find project in specific namespace and return list of PEP annotation
+
+        :param namespace: Namespace where to search for projects
+        :param query_string: Search query
+        :param tag: Project tag
+        :param limit: Return limit
+        :param offset: Return offset
+        :param filter_by: Use filter date. Option: [submission_date, last_update_date]
+        :param start_date: filter beginning date
+        :param end_date: filter end date (if none today's date is used)
+        :return:
+        """
+        query_param = {
+            "q": query_string,
+            "limit": limit,
+            "offset": offset,
+            "tag": tag,
+        }
+        if filter_by in ["submission_date", "last_update_date"]:
+            query_param["filter_by"] = filter_by
+            query_param["filter_start_date"] = start_date
+            if end_date:
+                query_param["filter_end_date"] = end_date
+
+        pephub_response = await self.send_request(
+            method="GET",
+            url=build_project_search_url(namespace=namespace, query_param=query_param),
+            headers=self.parse_header(self.__jwt_data),
+            json=None,
+            cookies=None,
+        )
+        if pephub_response.status_code == ResponseStatusCodes.OK:
+            decoded_response = self.decode_response(pephub_response, output_json=True)
+            return SearchReturnModel(**decoded_response)
+        raise ResponseError(
+            f"Unexpected return value. Error: {pephub_response.status_code}"
+        )
@@ -0,0 +1,201 @@
+import logging
+
+import httpx
+
+from pephubclient.aio.helpers import AsyncRequestManager
+from pephubclient.constants import ResponseStatusCodes
+from pephubclient.exceptions import ResponseError
+from pephubclient.models import RetryPolicy
+from pephubclient.urls import build_sample_request_url
+
+_LOGGER = logging.getLogger("pephubclient")
+
+
+class AsyncPEPHubSample(AsyncRequestManager):
+    """
+    Asyncio counterpart of PEPHubSample. Provides methods for
+        getting, creating, updating and removing samples.
+    """
+
+    def __init__(
+        self,
+        jwt_data: str = None,
+        client: httpx.AsyncClient = None,
+        retry_policy: RetryPolicy = None,
+    ):
+        """
+        :param jwt_data: jwt token for authorization
+        :param client: httpx async client shared with other PEPhub clients
+        :param retry_policy: policy of retrying failed requests
+        """
+        super().__init__(client=client, retry_policy=retry_policy)
+        self.__jwt_data = jwt_data
+
+    async def get(
+        self,
+        namespace: str,
+        name: str,
+        tag: str,
+        sample_name: str = None,
+    ) -> dict:
+        """
+        Get sample from project in PEPhub.
+
+        :param namespace: namespace of project
+        :param name: name of project
+        :param tag: tag of project
+        :param sample_name: sample name
+        :return: Sample object
+        """
+        url = build_sample_request_url(
+            namespace=namespace, name=name, sample_name=sample_name
+        )
+        url = url + self.parse_query_param(pep_variables={"tag": tag})
+
+        response = await self.send_request(
+            method="GET", url=url, headers=self.parse_header(self.__jwt_data)
+        )
+        if response.status_code == ResponseStatusCodes.OK:
+            return self.decode_response(response, output_json=True)
+        if response.status_code == ResponseStatusCodes.NOT_EXIST:
+            raise ResponseError(
+                f"Sample does not exist. Project: '{namespace}/{name}:{tag}'. Sample_name: '{sample_name}'"
+            )
+        elif response.status_code == ResponseStatusCodes.INTERNAL_ERROR:
+            raise ResponseError("Internal server error. Unexpected return value.")
+        else:
+            raise ResponseError(
+                f"Unexpected return value. Error: {response.status_code}"
+            )
+
+    async def create(
+        self,
+        namespace: str,
+        name: str,
+        tag: str,
+        sample_name: str,
+        sample_dict: dict,
+        overwrite: bool = False,
+    ) -> None:
+        """
+        Create sample in project in PEPhub.
+
+        :param namespace: namespace of project
+        :param name: name of project
+        :param tag: tag of project
+        :param sample_dict: sample dict
+        :param sample_name: sample name
+        :param overwrite: overwrite sample if it exists
+        :return: None
+        """
+        url = build_sample_request_url(
+            namespace=namespace, name=name, sample_name=sample_name
+        )
+        url = url + self.parse_query_param(
+            pep_variables={"tag": tag, "overwrite": overwrite}
+        )
+
+        # add sample name to sample_dict if it is not there
+        if sample_name not in sample_dict.values():
+            sample_dict["sample_name"] = sample_name
+
+        response = await self.send_request(
+            method="POST",
+            url=url,
+            headers=self.parse_header(self.__jwt_data),
+            json=sample_dict,
+        )
+        if response.status_code == ResponseStatusCodes.ACCEPTED:
+            _LOGGER.info(
+                f"Sample '{sample_name}' added to project '{namespace}/{name}:{tag}' successfully."
+            )
+            return None
+        elif response.status_code == ResponseStatusCodes.NOT_EXIST:
+            raise ResponseError(f"Project '{namespace}/{name}:{tag}' does not exist.")
+        elif response.status_code == ResponseStatusCodes.CONFLICT:
+            raise ResponseError(
+                f"Sample '{sample_name}' already exists. Set overwrite to True to overwrite sample."
+            )
+        else:
+            raise ResponseError(
+                f"Unexpected return value. Error: {response.status_code}"
+            )
+
+    async def update(
+        self,
+        namespace: str,
+        name: str,
+        tag: str,
+        sample_name: str,
+        sample_dict: dict,
+    ) -> None:
+        """
+        Update sample in project in PEPhub.
+
+        :param namespace: namespace of project
+        :param name: name of project
+        :param tag: tag of project
+        :param sample_name: sample name
+        :param sample_dict: sample dict, that contain elements to update, or
+        :return: None
+        """
+        url = build_sample_request_url(
+            namespace=namespace, name=name, sample_name=sample_name
+        )
+        url = url + self.parse_query_param(pep_variables={"tag": tag})
+
+        response = await self.send_request(
+            method="PATCH",
+            url=url,
+            headers=self.parse_header(self.__jwt_data),
+            json=sample_dict,
+        )
+        if response.status_code == ResponseStatusCodes.ACCEPTED:
+            _LOGGER.info(
+                f"Sample '{sample_name}' updated in project '{namespace}/{name}:{tag}' successfully."
+            )
+            return None
+        elif response.status_code == ResponseStatusCodes.NOT_EXIST:
+            raise ResponseError(
+                f"Sample '{sample_name}' or project {namespace}/{name}:{tag} does not exist. Error: {response.status_code}"
+            )
+        else:
+            raise ResponseError(
+                f"Unexpected return value. Error: {response.status_code}"
+            )
+
+    async def remove(
+        self, namespace: str, name: str, tag: str, sample_name: str
+    ) -> None:
+        """
+        Remove sample from project in PEPhub.
+
+        :param namespace: namespace of project
+        :param name: name of project
+        :param tag: tag of project
+        :param sample_name: sample name
+        :return: None
+        """
+        url = build_sample_request_url(
+            namespace=namespace, name=name, sample_name=sample_name
+        )
+        url = url + self.parse_query_param(pep_variables={"tag": tag})
+
+        response = await self.send_request(
+            method="DELETE",
+            url=url,
+            headers=self.parse_header(self.__jwt_data),
+        )
+        if response.status_code == ResponseStatusCodes.ACCEPTED:
+            _LOGGER.info(
+                f"Sample '{sample_name}' removed from project '{namespace}/{name}:{tag}' successfully."
+            )
+            return None
+        elif response.status_code == ResponseStatusCodes.NOT_EXIST:
+            raise ResponseError(
+                f"Sample '{sample_name}' or project {namespace}/{name}:{tag} does not exist. Error: {response.status_code}"
+            )
+        else:
+            raise ResponseError(
+                f"Unexpected return value. Error: {response.status_code}"
+            )
@@ -0,0 +1,368 @@
+import logging
+from typing import List, Optional, Union
+
+import httpx
+
+from pephubclient.aio.helpers import AsyncRequestManager
+from pephubclient.constants import ResponseStatusCodes
+from pephubclient.exceptions import ResponseError
+from pephubclient.models import RetryPolicy
+from pephubclient.schemas.constants import (
+    LATEST_VERSION,
+    PEPHUB_SCHEMA_NEW_SCHEMA_URL,
+    PEPHUB_SCHEMA_NEW_VERSION_URL,
+    PEPHUB_SCHEMA_RECORD_URL,
+    PEPHUB_SCHEMA_VERSION_URL,
+    PEPHUB_SCHEMA_VERSIONS_URL,
+)
+from pephubclient.schemas.models import (
+    NewSchemaRecordModel,
+    NewSchemaVersionModel,
+    SchemaVersionResult,
+    UpdateSchemaRecordFields,
+    UpdateSchemaVersionFields,
+)
+
+_LOGGER = logging.getLogger("pephubclient")
+
+
+class AsyncPEPHubSchema(AsyncRequestManager):
+    """
+    Asyncio counterpart of PEPHubSchema. Provides methods for
+        getting, creating, updating and removing schemas records and schema versions.
+    """
+
+    def __init__(
+        self,
+        jwt_data: str = None,
+        client: httpx.AsyncClient = None,
+        retry_policy: RetryPolicy = None,
+    ):
+        """
+        :param jwt_data: jwt token for authorization
+        :param client: httpx async client shared with other PEPhub clients
+        :param retry_policy: policy of retrying failed requests
+        """
+        super().__init__(client=client, retry_policy=retry_policy)
+        self.__jwt_data = jwt_data
+
+    async def get(
+        self, namespace: str, schema_name: str, version: str = LATEST_VERSION
+    ) -> dict:
+        """
+        Get schema value for specific schema version.
+
+        :param: namespace: namespace of schema
+        :param: schema_name: name of schema
+        :param: version: version of schema
+
+        :return: Schema object as dictionary
+        """
+        pephub_response = await self.send_request(
+            method="GET",
+            url=PEPHUB_SCHEMA_VERSION_URL.format(
+                namespace=namespace, schema_name=schema_name, version=version
+            ),
+            headers=self.parse_header(self.__jwt_data),
+            cookies=None,
+        )
+        if pephub_response.status_code == ResponseStatusCodes.OK:
+            return self.decode_response(pephub_response, output_json=True)
+        self._raise_for_read_response(pephub_response)
+
+    async def get_versions(
+        self, namespace: str, schema_name: str
+    ) -> SchemaVersionResult:
+        """
+        Get list of versions
+
+        :param namespace: Namespace of the schema record
+        :param schema_name: Name of the schema record
+
+        :return: {
+            pagination: PaginationResult
+            results: List[SchemaVersionAnnotation]
+        }
+        """
+        pephub_response = await self.send_request(
+            method="GET",
+            url=PEPHUB_SCHEMA_VERSIONS_URL.format(
+                namespace=namespace, schema_name=schema_name
+            ),
+            headers=self.parse_header(self.__jwt_data),
+            cookies=None,
+        )
+        if pephub_response.status_code == ResponseStatusCodes.OK:
+            decoded_response = self.decode_response(pephub_response, output_json=True)
+            return SchemaVersionResult(**decoded_response)
+        self._raise_for_read_response(pephub_response)
+
+    async def create_schema(
+        self,
+        namespace: str,
+        schema_name: str,
+        schema_value: dict,
+        version: str = "1.0.0",
+        description: str = None,
+        maintainers: str = None,
+        contributors: str = None,
+        release_notes: str = None,
+        tags: Union[str, List[str], dict, None] = None,
+        lifecycle_stage: str = None,
+        private: bool = False,
+    ) -> None:
+        """
+        Create a new schema record + version in the database
+
+        :param namespace: Namespace of the schema
+        :param schema_name: Name of the schema record
+        :param schema_value: Schema value itself in dict format
+        :param version: First version of the schema
+        :param description: Schema description
+        :param maintainers: Schema maintainers
+        :param contributors: Schema contributors of current version
+        :param release_notes: Release notes for current version
+        :param tags: Tags of the current version. Can be str, list[str], or dict
+        :param lifecycle_stage: Stage of the schema record
+        :param private: Weather project should be public or private. Default: False (public)
+
+        :raise: ResponseError if status not 202.
+        :return: None
+        """
+        request_body = NewSchemaRecordModel(
+            schema_name=schema_name,
+            description=description,
+            maintainers=maintainers,
+            lifecycle_stage=lifecycle_stage,
+            private=private,
+            contributors=contributors,
+            release_notes=release_notes,
+            tags=tags,
+            version=version,
+            schema_value=schema_value,
+        ).model_dump(exclude_none=True)
+
+        pephub_response = await self.send_request(
+            method="POST",
+            url=PEPHUB_SCHEMA_NEW_SCHEMA_URL.format(namespace=namespace),
+            headers=self.parse_header(self.__jwt_data),
+            cookies=None,
+            json=request_body,
+        )
+        self._check_write_response(
+            pephub_response,
+            f"Schema '{namespace}/{schema_name}:{version}' successfully created in PEPhub",
+        )
+
+    async def add_version(
+        self,
+        namespace: str,
+        schema_name: str,
+        schema_value: dict,
+        version: str = "1.0.0",
+        contributors: str = None,
+        release_notes: str = None,
+        tags: Union[str, List[str], dict, None] = None,
+    ) -> None:
+        """
+        Add new version to the schema registry
+
+        :param namespace: Namespace of the schema
+        :param schema_name: Name of the schema record
+        :param schema_value: Schema value itself in dict format
+        :param version: First version of the schema
+        :param contributors: Schema contributors of current version
+        :param release_notes: Release notes for current version
+        :param tags: Tags of the current version. Can be str, list[str], or dict
+
+        :raise: ResponseError if status not 202.
+        :return: None
+        """
+        request_body = NewSchemaVersionModel(
+            contributors=contributors,
+            release_notes=release_notes,
+            tags=tags,
+            version=version,
+            schema_value=schema_value,
+        ).model_dump(exclude_none=True, exclude_unset=True)
+
+        pephub_response = await self.send_request(
+            method="POST",
+            url=PEPHUB_SCHEMA_NEW_VERSION_URL.format(
+                namespace=namespace, schema_name=schema_name
+            ),
+            headers=self.parse_header(self.__jwt_data),
+            cookies=None,
+            json=request_body,
+        )
+        self._check_write_response(
+            pephub_response,
+            f"Schema version '{namespace}/{schema_name}:{version}' successfully created in PEPhub",
+        )
+
+    async def update_record(
+        self,
+        namespace: str,
+        schema_name: str,
+        update_fields: Union[dict, UpdateSchemaRecordFields],
+    ) -> None:
+        """
+        Update schema registry data
+
+        :param namespace: Namespace of the schema
+        :param schema_name: Name of the schema version
+        :param update_fields: dict or pydantic model UpdateSchemaRecordFields
+
+        :raise: ResponseError if status not 202.
+        :return: None
+        """
+        if isinstance(update_fields, dict):
+            update_fields = UpdateSchemaRecordFields(**update_fields)
+
+        pephub_response = await self.send_request(
+            method="PATCH",
+            url=PEPHUB_SCHEMA_RECORD_URL.format(
+                namespace=namespace, schema_name=schema_name
+            ),
+            headers=self.parse_header(self.__jwt_data),
+            cookies=None,
+            json=update_fields.model_dump(exclude_none=True, exclude_unset=True),
+        )
+        self._check_write_response(
+            pephub_response,
+            f"Schema record '{namespace}/{schema_name}' was updated successfully!",
+            not_exist_message="Schema doesn't exist in PEPhub",
+        )
+
+    async def update_version(
+        self,
+        namespace: str,
+        schema_name: str,
+        version: str,
+        update_fields: Union[dict, UpdateSchemaVersionFields],
+    ) -> None:
+        """
+        Update released version of the schema.
+
+        :param namespace: Namespace of the schema
+        :param schema_name: Name of the schema version
+        :param version: Schema version
+        :param update_fields: dict or pydantic model UpdateSchemaVersionFields
+
+        :raise: ResponseError if status not 202.
+        :return: None
+        """
+        if isinstance(update_fields, dict):
+            update_fields = UpdateSchemaVersionFields(**update_fields)
+
+        pephub_response = await self.send_request(
+            method="PATCH",
+            url=PEPHUB_SCHEMA_VERSION_URL.format(
+                namespace=namespace, schema_name=schema_name, version=version
+            ),
+            headers=self.parse_header(self.__jwt_data),
+            cookies=None,
+            json=update_fields.model_dump(exclude_unset=True, exclude_none=True),
+        )
+        self._check_write_response(
+            pephub_response,
+            f"Schema version '{namespace}/{schema_name}:{version}' was updated successfully!",
+            not_exist_message="Schema doesn't exist in PEPhub",
+        )
+
+    async def delete_schema(self, namespace: str, schema_name: str) -> None:
+        """
+        Delete schema from the database
+
+        :param namespace: Namespace of the schema
+        :param schema_name: Name of the schema version
+        """
+        pephub_response = await self.send_request(
+            method="DELETE",
+            url=PEPHUB_SCHEMA_RECORD_URL.format(
+                namespace=namespace, schema_name=schema_name
+            ),
+            headers=self.parse_header(self.__jwt_data),
+            cookies=None,
+        )
+        self._check_write_response(
+            pephub_response,
+            f"Schema record '{namespace}/{schema_name}' was deleted successfully!",
+            not_exist_message="Schema doesn't exist in PEPhub",
+        )
+
+    async def delete_version(
+        self,
+        namespace: str,
+        schema_name: str,
+        version: str,
+    ) -> None:
+        """
+        Delete schema Version
+
+        :param namespace: Namespace of the schema
+        :param schema_name: Name of the schema
+        :param version: Schema version
+
+        :raise: ResponseError if status not 202.
+        :return: None
+        """
+        pephub_response = await self.send_request(
+            method="DELETE",
+            url=PEPHUB_SCHEMA_VERSION_URL.format(
+                namespace=namespace, schema_name=schema_name, version=version
+            ),
+            headers=self.parse_header(self.__jwt_data),
+            cookies=None,
+        )
+        self._check_write_response(
+            pephub_response,
+            f"Schema version '{namespace}/{schema_name}:{version}' was deleted successfully!",
+            not_exist_message="Schema doesn't exist in PEPhub",
+        )
+
+    @staticmethod
+    def _raise_for_read_response(pephub_response: httpx.Response) -> None:
+        """
+        Raise error for unsuccessful schema GET request
+
+        :param pephub_response: response from PEPhub
+        """
+        if pephub_response.status_code == ResponseStatusCodes.NOT_EXIST:
+            raise ResponseError("Schema doesn't exist, or you are unauthorized.")
+        if pephub_response.status_code == ResponseStatusCodes.INTERNAL_ERROR:
+            raise ResponseError(
+                f"Internal server error. Unexpected return value. Error: {pephub_response.status_code}"
+            )
+        raise ResponseError(
+            f"Unexpected Status code return. Error: {pephub_response.status_code}"
+        )
+
+    @staticmethod
+    def _check_write_response(
+        pephub_response: httpx.Response,
+        success_message: str,
+        not_exist_message: Optional[str] = None,
+    ) -> None:
+        """
+        Log success or raise error for schema write request
+
+        :param pephub_response: response from PEPhub
+        :param success_message: message logged when request was accepted
+        :param not_exist_message: error message for 404 response
+        """
+        if pephub_response.status_code == ResponseStatusCodes.ACCEPTED:
+            _LOGGER.info(success_message)
+            return None
+        if (
+            not_exist_message
+            and pephub_response.status_code == ResponseStatusCodes.NOT_EXIST
+        ):
+            raise ResponseError(not_exist_message)
+        if pephub_response.status_code == ResponseStatusCodes.UNAUTHORIZED:
+            raise ResponseError(
+                "User not authorized or doesn't have permission to write to this namespace"
+            )
+        raise ResponseError(
+            f"Unexpected error. Status code: {pephub_response.status_code}"
+        )
@@ -0,0 +1,243 @@
+import logging
+from typing import Union
+
+import httpx
+import peppy
+
+from pephubclient.aio.helpers import AsyncRequestManager
+from pephubclient.constants import ResponseStatusCodes
+from pephubclient.exceptions import ResponseError
+from pephubclient.models import ProjectDict, RetryPolicy
+from pephubclient.urls import build_view_request_url
+
+_LOGGER = logging.getLogger("pephubclient")
+
+
+class AsyncPEPHubView(AsyncRequestManager):
+    """
+    Asyncio counterpart of PEPHubView. Provides methods for
+        getting, creating, updating and removing views.
+    """
+
+    def __init__(
+        self,
+        jwt_data: str = None,
+        client: httpx.AsyncClient = None,
+        retry_policy: RetryPolicy = None,
+    ):
+        """
+        :param jwt_data: jwt token for authorization
+        :param client: httpx async client shared with other PEPhub clients
+        :param retry_policy: policy of retrying failed requests
+        """
+        super().__init__(client=client, retry_policy=retry_policy)
+        self.__jwt_data = jwt_data
+
+    async def get(
+        self, namespace: str, name: str, tag: str, view_name: str, raw: bool = False
+    ) -> Union[peppy.Project, dict]:
+        """
+        Get view from project in PEPhub.
+
+        :param namespace: namespace of project
+        :param name: name of project
+        :param tag: tag of project
+        :param view_name: name of the view
+        :param raw: if True, return raw response
+        :return: peppy.Project object or dictionary of the project (view)
+        """
+        url = build_view_request_url(
+            namespace=namespace, name=name, view_name=view_name
+        )
+        url = url + self.parse_query_param(pep_variables={"tag": tag})
+
+        response = await self.send_request(
+            method="GET", url=url, headers=self.parse_header(self.__jwt_data)
+        )
+        if response.status_code == ResponseStatusCodes.OK:
+            output = self.decode_response(response, output_json=True)
+            if raw:
+                return output
+            output = ProjectDict.to_raw_dict(output)
+            return peppy.Project.from_dict(output)
+        elif response.status_code == ResponseStatusCodes.NOT_EXIST:
+            raise ResponseError("View does not exist, or you are unauthorized.")
+        else:
+            raise ResponseError(
+                f"Internal server error. Unexpected return value. Error: {response.status_code}"
+            )
+
+    async def create(
+        self,
+        namespace: str,
+        name: str,
+        tag: str,
+        view_name: str,
+        description: str = None,
+        sample_list: list = None,
+        no_fail: bool = False,
+    ) -> None:
+        """
+        Create view in project in PEPhub.
+
+        :param namespace: namespace of project
+        :param name: name of project
+        :param tag: tag of project
+        :param description: description of the view
+        :param view_name: name of the view
+        :param sample_list: list of sample names
+        :param no_fail: whether to raise an error if view was not added to the project
+        """
+        if not sample_list or not isinstance(sample_list, list):
+            raise ValueError("Sample list must be a list of sample names.")
+
+        url = build_view_request_url(
+            namespace=namespace, name=name, view_name=view_name
+        )
+        url = url + self.parse_query_param(pep_variables={"tag": tag})
+
+        response = await self.send_request(
+            method="POST",
+            url=url,
+            headers=self.parse_header(self.__jwt_data),
+            params={"description": description, "no_fail": no_fail},
+            json=sample_list,
+        )
+        if response.status_code == ResponseStatusCodes.ACCEPTED:
+            _LOGGER.info(
+                f"View '{view_name}' created in project '{namespace}/{name}:{tag}' successfully."
+            )
+            return None
+        elif response.status_code == ResponseStatusCodes.NOT_EXIST:
+            raise ResponseError(
+                f"Project '{namespace}/{name}:{tag}' or one of the samples does not exist."
+            )
+        elif response.status_code == ResponseStatusCodes.CONFLICT:
+            raise ResponseError(f"View '{view_name}' already exists in the project.")
+        else:
+            raise ResponseError(f"Unexpected return value.{response.status_code}")
+
+    async def delete(self, namespace: str, name: str, tag: str, view_name: str) -> None:
+        """
+        Delete view from project in PEPhub.
+
+        :param namespace: namespace of project
+        :param name: name of project
+        :param tag: tag of project
+        :param view_name: name of the view
+        :return: None
+        """
+        url = build_view_request_url(
+            namespace=namespace, name=name, view_name=view_name
+        )
+        url = url + self.parse_query_param(pep_variables={"tag": tag})
+
+        response = await self.send_request(
+            method="DELETE", url=url, headers=self.parse_header(self.__jwt_data)
+        )
+        if response.status_code == ResponseStatusCodes.ACCEPTED:
+            _LOGGER.info(
+                f"View '{view_name}' deleted from project '{namespace}/{name}:{tag}' successfully."
+            )
+            return None
+        elif response.status_code == ResponseStatusCodes.NOT_EXIST:
+            raise ResponseError("View does not exists, or you are unauthorized.")
+        elif response.status_code == ResponseStatusCodes.UNAUTHORIZED:
+            raise ResponseError("You are unauthorized to delete this view.")
+        else:
+            raise ResponseError("Unexpected return value. ")
+
+    async def add_sample(
+        self,
+        namespace: str,
+        name: str,
+        tag: str,
+        view_name: str,
+        sample_name: str,
+    ) -> None:
+        """
+        Add sample to view in project in PEPhub.
+
+        :param namespace: namespace of project
+        :param name: name of project
+        :param tag: tag of project
+        :param view_name: name of the view
+        :param sample_name: name of the sample
+        """
+        url = build_view_request_url(
+            namespace=namespace,
+            name=name,
+            view_name=view_name,
+            sample_name=sample_name,
+        )
+        url = url + self.parse_query_param(pep_variables={"tag": tag})
+
+        response = await self.send_request(
+            method="POST",
+            url=url,
+            headers=self.parse_header(self.__jwt_data),
+        )
+        if response.status_code == ResponseStatusCodes.ACCEPTED:
+            _LOGGER.info(
+                f"Sample '{sample_name}' added to view '{view_name}' in project '{namespace}/{name}:{tag}' successfully."
+            )
+            return None
+        elif response.status_code == ResponseStatusCodes.NOT_EXIST:
+            raise ResponseError(
+                f"Sample '{sample_name}' or project {namespace}/{name}:{tag} does not exist."
+            )
+        elif response.status_code == ResponseStatusCodes.CONFLICT:
+            raise ResponseError(f"Sample '{sample_name}' already exists in the view.")
+        else:
+            raise ResponseError(
+                f"Unexpected return value. Error: {response.status_code}"
+            )
+
+    async def remove_sample(
+        self,
+        namespace: str,
+        name: str,
+        tag: str,
+        view_name: str,
+        sample_name: str,
+    ) -> None:
+        """
+        Remove sample from view in project in PEPhub.
+
+        :param namespace: namespace of project
+        :param name: name of project
+        :param tag: tag of project
+        :param view_name: name of the view
+        :param sample_name: name of the sample
+        :return: None
+        """
+        url = build_view_request_url(
+            namespace=namespace,
+            name=name,
+            view_name=view_name,
+            sample_name=sample_name,
+        )
+        url = url + self.parse_query_param(pep_variables={"tag": tag})
+
+        response = await self.send_request(
+            method="DELETE",
+            url=url,
+            headers=self.parse_header(self.__jwt_data),
+        )
+        if response.status_code == ResponseStatusCodes.ACCEPTED:
+            _LOGGER.info(
+                f"Sample '{sample_name}' removed from view '{view_name}' in project '{namespace}/{name}:{tag}' successfully."
+            )
+            return None
+        elif response.status_code == ResponseStatusCodes.NOT_EXIST:
+            raise ResponseError(
+                f"Sample '{sample_name}' or project {namespace}/{name}:{tag} does not exist. "
+            )
+        elif response.status_code == ResponseStatusCodes.UNAUTHORIZED:
+            raise ResponseError(
+                "You are unauthorized to remove this sample from the view."
+            )
+        else:
+            raise ResponseError(
+                f"Unexpected return value. Error: {response.status_code}"
+            )
@@ -0,0 +1,304 @@
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from contextlib import suppress
+from pathlib import Path
+from typing import Dict, Optional
+
+from pephubclient.constants import DEFAULT_CACHE_MAX_SIZE, PATH_TO_CACHE
+from pephubclient.models import RegistryPath
+
+if os.name == "nt":
+    import msvcrt
+else:
+    import fcntl
+
+
+class FileLock:
+    """
+    Exclusive lock shared by threads and processes, based on a lock file.
+    """
+
+    def __init__(self, path: str):
+        """
+        :param path: path to the lock file. It is created if it doesn't exist
+        """
+        self.path = path
+        self._thread_lock = threading.Lock()
+        self._file = None
+
+    def __enter__(self) -> "FileLock":
+        # file locks are held per process, threads have to be serialized separately
+        self._thread_lock.acquire()
+        try:
+            Path(os.path.dirname(self.path)).mkdir(parents=True, exist_ok=True)
+            self._file = open(self.path, "a+")
+            if os.name == "nt":
+                while True:
+                    try:
+                        msvcrt.locking(self._file.fileno(), msvcrt.LK_LOCK, 1)
+                        break
+                    except OSError:
+                        continue
+            else:
+                fcntl.flock(self._file.fileno(), fcntl.LOCK_EX)
+        except BaseException:
+            if self._file:
+                self._file.close()
+                self._file = None
+            self._thread_lock.release()
+            raise
+        return self
+
+    def __exit__(self, *args) -> None:
+        try:
+            if os.name == "nt":
+                self._file.seek(0)
+                msvcrt.locking(self._file.fileno(), msvcrt.LK_UNLCK, 1)
+            else:
+                fcntl.flock(self._file.fileno(), fcntl.LOCK_UN)
+        finally:
+            self._file.close()
+            self._file = None
+            self._thread_lock.release()
+
+
+class ProjectCache:
+    """
+    Persistent local cache of raw projects, validated by project digest.
+
+    Every project is stored in its own file; `index.json` keeps digest, size and
+    last access time of each entry. When total size exceeds `max_size`, least
+    recently used projects are evicted. Index updates are guarded by a file lock,
+    so one cache directory can be shared by many processes on the same node.
+    Access times of cache hits are kept in memory, and written to the index with
+    the next update of the index, or at most once per `ACCESS_FLUSH_INTERVAL` seconds.
+    """
+
+    INDEX_FILE_NAME = "index.json"
+    LOCK_FILE_NAME = ".lock"
+    ACCESS_FLUSH_INTERVAL = 60.0
+
+    def __init__(
+        self, cache_dir: str = PATH_TO_CACHE, max_size: int = DEFAULT_CACHE_MAX_SIZE
+    ):
+        """
+        :param cache_dir: directory where cached projects are stored
+        :param max_size: maximum size of cached projects in bytes
+        """
+        self.cache_dir = cache_dir
+        self.max_size = max_size
+        self._lock = FileLock(os.path.join(cache_dir, self.LOCK_FILE_NAME))
+        # access times of cache hits, not written to the index yet
+        self._access_times: Dict[str, float] = {}
+        self._access_lock = threading.Lock()
+        self._last_flush = time.monotonic()
+
+    @staticmethod
+    def build_key(registry_path: RegistryPath) -> str:
+        """
+        Build cache key of the project
+
+        :param registry_path: parsed registry path of the project
+        :return: key in format namespace/name:tag
+        """
+        return f"{registry_path.namespace}/{registry_path.item}:{registry_path.tag}"
+
+    def get(self, key: str, digest: Optional[str] = None) -> Optional[dict]:
+        """
+        Get raw project from the cache
+
+        :param key: project key (namespace/name:tag)
+        :param digest: current digest of the project. If provided, cached project
+            is returned only if it was stored with the same digest
+        :return: raw project, or None if project is not cached or outdated
+        """
+        with self._lock:
+            entry = self._read_index().get(key)
+        if entry is None or (digest is not None and entry["digest"] != digest):
+            return None
+
+        try:
+            with open(self._entry_path(entry["file"]), "r") as f:
+                project = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            self._remove_entry(key, entry)
+            return None
+        self._record_access(key)
+        return project
+
+    def get_digest(self, key: str) -> Optional[str]:
+        """
+        Get digest of cached project without loading it
+
+        :param key: project key (namespace/name:tag)
+        :return: digest, or None if project is not cached
+        """
+        with self._lock:
+            entry = self._read_index().get(key)
+        return entry["digest"] if entry else None
+
+    def get_stored_at(self, key: str) -> Optional[float]:
+        """
+        Get time when project was stored in the cache, without loading it
+
+        :param key: project key (namespace/name:tag)
+        :return: unix timestamp, or None if project is not cached
+        """
+        with self._lock:
+            entry = self._read_index().get(key)
+        return entry["stored_at"] if entry else None
+
+    def set(self, key: str, digest: str, project: dict) -> None:
+        """
+        Store raw project in the cache, evicting least recently used projects if needed
+
+        :param key: project key (namespace/name:tag)
+        :param digest: digest of the project
+        :param project: raw project
+        :return: None
+        """
+        data = json.dumps(project).encode("utf-8")
+        if len(data) > self.max_size:
+            return None
+
+        Path(self.cache_dir).mkdir(parents=True, exist_ok=True)
+        file_name = hashlib.sha1(key.encode("utf-8")).hexdigest() + ".json"
+        # write outside the lock, then move into place atomically
+        with tempfile.NamedTemporaryFile(
+            dir=self.cache_dir, suffix=".tmp", delete=False
+        ) as f:
+            f.write(data)
+
+        with self._lock:
+            os.replace(f.name, self._entry_path(file_name))
+            index = self._read_index()
+            self._apply_access_times(index)
+            now = time.time()
+            index[key] = {
+                "digest": digest,
+                "file": file_name,
+                "size": len(data),
+                "stored_at": now,
+                "last_access": now,
+            }
+            self._evict(index)
+            self._write_index(index)
+
+    def remove(self, key: str) -> None:
+        """
+        Remove project from the cache
+
+        :param key: project key (namespace/name:tag)
+        :return: None
+        """
+        with self._lock:
+            index = self._read_index()
+            self._apply_access_times(index)
+            entry = index.pop(key, None)
+            if entry is None:
+                return None
+            with suppress(FileNotFoundError):
+                os.remove(self._entry_path(entry["file"]))
+            self._write_index(index)
+
+    def flush(self) -> None:
+        """
+        Write access times of cache hits, kept in memory, to the index
+
+        :return: None
+        """
+        with self._access_lock:
+            if not self._access_times:
+                return None
+        with self._lock:
+            index = self._read_index()
+            self._apply_access_times(index)
+            self._write_index(index)
+
+    def clear(self) -> None:
+        """
+        Remove all projects from the cache
+        """
+        with self._lock:
+            self._apply_access_times({})
+            for entry in self._read_index().values():
+                with suppress(FileNotFoundError):
+                    os.remove(self._entry_path(entry["file"]))
+            self._write_index({})
+
+    @property
+    def size(self) -> int:
+        """
+        Total size of cached projects in bytes
+        """
+        with self._lock:
+            return sum(entry["size"] for entry in self._read_index().values())
+
+    def _remove_entry(self, key: str, entry: dict) -> None:
+        """
+        Remove project from the cache, if it was not replaced since entry was read
+        """
+        with self._lock:
+            index = self._read_index()
+            current = index.get(key)
+            if current is None or (current["digest"], current["stored_at"]) != (
+                entry["digest"],
+                entry["stored_at"],
+            ):
+                return None
+            del index[key]
+            with suppress(FileNotFoundError):
+                os.remove(self._entry_path(entry["file"]))
+            self._write_index(index)
+
+    def _record_access(self, key: str) -> None:
+        with self._access_lock:
+            self._access_times[key] = time.time()
+            flush = time.monotonic() - self._last_flush >= self.ACCESS_FLUSH_INTERVAL
+        if flush:
+            self.flush()
+
+    def _apply_access_times(self, index: dict) -> None:
+        """
+        Move access times kept in memory to index (in place). Called under file lock
+        """
+        with self._access_lock:
+            access_times, self._access_times = self._access_times, {}
+            self._last_flush = time.monotonic()
+        for key, last_access in access_times.items():
+            if key in index:
+                index[key]["last_access"] = max(index[key]["last_access"], last_access)
+
+    def _evict(self, index: dict) -> None:
+        """
+        Remove least recently used entries from index (in place) and disk until cache fits max_size
+        """
+        total_size = sum(entry["size"] for entry in index.values())
+        for key in sorted(index, key=lambda k: index[k]["last_access"]):
+            if total_size <= self.max_size:
+                break
+            entry = index.pop(key)
+            total_size -= entry["size"]
+            with suppress(FileNotFoundError):
+                os.remove(self._entry_path(entry["file"]))
+
+    def _entry_path(self, file_name: str) -> str:
+        return os.path.join(self.cache_dir, file_name)
+
+    def _read_index(self) -> dict:
+        try:
+            with open(self._entry_path(self.INDEX_FILE_NAME), "r") as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+
+    def _write_index(self, index: dict) -> None:
+        Path(self.cache_dir).mkdir(parents=True, exist_ok=True)
+        index_path = self._entry_path(self.INDEX_FILE_NAME)
+        with open(index_path + ".tmp", "w") as f:
+            json.dump(index, f)
+        os.replace(index_path + ".tmp", index_path)
@@ -1,21 +1,46 @@
+from functools import lru_cache
+from typing import TYPE_CHECKING, List
+
 import typer
 
 from pephubclient import __app_name__, __version__
-from pephubclient.helpers import call_client_func
-from pephubclient.pephubclient import PEPHubClient
+from pephubclient.constants import (
+    DEFAULT_PULL_JOBS,
+    DEFAULT_TABLE_FORMAT,
+    DEFAULT_ZIP_COMPRESSION,
+    TableFormat,
+    ZipCompression,
+)
 from pephubclient.schemas.schema_cli import schemas_app
 
-_client = PEPHubClient()
+# client and helpers load peppy and pandas, so they are imported
+# only by commands that need them, to keep `phc --help` fast
+if TYPE_CHECKING:
+    from pephubclient.pephubclient import PEPHubClient
 
 app = typer.Typer()
 
 
+@lru_cache(maxsize=None)
+def get_client() -> "PEPHubClient":
+    """
+    Create PEPhub client, shared by all commands of one cli call
+
+    :return: PEPhub client
+    """
+    from pephubclient.pephubclient import PEPHubClient
+
+    return PEPHubClient()
+
+
 @app.command()
 def login():
     """
     Login to PEPhub
     """
-    call_client_func(_client.login)
+    from pephubclient.helpers import call_client_func
+
+    call_client_func(get_client().login)
 
 
 @app.command()
@@ -23,26 +48,163 @@ def logout():
     """
     Logout
     """
-    _client.logout()
+    get_client().logout()
 
 
 @app.command()
 def pull(
-    project_registry_path: str,
+    project_registry_path: List[str] = typer.Argument(
+        ..., help="One or more project registry paths (e.g. databio/base:default)"
+    ),
     force: bool = typer.Option(False, help="Overwrite project if it exists."),
     zip: bool = typer.Option(False, help="Save project as zip file."),
     output: str = typer.Option(None, help="Output directory."),
+    jobs: int = typer.Option(
+        DEFAULT_PULL_JOBS,
+        "--jobs",
+        "-j",
+        min=1,
+        help="Number of projects downloaded concurrently.",
+    ),
+    stream: bool = typer.Option(
+        False,
+        help="Write sample tables to disk while project is downloaded, "
+        "without loading it into memory. Use it for very large projects.",
+    ),
+    compression: ZipCompression = typer.Option(
+        ZipCompression(DEFAULT_ZIP_COMPRESSION),
+        help="Compression method of zip file. 'store' is the fastest.",
+    ),
+    compression_level: int = typer.Option(
+        None,
+        min=0,
+        max=9,
+        help="Compression level of zip file. Default: default level of the method.",
+    ),
+    format: TableFormat = typer.Option(
+        TableFormat(DEFAULT_TABLE_FORMAT),
+        help="Format of sample and subsample tables. "
+        "Parquet and feather are typed columnar formats (require pyarrow).",
+    ),
 ):
     """
-    Download and save project locally.
+    Download and save project(s) locally.
     """
-    call_client_func(
-        _client.pull,
-        project_registry_path=project_registry_path,
+    from pephubclient.helpers import MessageHandler, call_client_func
+    from pephubclient.models import PullResult
+
+    if format != TableFormat.CSV and (zip or stream):
+        raise typer.BadParameter(
+            "Parquet and feather tables can't be zipped or streamed.",
+            param_hint="--format",
+        )
+
+    if len(project_registry_path) == 1:
+        call_client_func(
+            get_client().pull,
+            project_registry_path=project_registry_path[0],
+            force=force,
+            output=output,
+            zip=zip,
+            stream=stream,
+            compression=compression.value,
+            compression_level=compression_level,
+            format=format.value,
+        )
+        return
+
+    total = len(set(project_registry_path))
+    finished = 0
+
+    def print_progress(result: PullResult) -> None:
+        nonlocal finished
+        finished += 1
+        if result.success:
+            MessageHandler.print_success(
+                f"[{finished}/{total}] {result.registry_path}: done"
+            )
+        else:
+            MessageHandler.print_error(
+                f"[{finished}/{total}] {result.registry_path}: {result.error}"
+            )
+
+    results = call_client_func(
+        get_client().pull_many,
+        project_registry_paths=project_registry_path,
+        jobs=jobs,
         force=force,
-        output=output,
         zip=zip,
+        output=output,
+        progress=print_progress,
+        stream=stream,
+        compression=compression.value,
+        compression_level=compression_level,
+        format=format.value,
+    )
+    if results is None:
+        # error was already reported by call_client_func
+        raise typer.Exit(code=1)
+    failed = [result for result in results if not result.success]
+    if failed:
+        MessageHandler.print_warning(
+            f"{len(results) - len(failed)} project(s) pulled, {len(failed)} failed."
+        )
+        raise typer.Exit(code=1)
+
+
+@app.command()
+def mirror(
+    namespace: str = typer.Argument(..., help="Namespace to mirror"),
+    output: str = typer.Argument(..., help="Mirror directory"),
+    jobs: int = typer.Option(
+        DEFAULT_PULL_JOBS,
+        "--jobs",
+        "-j",
+        min=1,
+        help="Number of projects downloaded concurrently.",
+    ),
+    delete: bool = typer.Option(
+        False,
+        help="Delete local copies of projects removed from the namespace "
+        "(by default they are only flagged in the mirror state file).",
+    ),
+    format: TableFormat = typer.Option(
+        TableFormat(DEFAULT_TABLE_FORMAT),
+        help="Format of sample and subsample tables.",
+    ),
+):
+    """
+    Download new and updated projects of namespace to local mirror directory.
+    """
+    from pephubclient.helpers import MessageHandler, call_client_func
+    from pephubclient.models import PullResult
+
+    def print_failure(result: PullResult) -> None:
+        if not result.success:
+            MessageHandler.print_error(f"{result.registry_path}: {result.error}")
+
+    report = call_client_func(
+        get_client().mirror,
+        namespace=namespace,
+        output=output,
+        jobs=jobs,
+        delete=delete,
+        format=format.value,
+        progress=print_failure,
+    )
+    if report is None:
+        raise typer.Exit(code=1)
+
+    MessageHandler.print_success(
+        f"Mirror of '{namespace}' synchronized: {len(report.added)} added, "
+        f"{len(report.updated)} updated, {report.unchanged} unchanged, "
+        f"{len(report.removed)} {'deleted' if delete else 'removed (flagged)'}."
     )
+    if report.failed:
+        MessageHandler.print_warning(
+            f"{len(report.failed)} project(s) failed and will be retried on next sync."
+        )
+        raise typer.Exit(code=1)
 
 
 @app.command()
@@ -59,19 +221,30 @@ def push(
         False, help="Force push to the database. Use it to update, or upload project."
     ),
     is_private: bool = typer.Option(False, help="Upload project as private."),
+    incremental: bool = typer.Option(
+        False,
+        help="Send only changed samples, if project already exists in PEPhub.",
+    ),
+    validate_against: str = typer.Option(
+        None,
+        help="Validate project against schema (namespace/name:version) before upload.",
+    ),
 ):
     """
     Upload/update project in PEPhub
     """
+    from pephubclient.helpers import call_client_func
 
     call_client_func(
-        _client.push,
+        get_client().push,
         cfg=cfg,
         namespace=namespace,
         name=name,
         tag=tag,
         is_private=is_private,
         force=force,
+        incremental=incremental,
+        validate_against=validate_against,
     )
 
 
@@ -1,14 +1,14 @@
 from enum import Enum
-from typing import Optional
 import os
 
-from pydantic import BaseModel, field_validator
-
 PEPHUB_BASE_URL = os.getenv(
     "PEPHUB_BASE_URL", default="https://pephub-api.databio.org/"
 )
 # PEPHUB_BASE_URL = "http://0.0.0.0:8000/"
 PEPHUB_PEP_API_BASE_URL = f"{PEPHUB_BASE_URL}api/v1/projects/"
+PEPHUB_PEP_ANNOTATION_URL = (
+    f"{PEPHUB_BASE_URL}api/v1/projects/{{namespace}}/{{project}}/annotation"
+)
 PEPHUB_PEP_SEARCH_URL = f"{PEPHUB_BASE_URL}api/v1/namespaces/{{namespace}}/projects"
 PEPHUB_PUSH_URL = f"{PEPHUB_BASE_URL}api/v1/namespaces/{{namespace}}/projects/json"
 
@@ -19,16 +19,31 @@ PEPHUB_VIEW_URL = (
 PEPHUB_VIEW_SAMPLE_URL = f"{PEPHUB_BASE_URL}api/v1/projects/{{namespace}}/{{project}}/views/{{view_name}}/{{sample_name}}"
 
 
-class RegistryPath(BaseModel):
-    protocol: Optional[str] = None
-    namespace: str
-    item: str
-    subitem: Optional[str] = None
-    tag: Optional[str] = "default"
+# maximum number of keep-alive connections held by one client session (per host)
+DEFAULT_POOL_SIZE = 10
+# number of projects downloaded concurrently in bulk pull
+DEFAULT_PULL_JOBS = 4
+# number of sample requests sent concurrently in batch sample operations
+DEFAULT_SAMPLE_JOBS = 8
+# view is recreated by sync, if more than this fraction of its samples has to be added or removed
+DEFAULT_VIEW_RECREATE_RATIO = 0.5
+# number of search result pages requested ahead of the consumer in iter_projects
+DEFAULT_PREFETCH_PAGES = 4
+# compression method of saved zip files: store, deflate, bzip2 or lzma
+DEFAULT_ZIP_COMPRESSION = "deflate"
+# file format of saved sample and subsample tables: csv, parquet or feather
+DEFAULT_TABLE_FORMAT = "csv"
+# text columns with at most this fraction of unique values are made categorical by load_sample_table
+DEFAULT_CATEGORICAL_RATIO = 0.5
 
-    @field_validator("tag")
-    def tag_should_not_be_none(cls, v):
-        return v or "default"
+
+class ClientMode(str, Enum):
+    # every call goes to PEPhub
+    ONLINE = "online"
+    # data available in local cache or mirrors is served without requesting PEPhub
+    PREFER_LOCAL = "prefer-local"
+    # PEPhub is never requested, calls fail if data is not available locally
+    OFFLINE = "offline"
 
 
 class ResponseStatusCodes(int, Enum):
@@ -41,8 +56,43 @@ class ResponseStatusCodes(int, Enum):
     INTERNAL_ERROR = 500
 
 
+class TableFormat(str, Enum):
+    CSV = "csv"
+    PARQUET = "parquet"
+    FEATHER = "feather"
+
+
+class ZipCompression(str, Enum):
+    STORE = "store"
+    DEFLATE = "deflate"
+    BZIP2 = "bzip2"
+    LZMA = "lzma"
+
+
 USER_DATA_FILE_NAME = "jwt.txt"
 HOME_PATH = os.getenv("HOME")
 if not HOME_PATH:
     HOME_PATH = os.path.expanduser("~")
 PATH_TO_FILE_WITH_JWT = os.path.join(HOME_PATH, ".pephubclient/") + USER_DATA_FILE_NAME
+
+PATH_TO_CACHE = os.getenv(
+    "PEPHUB_CACHE_DIR", default=os.path.join(HOME_PATH, ".pephubclient", "cache")
+)
+# mode of the client (online, prefer-local or offline), used if not passed to PEPHubClient
+CLIENT_MODE_ENV = "PEPHUB_CLIENT_MODE"
+# mirror directories (separated by os.pathsep) used to serve projects in offline modes
+MIRROR_DIRS_ENV = "PEPHUB_MIRROR_DIRS"
+# file with state of namespace mirror, stored in mirror directory
+MIRROR_STATE_FILE_NAME = ".phc-mirror.json"
+
+# default size cap of the project cache in bytes
+DEFAULT_CACHE_MAX_SIZE = 1024**3
+
+
+def __getattr__(name: str):
+    # RegistryPath was moved to models, so that importing constants doesn't load pydantic
+    if name == "RegistryPath":
+        from pephubclient.models import RegistryPath
+
+        return RegistryPath
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,4 +1,4 @@
-from typing import Optional
+from typing import List, Optional
 
 
 class BasePephubclientException(Exception):
@@ -39,3 +39,36 @@ class FileDoesNotExistError(BasePephubclientException):
     def __init__(self, message: Optional[str] = None):
         self.message = message
         super().__init__(self.message or self.default_message)
+
+
+class SchemaValidationError(BasePephubclientException):
+    def __init__(self, schema: str, errors: List[str]):
+        self.schema = schema
+        self.errors = errors
+        super().__init__(
+            f"Project is not valid against schema '{schema}' ({len(errors)} error(s)):\n"
+            + "\n".join(f"  - {error}" for error in errors)
+        )
+
+
+class LocalDataNotFoundError(BasePephubclientException):
+    default_message = "Data is not available locally, and client is in offline mode."
+
+    def __init__(self, message: Optional[str] = None):
+        self.message = message
+        super().__init__(self.message or self.default_message)
+
+
+class StaleDataWarning(UserWarning):
+    """
+    Warning emitted when data is served from local cache or mirror instead of PEPhub
+    """
+
+    def __init__(self, message: str, age: float, source: str):
+        self.age = age
+        self.source = source
+        super().__init__(message)
+
+
+class JWTExpiredError(ResponseError):
+    default_message = "JWT has expired. Please log in again."
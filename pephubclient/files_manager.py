@@ -1,13 +1,33 @@
+import importlib.util
+import io
 import os
 from contextlib import suppress
 from pathlib import Path
+from typing import Callable, Dict, Optional, TextIO, Tuple
 
 import pandas
 import yaml
 import zipfile
 
+from pephubclient.constants import (
+    DEFAULT_TABLE_FORMAT,
+    DEFAULT_ZIP_COMPRESSION,
+    TableFormat,
+    ZipCompression,
+)
 from pephubclient.exceptions import PEPExistsError
 
+# compression methods of saved zip files
+ZIP_COMPRESSION_METHODS = {
+    ZipCompression.STORE.value: zipfile.ZIP_STORED,
+    ZipCompression.DEFLATE.value: zipfile.ZIP_DEFLATED,
+    ZipCompression.BZIP2.value: zipfile.ZIP_BZIP2,
+    ZipCompression.LZMA.value: zipfile.ZIP_LZMA,
+}
+
+# jwt tokens read in this process: path -> ((mtime, size) of the file, token)
+_JWT_CACHE: Dict[str, Tuple[Tuple[int, int], str]] = {}
+
 
 class FilesManager:
     @staticmethod
@@ -18,15 +38,29 @@ class FilesManager:
         Path(os.path.dirname(path)).mkdir(parents=True, exist_ok=True)
         with open(path, "w") as f:
             f.write(jwt_data)
+        _JWT_CACHE.pop(path, None)
 
     @staticmethod
-    def load_jwt_data_from_file(path: str) -> str:
+    def load_jwt_data_from_file(path: str) -> Optional[str]:
         """
         Open the file with username and ID and load this data.
+        Token is read once per process, and read again only if the file changed
+        (e.g. after login in another process).
         """
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            _JWT_CACHE.pop(path, None)
+            return None
+        file_version = (stat.st_mtime_ns, stat.st_size)
+        cached = _JWT_CACHE.get(path)
+        if cached is not None and cached[0] == file_version:
+            return cached[1]
         with suppress(FileNotFoundError):
             with open(path, "r") as f:
-                return f.read()
+                jwt_data = f.read()
+            _JWT_CACHE[path] = (file_version, jwt_data)
+            return jwt_data
 
     @staticmethod
     def create_project_folder(
@@ -60,6 +94,77 @@ class FilesManager:
         FilesManager.check_writable(path=full_path, force=not not_force)
         df.to_csv(full_path, index=False)
 
+    @staticmethod
+    def save_table(
+        df: pandas.DataFrame,
+        full_path: str,
+        table_format: str = DEFAULT_TABLE_FORMAT,
+        not_force: bool = False,
+    ):
+        """
+        Save table in csv, or in typed columnar format (parquet or feather)
+
+        :param df: table to save
+        :param full_path: path of the file
+        :param table_format: csv, parquet or feather. Columnar formats require pyarrow
+        :param not_force: don't overwrite file if exists
+        """
+        if table_format == TableFormat.CSV.value:
+            return FilesManager.save_pandas(df, full_path, not_force=not_force)
+        if table_format not in (TableFormat.PARQUET.value, TableFormat.FEATHER.value):
+            raise ValueError(f"Unknown table format: '{table_format}'")
+        FilesManager._check_pyarrow()
+        FilesManager.check_writable(path=full_path, force=not not_force)
+        df = FilesManager._to_columnar(df)
+        if table_format == TableFormat.PARQUET.value:
+            df.to_parquet(full_path, index=False)
+        else:
+            df.reset_index(drop=True).to_feather(full_path)
+
+    @staticmethod
+    def load_table(full_path: str) -> pandas.DataFrame:
+        """
+        Load table saved by save_table. Format is recognized by file extension.
+
+        :param full_path: path of the file
+        :return: table
+        """
+        extension = os.path.splitext(full_path)[1].lstrip(".")
+        if extension == TableFormat.PARQUET.value:
+            FilesManager._check_pyarrow()
+            return pandas.read_parquet(full_path)
+        if extension == TableFormat.FEATHER.value:
+            FilesManager._check_pyarrow()
+            return pandas.read_feather(full_path)
+        return pandas.read_csv(full_path, dtype=str)
+
+    @staticmethod
+    def _check_pyarrow() -> None:
+        if importlib.util.find_spec("pyarrow") is None:
+            raise ImportError(
+                "Parquet and feather formats require 'pyarrow'. "
+                "Install it with: pip install pephubclient[arrow]"
+            )
+
+    @staticmethod
+    def _to_columnar(df: pandas.DataFrame) -> pandas.DataFrame:
+        """
+        Convert columns with values of mixed types (e.g. numbers and strings) to strings,
+        as columnar formats need one type per column. Missing values are kept.
+        """
+        mixed_columns = [
+            column
+            for column in df.columns
+            if df[column].dtype == object
+            and df[column].dropna().map(type).nunique() > 1
+        ]
+        if not mixed_columns:
+            return df
+        df = df.copy()
+        for column in mixed_columns:
+            df[column] = df[column].where(df[column].isna(), df[column].astype(str))
+        return df
+
     @staticmethod
     def file_exists(full_path: str) -> bool:
         return os.path.isfile(full_path)
@@ -78,18 +183,103 @@ class FilesManager:
             raise PEPExistsError(f"File already exists and won't be updated: {path}")
 
     @staticmethod
-    def save_zip_file(files_dict: dict, file_path: str, force: bool = False) -> None:
+    def open_zip(
+        file_path: str,
+        force: bool = False,
+        compression: str = DEFAULT_ZIP_COMPRESSION,
+        compression_level: Optional[int] = None,
+    ) -> zipfile.ZipFile:
+        """
+        Open new zip file for writing.
+
+        :param file_path: filename to save zip file to
+        :param force: overwrite file if exists
+        :param compression: compression method: "store" (no compression, fastest),
+            "deflate", "bzip2" or "lzma"
+        :param compression_level: compression level (0-9 for deflate, 1-9 for bzip2).
+            By default, default level of the method is used
+        :return: zip file opened for writing
+        """
+        if compression not in ZIP_COMPRESSION_METHODS:
+            raise ValueError(
+                f"Unknown compression method: '{compression}'. "
+                f"Use one of: {', '.join(ZIP_COMPRESSION_METHODS)}"
+            )
+        FilesManager.check_writable(path=file_path, force=force)
+        return zipfile.ZipFile(
+            file_path,
+            mode="w",
+            compression=ZIP_COMPRESSION_METHODS[compression],
+            compresslevel=compression_level,
+        )
+
+    @staticmethod
+    def write_zip_entry(
+        zip_file: zipfile.ZipFile, name: str, write: Callable[[TextIO], None]
+    ) -> None:
+        """
+        Write text file into zip archive in chunks, without building it in memory.
+
+        :param zip_file: zip file opened for writing
+        :param name: name of the file in archive
+        :param write: function that writes content of the file to provided text stream
+        :return: None
+        """
+        # size is not known in advance, so zip64 has to be allowed for large files
+        with io.TextIOWrapper(
+            zip_file.open(name, mode="w", force_zip64=True),
+            encoding="utf-8",
+            newline="",
+        ) as entry:
+            write(entry)
+
+    @staticmethod
+    def save_zip_file(
+        files_dict: dict,
+        file_path: str,
+        force: bool = False,
+        compression: str = DEFAULT_ZIP_COMPRESSION,
+        compression_level: Optional[int] = None,
+    ) -> None:
         """
         Save zip file with provided files as dict.
 
         :param files_dict: dict with files to save. e.g. {"file1.txt": "file1 content"}
         :param file_path: filename to save zip file to
         :param force: overwrite file if exists
+        :param compression: compression method (see open_zip)
+        :param compression_level: compression level (see open_zip)
         :return: None
         """
-        FilesManager.check_writable(path=file_path, force=force)
-        with zipfile.ZipFile(
-            file_path, mode="w", compression=zipfile.ZIP_DEFLATED
+        with FilesManager.open_zip(
+            file_path, force, compression, compression_level
         ) as zf:
             for name, res in files_dict.items():
-                zf.writestr(name, str.encode(res))
+                FilesManager.write_zip_entry(
+                    zf, name, lambda entry, res=res: entry.write(res)
+                )
+
+    @staticmethod
+    def save_zip_from_files(
+        files_dict: dict,
+        file_path: str,
+        force: bool = False,
+        compression: str = DEFAULT_ZIP_COMPRESSION,
+        compression_level: Optional[int] = None,
+    ) -> None:
+        """
+        Save zip file with provided files, that are read from disk in chunks.
+
+        :param files_dict: dict with names in archive and paths of files to save.
+            e.g. {"file1.txt": "/tmp/file1.txt"}
+        :param file_path: filename to save zip file to
+        :param force: overwrite file if exists
+        :param compression: compression method (see open_zip)
+        :param compression_level: compression level (see open_zip)
+        :return: None
+        """
+        with FilesManager.open_zip(
+            file_path, force, compression, compression_level
+        ) as zf:
+            for name, path in files_dict.items():
+                zf.write(path, arcname=name)
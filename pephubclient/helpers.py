@@ -1,5 +1,24 @@
+import base64
+import hashlib
 import json
-from typing import Any, Callable, Optional, Union, Literal, Tuple
+import logging
+import tempfile
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import lru_cache
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Hashable,
+    Iterable,
+    List,
+    Optional,
+    Union,
+    Literal,
+    Tuple,
+)
 import peppy
 import yaml
 from pathlib import Path
@@ -13,11 +32,19 @@ from peppy.const import (
     SAMPLE_RAW_DICT_KEY,
     CFG_SAMPLE_TABLE_KEY,
     CFG_SUBSAMPLE_TABLE_KEY,
+    SAMPLE_NAME_ATTR,
+    SAMPLE_TABLE_INDEX_KEY,
 )
 
 import requests
-from requests.exceptions import ConnectionError
+from requests.exceptions import (
+    ChunkedEncodingError,
+    ConnectionError,
+    ConnectTimeout,
+    Timeout,
+)
 from urllib.parse import urlencode
+from urllib3.exceptions import NewConnectionError
 
 from ubiquerg import parse_registry_path
 from pydantic import ValidationError
@@ -26,32 +53,441 @@ from pephubclient.exceptions import (
     PEPExistsError,
     ResponseError,
     BasePephubclientException,
+    FileDoesNotExistError,
+    JWTExpiredError,
+    LocalDataNotFoundError,
+    SchemaValidationError,
+)
+from pephubclient.constants import (
+    DEFAULT_CATEGORICAL_RATIO,
+    DEFAULT_POOL_SIZE,
+    DEFAULT_TABLE_FORMAT,
+    DEFAULT_ZIP_COMPRESSION,
+    TableFormat,
 )
-from pephubclient.constants import RegistryPath
 from pephubclient.files_manager import FilesManager
-from pephubclient.models import ProjectDict
+from pephubclient.instrumentation import (
+    RequestHook,
+    TimedHTTPAdapter,
+    get_bytes_received,
+    get_bytes_sent,
+    get_connect_time,
+    get_ttfb,
+    get_url_template,
+    reset_connect_time,
+)
+from pephubclient.models import (
+    ProjectDict,
+    RegistryPath,
+    RequestEvent,
+    RetryPolicy,
+    SampleBatchReport,
+    SampleDiff,
+    SampleResult,
+    TokenExpiryPolicy,
+)
+from pephubclient.streaming import write_project_tables
+
+_LOGGER = logging.getLogger("pephubclient")
+
+# Optional fast JSON decoders (orjson or msgspec), used for response bodies if installed
+try:
+    import orjson
+
+    _fast_json_loads = orjson.loads
+    JSON_DECODE_ERRORS = (json.JSONDecodeError, orjson.JSONDecodeError)
+except ImportError:
+    try:
+        import msgspec
+
+        _fast_json_loads = msgspec.json.decode
+        JSON_DECODE_ERRORS = (json.JSONDecodeError, msgspec.DecodeError)
+    except ImportError:
+        _fast_json_loads = None
+        JSON_DECODE_ERRORS = (json.JSONDecodeError,)
+
+# errors of connection or reading the response, that may succeed when retried
+RETRYABLE_EXCEPTIONS = (ConnectionError, Timeout, ChunkedEncodingError)
+
+
+def failed_to_connect(err: Exception) -> bool:
+    """
+    Check if request failed before connection to the server was established
+
+    :param err: exception raised by requests
+    :return: True if connection timed out or was refused
+    """
+    if isinstance(err, ConnectTimeout):
+        return True
+    # requests wraps urllib3 MaxRetryError, which holds the original error as reason
+    reason = getattr(err.args[0], "reason", None) if err.args else None
+    return isinstance(reason, NewConnectionError)
+
+
+def create_session(pool_size: int = DEFAULT_POOL_SIZE) -> requests.Session:
+    """
+    Create requests session backed by keep-alive connection pool.
+
+    :param pool_size: number of connections kept alive per host
+    :return: requests session
+    """
+    session = requests.Session()
+    adapter = TimedHTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def format_age(seconds: float) -> str:
+    """
+    Format age of data in human readable form, e.g. 2d 3h, 5h 10m, 42s
+
+    :param seconds: age in seconds
+    :return: formatted age
+    """
+    seconds = max(int(seconds), 0)
+    days, seconds = divmod(seconds, 86400)
+    hours, seconds = divmod(seconds, 3600)
+    minutes, seconds = divmod(seconds, 60)
+    if days:
+        return f"{days}d {hours}h"
+    if hours:
+        return f"{hours}h {minutes}m"
+    if minutes:
+        return f"{minutes}m {seconds}s"
+    return f"{seconds}s"
+
+
+@lru_cache(maxsize=32)
+def get_jwt_expiration(jwt_data: str) -> Optional[float]:
+    """
+    Get expiration time of JWT from its `exp` claim. Signature is not verified, the token
+    is decoded only to know when it expires. Result is cached, so each token is decoded
+    once per process.
+
+    :param jwt_data: jwt string
+    :return: expiration time (unix timestamp), or None if token has no expiration
+        or can't be decoded
+    """
+    try:
+        payload = jwt_data.split(".")[1]
+        claims = json.loads(
+            base64.urlsafe_b64decode(payload + "=" * (-len(payload) % 4))
+        )
+        return float(claims["exp"])
+    except (AttributeError, IndexError, KeyError, TypeError, ValueError):
+        return None
+
+
+class SingleFlight:
+    """
+    Coalescing of concurrent identical calls: while a call with some key is in flight,
+    other calls with the same key wait for it and get its result, or its exception,
+    instead of running again. Calls started after it finished run again.
+    Safe to share by threads.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._in_flight: Dict[Hashable, Future] = {}
+
+    def do(self, key: Hashable, function: Callable[[], Any]) -> Any:
+        """
+        Call function, unless call with the same key is in flight
+
+        :param key: key of identical calls
+        :param function: function to call
+        :return: result of the call (shared by all coalesced callers)
+        """
+        with self._lock:
+            future = self._in_flight.get(key)
+            leader = future is None
+            if leader:
+                future = self._in_flight[key] = Future()
+        if not leader:
+            _LOGGER.debug(f"Waiting for identical request in flight: {key}")
+            return future.result()
+
+        try:
+            result = function()
+        except BaseException as err:
+            self._finish(key)
+            future.set_exception(err)
+            raise
+        self._finish(key)
+        future.set_result(result)
+        return result
+
+    def _finish(self, key: Hashable) -> None:
+        with self._lock:
+            del self._in_flight[key]
+
+
+class _DefaultManagerMethod:
+    """
+    Method of RequestManager, that can be called on the class too, as it was
+    a static method before. Called on the class, it is bound to shared default manager.
+    """
+
+    def __init__(self, func: Callable):
+        self.func = func
+        self.__doc__ = func.__doc__
+        self.__name__ = func.__name__
+
+    def __get__(self, instance, owner):
+        if instance is None:
+            instance = RequestManager.default()
+        return self.func.__get__(instance, type(instance))
 
 
 class RequestManager:
-    @staticmethod
+    _default_manager: Optional["RequestManager"] = None
+    _default_manager_lock = threading.Lock()
+
+    def __init__(
+        self,
+        session: Optional[requests.Session] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        hooks: Optional[List[RequestHook]] = None,
+        token_policy: Optional[TokenExpiryPolicy] = None,
+    ):
+        """
+        :param session: requests session used to send requests. If not provided,
+            new session with its own connection pool is created.
+        :param retry_policy: policy of retrying failed requests. Default: RetryPolicy()
+        :param hooks: request hooks called before and after every request. The list is
+            not copied, so hooks appended to it later are called too
+        :param token_policy: check of JWT expiration before batch operations.
+            Default: TokenExpiryPolicy()
+        """
+        self._session = session or create_session()
+        self._retry_policy = retry_policy or RetryPolicy()
+        self._hooks = hooks if hooks is not None else []
+        self._token_policy = token_policy or TokenExpiryPolicy()
+        self._single_flight = SingleFlight()
+
+    @classmethod
+    def default(cls) -> "RequestManager":
+        """
+        Get request manager shared by calls of send_request on the class
+
+        :return: default request manager, created on first use
+        """
+        with RequestManager._default_manager_lock:
+            if RequestManager._default_manager is None:
+                RequestManager._default_manager = RequestManager()
+            return RequestManager._default_manager
+
+    @property
+    def session(self) -> requests.Session:
+        return self._session
+
+    @property
+    def retry_policy(self) -> RetryPolicy:
+        return self._retry_policy
+
+    @property
+    def hooks(self) -> List[RequestHook]:
+        return self._hooks
+
+    @property
+    def token_policy(self) -> TokenExpiryPolicy:
+        return self._token_policy
+
+    def check_jwt_expiration(
+        self, jwt_data: Optional[str], duration: Optional[float] = None
+    ) -> Optional[float]:
+        """
+        Check that JWT stays valid for expected duration of an operation. If it doesn't,
+        warning is logged, or JWTExpiredError is raised if token policy blocks.
+
+        :param jwt_data: jwt string
+        :param duration: expected duration of the operation in seconds.
+            Default: margin of token policy
+        :return: number of seconds until the token expires, or None if
+            there is no token, or its expiration is not known
+        """
+        expiration = get_jwt_expiration(jwt_data) if jwt_data else None
+        if expiration is None:
+            return None
+        seconds_left = expiration - time.time()
+        if seconds_left <= 0:
+            raise JWTExpiredError()
+        if duration is None:
+            duration = self._token_policy.margin
+        if seconds_left < duration:
+            message = (
+                f"JWT expires in {format_age(seconds_left)}, before the operation "
+                f"expected to take {format_age(duration)} ends. Log in again to renew it."
+            )
+            if self._token_policy.block:
+                raise JWTExpiredError(message)
+            _LOGGER.warning(message)
+        return seconds_left
+
+    @_DefaultManagerMethod
     def send_request(
+        self,
         method: str,
         url: str,
         headers: Optional[dict] = None,
         cookies: Optional[dict] = None,
         params: Optional[dict] = None,
         json: Optional[Union[dict, list]] = None,
+        stream: bool = False,
     ) -> requests.Response:
-        request_return = requests.request(
-            method=method,
-            url=url,
-            verify=False,
-            cookies=cookies,
-            headers=headers,
-            params=params,
-            json=json,
-            timeout=10,
+        """
+        Send request, retrying it according to retry policy, and report it to request hooks.
+
+        Concurrent identical GET requests (same url, query parameters and authorization),
+        that are not streamed, are sent once: threads that send the request while
+        it is in flight get the same response, or the same exception.
+        Called on the class (RequestManager.send_request(...)), shared default
+        manager is used.
+
+        :param method: HTTP method
+        :param url: requested url
+        :param headers: request headers
+        :param cookies: request cookies
+        :param params: query parameters
+        :param json: request body
+        :param stream: if True, response body is not read until it is accessed
+        :return: response of the last attempt
+        """
+        authorization = headers.get("Authorization") if headers else None
+        if authorization:
+            expiration = get_jwt_expiration(authorization)
+            if expiration is not None and expiration <= time.time():
+                raise JWTExpiredError()
+        if method.upper() == "GET" and not stream and not cookies and json is None:
+            # body of not streamed response is read, so the response can be shared
+            key = (
+                url,
+                urlencode(sorted((params or {}).items()), doseq=True),
+                authorization,
+            )
+            return self._single_flight.do(
+                key,
+                lambda: self._send_and_report(
+                    method, url, headers, cookies, params, json, stream
+                ),
+            )
+        return self._send_and_report(
+            method, url, headers, cookies, params, json, stream
         )
+
+    def _send_and_report(
+        self,
+        method: str,
+        url: str,
+        headers: Optional[dict],
+        cookies: Optional[dict],
+        params: Optional[dict],
+        json: Optional[Union[dict, list]],
+        stream: bool,
+    ) -> requests.Response:
+        if not self._hooks:
+            return self._send_with_retries(
+                method, url, headers, cookies, params, json, stream
+            )
+
+        event = RequestEvent(method=method, url=url, url_template=get_url_template(url))
+        self._call_hooks("before_request", event)
+        reset_connect_time()
+        start = time.perf_counter()
+        try:
+            response = self._send_with_retries(
+                method, url, headers, cookies, params, json, stream, event=event
+            )
+        except Exception as err:
+            event.error = f"{type(err).__name__}: {err}"
+            raise
+        else:
+            event.status_code = response.status_code
+            event.bytes_sent = get_bytes_sent(response)
+            event.bytes_received = get_bytes_received(response, stream)
+            event.ttfb = get_ttfb(response)
+            return response
+        finally:
+            event.total_time = time.perf_counter() - start
+            event.connect_time = get_connect_time()
+            self._call_hooks("after_request", event)
+
+    def _call_hooks(self, name: str, event: RequestEvent) -> None:
+        for hook in self._hooks:
+            try:
+                getattr(hook, name)(event)
+            except Exception as err:
+                _LOGGER.warning(f"Request hook {type(hook).__name__} failed: {err}")
+
+    def _send_with_retries(
+        self,
+        method: str,
+        url: str,
+        headers: Optional[dict],
+        cookies: Optional[dict],
+        params: Optional[dict],
+        json: Optional[Union[dict, list]],
+        stream: bool,
+        event: Optional[RequestEvent] = None,
+    ) -> requests.Response:
+        policy = self._retry_policy
+        can_retry_method = policy.can_retry_method(method)
+        deadline = (
+            time.monotonic() + policy.total_timeout if policy.total_timeout else None
+        )
+
+        attempt = 0
+        while True:
+            timeout = (policy.connect_timeout, policy.read_timeout)
+            if deadline:
+                remaining = max(deadline - time.monotonic(), 0.001)
+                timeout = tuple(min(value, remaining) for value in timeout)
+            try:
+                request_return = self._session.request(
+                    method=method,
+                    url=url,
+                    verify=False,
+                    cookies=cookies,
+                    headers=headers,
+                    params=params,
+                    json=json,
+                    timeout=timeout,
+                    stream=stream,
+                )
+            except RETRYABLE_EXCEPTIONS as err:
+                # request that failed to connect never reached the server
+                if attempt >= policy.max_retries or not (
+                    can_retry_method or failed_to_connect(err)
+                ):
+                    raise
+                delay = policy.get_backoff(attempt)
+                if deadline and time.monotonic() + delay >= deadline:
+                    raise
+                _LOGGER.debug(f"{method} {url} failed: {err}. Retrying in {delay:.2f}s")
+            else:
+                if (
+                    request_return.status_code not in policy.retry_statuses
+                    or not can_retry_method
+                    or attempt >= policy.max_retries
+                ):
+                    break
+                delay = policy.get_backoff(
+                    attempt, retry_after=request_return.headers.get("Retry-After")
+                )
+                if deadline and time.monotonic() + delay >= deadline:
+                    break
+                _LOGGER.debug(
+                    f"{method} {url} returned {request_return.status_code}. "
+                    f"Retrying in {delay:.2f}s"
+                )
+                request_return.close()
+
+            time.sleep(delay)
+            attempt += 1
+            if event is not None:
+                event.retries = attempt
+
         if request_return.status_code == 401:
             if (
                 RequestManager.decode_response(request_return, output_json=True).get(
@@ -59,7 +495,7 @@ class RequestManager:
                 )
                 == "JWT has expired"
             ):
-                raise ResponseError("JWT has expired. Please log in again.")
+                raise JWTExpiredError()
         return request_return
 
     @staticmethod
@@ -77,10 +513,14 @@ class RequestManager:
 
         try:
             if output_json:
+                content = response.content
+                # fast decoder works on raw bytes of the body
+                if _fast_json_loads is not None and isinstance(content, bytes):
+                    return _fast_json_loads(content)
                 return response.json()
             else:
                 return response.content.decode(encoding)
-        except json.JSONDecodeError as err:
+        except JSON_DECODE_ERRORS as err:
             raise ResponseError(f"Error in response encoding format: {err}")
 
     @staticmethod
@@ -140,15 +580,61 @@ def call_client_func(func: Callable[..., Any], **kwargs) -> Any:
     """
 
     try:
-        func(**kwargs)
+        return func(**kwargs)
     except ConnectionError as err:
         MessageHandler.print_error(f"Failed to connect to server. Try later. {err}")
     except ResponseError as err:
         MessageHandler.print_error(f"{err}")
     except PEPExistsError as err:
         MessageHandler.print_warning(f"PEP already exists. {err}")
+    except SchemaValidationError as err:
+        MessageHandler.print_error(f"{err}")
+    except LocalDataNotFoundError as err:
+        MessageHandler.print_error(f"{err}")
     except OSError as err:
         MessageHandler.print_error(f"{err}")
+    except ImportError as err:
+        # optional dependency of parquet and feather formats is missing
+        message = f"{err}"
+        if "pephubclient[arrow]" not in message:
+            message += ". Install it with: pip install pephubclient[arrow]"
+        MessageHandler.print_error(message)
+
+
+def run_sample_operations(
+    operation: Callable[..., Optional[dict]],
+    requests_args: List[Tuple[str, Optional[dict]]],
+    jobs: int,
+) -> SampleBatchReport:
+    """
+    Run sample operation for many samples in thread pool, collecting errors
+    instead of raising them.
+
+    :param operation: function called with sample name (and sample dict, if provided)
+    :param requests_args: list of (sample name, sample dict or None)
+    :param jobs: number of operations run at the same time
+    :return: report with result of each sample, in input order
+    """
+    if jobs < 1:
+        raise ValueError("Number of jobs must be a positive integer.")
+
+    def run_one(request_args: Tuple[str, Optional[dict]]) -> SampleResult:
+        sample_name, sample_dict = request_args
+        try:
+            if sample_dict is None:
+                sample = operation(sample_name)
+            else:
+                sample = operation(sample_name, sample_dict)
+        except Exception as err:
+            return SampleResult(sample_name=sample_name, success=False, error=str(err))
+        return SampleResult(sample_name=sample_name, success=True, sample=sample)
+
+    if jobs == 1:
+        results = [run_one(request_args) for request_args in requests_args]
+    else:
+        with ThreadPoolExecutor(max_workers=jobs) as executor:
+            results = list(executor.map(run_one, requests_args))
+    return SampleBatchReport(results=results)
 
 
 def is_registry_path(input_string: str) -> bool:
@@ -188,47 +674,72 @@ def _build_filename(registry_path: RegistryPath) -> str:
     return filename
 
 
-def _save_zip_pep(project: dict, zip_filepath: str, force: bool = False) -> None:
+def _save_zip_pep(
+    project: dict,
+    zip_filepath: str,
+    force: bool = False,
+    compression: str = DEFAULT_ZIP_COMPRESSION,
+    compression_level: Optional[int] = None,
+) -> None:
     """
-    Zip and save a project
+    Zip and save a project. Tables are written straight into the archive,
+    without building csv strings in memory.
 
     :param project: peppy project to zip
     :param zip_filepath: path to save zip file
     :param force: overwrite project if exists
+    :param compression: compression method: "store", "deflate", "bzip2" or "lzma"
+    :param compression_level: compression level. By default, default level of the method
     """
 
-    content_to_zip = {}
+    tables_to_zip = {}
     config = project[CONFIG_KEY]
     project_name = config[NAME_KEY]
 
     if project[SAMPLE_RAW_DICT_KEY] is not None:
         config[CFG_SAMPLE_TABLE_KEY] = ["sample_table.csv"]
-        content_to_zip["sample_table.csv"] = pd.DataFrame(
-            project[SAMPLE_RAW_DICT_KEY]
-        ).to_csv(index=False)
+        tables_to_zip["sample_table.csv"] = project[SAMPLE_RAW_DICT_KEY]
 
     if project[SUBSAMPLE_RAW_LIST_KEY] is not None:
         if not isinstance(project[SUBSAMPLE_RAW_LIST_KEY], list):
             config[CFG_SUBSAMPLE_TABLE_KEY] = ["subsample_table1.csv"]
-            content_to_zip["subsample_table1.csv"] = pd.DataFrame(
-                project[SUBSAMPLE_RAW_LIST_KEY]
-            ).to_csv(index=False)
+            tables_to_zip["subsample_table1.csv"] = project[SUBSAMPLE_RAW_LIST_KEY]
         else:
             config[CFG_SUBSAMPLE_TABLE_KEY] = []
             for number, file in enumerate(project[SUBSAMPLE_RAW_LIST_KEY]):
                 file_name = f"subsample_table{number + 1}.csv"
                 config[CFG_SUBSAMPLE_TABLE_KEY].append(file_name)
-                content_to_zip[file_name] = pd.DataFrame(file).to_csv(index=False)
-
-    content_to_zip[f"{project_name}_config.yaml"] = yaml.dump(config, indent=4)
-    FilesManager.save_zip_file(content_to_zip, file_path=zip_filepath, force=force)
+                tables_to_zip[file_name] = file
+
+    with FilesManager.open_zip(
+        zip_filepath,
+        force=force,
+        compression=compression,
+        compression_level=compression_level,
+    ) as zf:
+        for file_name, table in tables_to_zip.items():
+            FilesManager.write_zip_entry(
+                zf,
+                file_name,
+                lambda entry, table=table: pd.DataFrame(table).to_csv(
+                    entry, index=False
+                ),
+            )
+        FilesManager.write_zip_entry(
+            zf,
+            f"{project_name}_config.yaml",
+            lambda entry: yaml.dump(config, entry, indent=4),
+        )
 
     MessageHandler.print_success(f"Project was saved successfully -> {zip_filepath}")
     return None
 
 
 def _save_unzipped_pep(
-    project_dict: dict, folder_path: str, force: bool = False
+    project_dict: dict,
+    folder_path: str,
+    force: bool = False,
+    table_format: str = DEFAULT_TABLE_FORMAT,
 ) -> None:
     """
     Save unzipped project to specified folder
@@ -236,6 +747,7 @@ def _save_unzipped_pep(
     :param project_dict: raw pep project
     :param folder_path: path to save project
     :param force: overwrite project if exists
+    :param table_format: format of sample and subsample tables: csv, parquet or feather
     :return: None
     """
 
@@ -243,7 +755,7 @@ def _save_unzipped_pep(
         return os.path.join(folder_path, fn)
 
     project_name = project_dict[CONFIG_KEY][NAME_KEY]
-    sample_table_filename = "sample_table.csv"
+    sample_table_filename = f"sample_table.{table_format}"
     yaml_full_path = full_path(f"{project_name}_config.yaml")
     sample_full_path = full_path(sample_table_filename)
     if not force:
@@ -264,21 +776,15 @@ def _save_unzipped_pep(
 
     filenames = []
     for idx, subsample in enumerate(subsample_list):
-        fn = f"subsample_table{idx + 1}.csv"
+        fn = f"subsample_table{idx + 1}.{table_format}"
         filenames.append(fn)
-        FilesManager.save_pandas(subsample, full_path(fn), not_force=False)
+        FilesManager.save_table(subsample, full_path(fn), table_format, not_force=False)
     config_dict["subsample_table"] = filenames
 
     FilesManager.save_yaml(config_dict, yaml_full_path, not_force=False)
-    FilesManager.save_pandas(sample_pandas, sample_full_path, not_force=False)
-
-    if config_dict.get("subsample_table"):
-        for number, subsample in enumerate(subsample_list):
-            FilesManager.save_pandas(
-                subsample,
-                os.path.join(folder_path, config_dict["subsample_table"][number]),
-                not_force=False,
-            )
+    FilesManager.save_table(
+        sample_pandas, sample_full_path, table_format, not_force=False
+    )
 
     MessageHandler.print_success(f"Project was saved successfully -> {folder_path}")
     return None
@@ -290,6 +796,9 @@ def save_pep(
     force: bool = False,
     project_path: Optional[str] = None,
     zip: bool = False,
+    compression: str = DEFAULT_ZIP_COMPRESSION,
+    compression_level: Optional[int] = None,
+    format: str = DEFAULT_TABLE_FORMAT,
 ) -> None:
     """
     Save project locally.
@@ -300,12 +809,23 @@ def save_pep(
     :param bool force: overwrite project if exists
     :param str project_path: Path where project will be saved. By default, it will be saved in current directory.
     :param bool zip: If True, save project as zip file
+    :param str compression: compression method of zip file: "store" (fastest), "deflate",
+        "bzip2" or "lzma"
+    :param int compression_level: compression level of zip file. By default, default level of the method
+    :param str format: format of sample and subsample tables: "csv", or typed columnar
+        "parquet" or "feather" (require pyarrow). Columnar tables can't be zipped.
     :return: None
     """
+    if format not in [table_format.value for table_format in TableFormat]:
+        raise ValueError(f"Unknown table format: '{format}'")
+    if zip and format != TableFormat.CSV.value:
+        raise ValueError(
+            f"Only csv tables can be saved in zip file, {format} is compressed already."
+        )
     if isinstance(project, peppy.Project):
         project = project.to_dict(extended=True, orient="records")
 
-    project = ProjectDict(**project).model_dump(by_alias=True)
+    project = ProjectDict.to_raw_dict(project)
 
     if not project_path:
         project_path = os.getcwd()
@@ -320,13 +840,310 @@ def save_pep(
             project,
             zip_filepath=f"{os.path.join(project_path, file_name)}.zip",
             force=force,
+            compression=compression,
+            compression_level=compression_level,
         )
         return None
 
     folder_path = FilesManager.create_project_folder(
         parent_path=project_path, folder_name=file_name
     )
-    _save_unzipped_pep(project, folder_path, force=force)
+    _save_unzipped_pep(project, folder_path, force=force, table_format=format)
+
+
+def _load_local_config(folder_path: str) -> Tuple[Path, dict]:
+    """
+    Find and read config of project saved by save_pep
+
+    :param folder_path: folder with project config (*_config.yaml) and tables
+    :return: path of the config file and config
+    """
+    config_paths = sorted(Path(folder_path).glob("*_config.yaml"))
+    if not config_paths:
+        raise FileDoesNotExistError(
+            f"Project config file (*_config.yaml) not found in: {folder_path}"
+        )
+    with open(config_paths[0], "r") as f:
+        return config_paths[0], yaml.safe_load(f)
+
+
+def load_local_project(folder_path: str) -> peppy.Project:
+    """
+    Load project saved by save_pep (unzipped), with tables in any supported format.
+
+    :param folder_path: folder with project config (*_config.yaml) and tables
+    :return: peppy project
+    """
+    config_path, config = _load_local_config(folder_path)
+
+    sample_table = config.get("sample_table")
+    if not sample_table or sample_table.endswith(".csv"):
+        # csv tables are read by peppy itself
+        return peppy.Project(cfg=str(config_path))
+
+    samples = FilesManager.load_table(os.path.join(folder_path, sample_table))
+    subsamples = [
+        FilesManager.load_table(os.path.join(folder_path, file_name)).to_dict(
+            orient="records"
+        )
+        for file_name in config.get("subsample_table") or []
+    ]
+    return peppy.Project.from_dict(
+        {
+            CONFIG_KEY: config,
+            SAMPLE_RAW_DICT_KEY: samples.to_dict(orient="records"),
+            SUBSAMPLE_RAW_LIST_KEY: subsamples or None,
+        }
+    )
+
+
+def load_local_tables(
+    folder_path: str,
+) -> Tuple[dict, pd.DataFrame, List[pd.DataFrame]]:
+    """
+    Load config and tables of project saved by save_pep (unzipped), without
+    creating peppy project.
+
+    :param folder_path: folder with project config (*_config.yaml) and tables
+    :return: config, sample table and subsample tables
+    """
+    _, config = _load_local_config(folder_path)
+    if not config.get("sample_table"):
+        raise FileDoesNotExistError(f"Project in {folder_path} has no sample table.")
+    subsample_tables = config.get("subsample_table") or []
+    if isinstance(subsample_tables, str):
+        subsample_tables = [subsample_tables]
+    return (
+        config,
+        FilesManager.load_table(os.path.join(folder_path, config["sample_table"])),
+        [
+            FilesManager.load_table(os.path.join(folder_path, file_name))
+            for file_name in subsample_tables
+        ],
+    )
+
+
+def load_local_raw_project(folder_path: str) -> dict:
+    """
+    Load project saved by save_pep (unzipped) as raw project, as it is returned by
+    PEPhub: config with sample and subsample tables as lists of row dicts
+
+    :param folder_path: folder with project config (*_config.yaml) and tables
+    :return: raw project dict
+    """
+    config, sample_table, subsample_tables = load_local_tables(folder_path)
+    # table file names are added to config by save_pep
+    config = {
+        key: value
+        for key, value in config.items()
+        if key not in ("sample_table", "subsample_table")
+    }
+
+    def to_records(table: pd.DataFrame) -> List[dict]:
+        # empty cells are missing values, as null in raw project
+        table = table.astype(object)
+        return table.where(table.notna(), None).to_dict(orient="records")
+
+    return {
+        CONFIG_KEY: config,
+        SAMPLE_RAW_DICT_KEY: to_records(sample_table),
+        SUBSAMPLE_RAW_LIST_KEY: [to_records(table) for table in subsample_tables],
+    }
+
+
+def build_sample_table(
+    samples: Union[List[dict], pd.DataFrame],
+    index: Optional[str] = SAMPLE_NAME_ATTR,
+    categorical: Union[bool, Iterable[str]] = False,
+) -> pd.DataFrame:
+    """
+    Build sample (or subsample) table from raw sample dicts in one vectorized step,
+    without peppy samples, sample modifiers and attribute derivation.
+
+    :param samples: raw sample dicts (e.g. _sample_dict of raw project), or table
+    :param index: column used as index of the table (it is also kept as a column),
+        like in peppy sample_table. If None or column is missing, index is not set
+    :param categorical: columns converted to categorical dtype. If True, text columns
+        with at most DEFAULT_CATEGORICAL_RATIO of unique values (except the index column)
+    :return: table
+    """
+    table = samples if isinstance(samples, pd.DataFrame) else pd.DataFrame(samples)
+    if categorical is True:
+        max_unique = len(table) * DEFAULT_CATEGORICAL_RATIO
+        categorical = [
+            column
+            for column in table.columns
+            if column != index
+            and pd.api.types.is_string_dtype(table[column])
+            and table[column].nunique() <= max_unique
+        ]
+    elif categorical is False:
+        categorical = []
+    for column in categorical:
+        if column in table.columns:
+            table[column] = table[column].astype("category")
+    if index is not None and index in table.columns:
+        table.index = pd.Index(table[index].astype(str), name=index)
+    return table
+
+
+def build_sample_tables(
+    raw_project: dict,
+    subsamples: bool = True,
+    categorical: Union[bool, Iterable[str]] = False,
+) -> Tuple[pd.DataFrame, List[pd.DataFrame]]:
+    """
+    Build sample table and subsample tables of raw project (see build_sample_table)
+
+    :param raw_project: raw project dict with peppy keys. Samples and subsamples can be
+        lists of dicts, or DataFrames
+    :param subsamples: if False, subsample tables are not built
+    :param categorical: columns converted to categorical dtype (see build_sample_table)
+    :return: sample table and subsample tables
+    """
+    config = raw_project.get(CONFIG_KEY) or {}
+    index = config.get(SAMPLE_TABLE_INDEX_KEY) or SAMPLE_NAME_ATTR
+    if categorical is not True and categorical is not False:
+        categorical = list(categorical)
+    samples = raw_project.get(SAMPLE_RAW_DICT_KEY)
+    return (
+        build_sample_table([] if samples is None else samples, index, categorical),
+        [
+            build_sample_table(table, None, categorical)
+            for table in (raw_project.get(SUBSAMPLE_RAW_LIST_KEY) or [])
+            if subsamples
+        ],
+    )
+
+
+def save_pep_stream(
+    chunks: Iterable[bytes],
+    reg_path: str,
+    force: bool = False,
+    project_path: Optional[str] = None,
+    zip: bool = False,
+    compression: str = DEFAULT_ZIP_COMPRESSION,
+    compression_level: Optional[int] = None,
+) -> None:
+    """
+    Save raw project streamed from PEPhub locally, without loading it into memory.
+    Sample and subsample tables are written row by row, so memory usage doesn't depend
+    on the number of samples.
+
+    :param chunks: byte chunks of raw project in JSON format (e.g. response.iter_content())
+    :param str reg_path: Project registry path in PEPhub (e.g. databio/base:default)
+    :param bool force: overwrite project if exists
+    :param str project_path: Path where project will be saved. By default, it will be saved in current directory.
+    :param bool zip: If True, save project as zip file
+    :param str compression: compression method of zip file (see save_pep)
+    :param int compression_level: compression level of zip file (see save_pep)
+    :return: None
+    """
+    if not project_path:
+        project_path = os.getcwd()
+    file_name = _build_filename(RegistryPath(**parse_registry_path(reg_path)))
+
+    if zip:
+        saved_path = f"{os.path.join(project_path, file_name)}.zip"
+        FilesManager.check_writable(path=saved_path, force=force)
+        work_dir_parent = project_path
+    else:
+        saved_path = FilesManager.create_project_folder(
+            parent_path=project_path, folder_name=file_name
+        )
+        work_dir_parent = saved_path
+
+    # files are written to temporary folder first, as name of config file is known
+    # only when whole project is read
+    with tempfile.TemporaryDirectory(prefix=".phc-", dir=work_dir_parent) as work_dir:
+        config = write_project_tables(chunks, work_dir)
+        config_file_name = f"{config[NAME_KEY]}_config.yaml"
+        FilesManager.save_yaml(config, os.path.join(work_dir, config_file_name))
+        file_names = [config_file_name, config["sample_table"]]
+        file_names.extend(config["subsample_table"])
+
+        if zip:
+            FilesManager.save_zip_from_files(
+                {name: os.path.join(work_dir, name) for name in file_names},
+                file_path=saved_path,
+                force=force,
+                compression=compression,
+                compression_level=compression_level,
+            )
+        else:
+            if not force:
+                extant = [
+                    os.path.join(saved_path, name)
+                    for name in file_names[:2]
+                    if os.path.isfile(os.path.join(saved_path, name))
+                ]
+                if extant:
+                    raise PEPExistsError(
+                        f"{len(extant)} file(s) exist(s): {', '.join(extant)}"
+                    )
+            for name in file_names:
+                os.replace(os.path.join(work_dir, name), os.path.join(saved_path, name))
+
+    MessageHandler.print_success(f"Project was saved successfully -> {saved_path}")
+    return None
+
+
+def sample_digest(sample: dict) -> str:
+    """
+    Digest of sample attributes, independent of attribute order
+
+    :param sample: sample as dict (attribute -> value)
+    :return: hex digest
+    """
+    return hashlib.md5(
+        json.dumps(sample, sort_keys=True, default=str).encode("utf-8")
+    ).hexdigest()
+
+
+def compute_sample_diff(
+    local_samples: List[dict], remote_samples: List[dict], sample_name_key: str
+) -> Optional[SampleDiff]:
+    """
+    Compare local and remote sample tables sample by sample, using sample digests.
+
+    :param local_samples: local samples in records format
+    :param remote_samples: samples of the project in PEPhub, in records format
+    :param sample_name_key: attribute with sample name
+    :return: samples to add, update and remove, or None if tables can't be reconciled
+        sample by sample (missing or duplicated sample names, changed order of samples,
+        or changed sample attributes)
+    """
+    local_by_name = {sample.get(sample_name_key): sample for sample in local_samples}
+    remote_by_name = {sample.get(sample_name_key): sample for sample in remote_samples}
+    if (
+        None in local_by_name
+        or None in remote_by_name
+        or len(local_by_name) != len(local_samples)
+        or len(remote_by_name) != len(remote_samples)
+    ):
+        return None
+
+    diff = SampleDiff(
+        added=[name for name in local_by_name if name not in remote_by_name],
+        removed=[name for name in remote_by_name if name not in local_by_name],
+    )
+    for name, sample in local_by_name.items():
+        remote_sample = remote_by_name.get(name)
+        if remote_sample is None:
+            continue
+        if sample_digest(sample) != sample_digest(remote_sample):
+            # update only changes provided attributes, it can't remove them
+            if sample.keys() != remote_sample.keys():
+                return None
+            diff.updated.append(name)
+
+    # new samples are added at the end of the sample table
+    removed = set(diff.removed)
+    expected_order = [name for name in remote_by_name if name not in removed]
+    expected_order.extend(diff.added)
+    if expected_order != list(local_by_name):
+        return None
+    return diff
 
 
 def open_schema(file_path: Union[str, Path]) -> dict:
@@ -0,0 +1,312 @@
+import bisect
+import datetime
+import logging
+import re
+import threading
+import time
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+from pephubclient.constants import (
+    PEPHUB_BASE_URL,
+    PEPHUB_PEP_ANNOTATION_URL,
+    PEPHUB_PEP_API_BASE_URL,
+    PEPHUB_PEP_SEARCH_URL,
+    PEPHUB_PUSH_URL,
+    PEPHUB_SAMPLE_URL,
+    PEPHUB_VIEW_SAMPLE_URL,
+    PEPHUB_VIEW_URL,
+)
+from pephubclient.models import EndpointStats, RequestEvent, RequestStats
+from pephubclient.pephub_oauth.const import (
+    PEPHUB_DEVICE_INIT_URI,
+    PEPHUB_DEVICE_TOKEN_URI,
+)
+from pephubclient.schemas.constants import (
+    PEPHUB_SCHEMA_NEW_SCHEMA_URL,
+    PEPHUB_SCHEMA_NEW_VERSION_URL,
+    PEPHUB_SCHEMA_RECORD_URL,
+    PEPHUB_SCHEMA_VERSION_URL,
+    PEPHUB_SCHEMA_VERSIONS_URL,
+)
+
+_LOGGER = logging.getLogger("pephubclient")
+
+URL_TEMPLATES = [
+    PEPHUB_PEP_API_BASE_URL + "{namespace}/{project}",
+    PEPHUB_PEP_ANNOTATION_URL,
+    PEPHUB_PEP_SEARCH_URL,
+    PEPHUB_PUSH_URL,
+    PEPHUB_SAMPLE_URL,
+    PEPHUB_VIEW_URL,
+    PEPHUB_VIEW_SAMPLE_URL,
+    PEPHUB_SCHEMA_NEW_SCHEMA_URL,
+    PEPHUB_SCHEMA_NEW_VERSION_URL,
+    PEPHUB_SCHEMA_RECORD_URL,
+    PEPHUB_SCHEMA_VERSIONS_URL,
+    PEPHUB_SCHEMA_VERSION_URL,
+    PEPHUB_DEVICE_INIT_URI,
+    PEPHUB_DEVICE_TOKEN_URI,
+]
+
+# upper bounds (in seconds) of request time histogram buckets, last bucket is unbounded
+DEFAULT_HISTOGRAM_BOUNDS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+_PLACEHOLDER = re.compile(r"\{[^/{}]+\}")
+
+
+def _compile_templates() -> List[Tuple[re.Pattern, str]]:
+    compiled = []
+    for template in URL_TEMPLATES:
+        path = urlsplit(template).path
+        pattern = "".join(
+            "[^/]+" if _PLACEHOLDER.fullmatch(part) else re.escape(part)
+            for part in re.split(r"(\{[^/{}]+\})", path)
+            if part
+        )
+        compiled.append((re.compile(pattern), template[len(PEPHUB_BASE_URL) :]))
+    # templates with fewer placeholders first, so that literal segments
+    # (e.g. .../versions/json) win over placeholders (.../versions/{version})
+    compiled.sort(key=lambda item: len(_PLACEHOLDER.findall(item[1])))
+    return compiled
+
+
+_COMPILED_TEMPLATES = _compile_templates()
+
+
+@lru_cache(maxsize=1024)
+def get_url_template(url: str) -> str:
+    """
+    Get PEPhub endpoint template of the url, e.g. api/v1/projects/{namespace}/{project}.
+    Requests are aggregated by template, so that statistics don't grow with number of projects.
+
+    :param url: requested url
+    :return: endpoint template, or path of the url if it doesn't match any endpoint
+    """
+    path = urlsplit(url).path
+    for pattern, template in _COMPILED_TEMPLATES:
+        if pattern.fullmatch(path):
+            return template
+    return path
+
+
+class RequestHook:
+    """
+    Base class of request hooks. Hooks added to a client are called before and after
+    every request sent with send_request, including all its retries.
+    Exceptions raised by hooks are logged and ignored.
+    """
+
+    def before_request(self, event: RequestEvent) -> None:
+        """
+        Called before the first attempt of the request
+
+        :param event: request event with method, url and url template
+        :return: None
+        """
+
+    def after_request(self, event: RequestEvent) -> None:
+        """
+        Called after the last attempt of the request, also if it failed with an exception
+
+        :param event: request event with status code, transferred bytes, timings and retries
+        :return: None
+        """
+
+
+class LoggingHook(RequestHook):
+    """
+    Log one summary line of each request
+    """
+
+    def __init__(self, level: int = logging.DEBUG):
+        """
+        :param level: logging level of summary lines
+        """
+        self.level = level
+
+    def after_request(self, event: RequestEvent) -> None:
+        if not _LOGGER.isEnabledFor(self.level):
+            return None
+        outcome = event.error or event.status_code
+        received = "?" if event.bytes_received is None else event.bytes_received
+        ttfb = "?" if event.ttfb is None else f"{event.ttfb * 1000:.0f}ms"
+        _LOGGER.log(
+            self.level,
+            f"{event.method} {event.url_template} -> {outcome} "
+            f"in {event.total_time * 1000:.0f}ms (connect {event.connect_time * 1000:.0f}ms, "
+            f"ttfb {ttfb}), sent {event.bytes_sent}B, received {received}B, "
+            f"retries {event.retries}",
+        )
+
+
+class HistogramHook(RequestHook):
+    """
+    In-memory statistics of requests per endpoint (method and url template):
+    number of requests, errors, retries, transferred bytes and histogram of request times.
+    Safe to share by threads.
+    """
+
+    def __init__(self, bounds: Tuple[float, ...] = DEFAULT_HISTOGRAM_BOUNDS):
+        """
+        :param bounds: sorted upper bounds of histogram buckets in seconds
+        """
+        self.bounds = tuple(bounds)
+        self._lock = threading.Lock()
+        self._endpoints: Dict[Tuple[str, str], EndpointStats] = {}
+
+    def after_request(self, event: RequestEvent) -> None:
+        key = (event.method, event.url_template)
+        bucket = bisect.bisect_left(self.bounds, event.total_time)
+        with self._lock:
+            stats = self._endpoints.get(key)
+            if stats is None:
+                stats = self._endpoints[key] = EndpointStats(
+                    method=event.method,
+                    url_template=event.url_template,
+                    histogram=[0] * (len(self.bounds) + 1),
+                )
+            stats.count += 1
+            if event.error or (event.status_code or 0) >= 400:
+                stats.errors += 1
+            stats.retries += event.retries
+            stats.bytes_sent += event.bytes_sent
+            stats.bytes_received += event.bytes_received or 0
+            stats.total_time += event.total_time
+            stats.max_time = max(stats.max_time, event.total_time)
+            stats.histogram[bucket] += 1
+
+    def stats(self) -> RequestStats:
+        """
+        Get statistics of requests recorded so far
+
+        :return: copy of current statistics
+        """
+        with self._lock:
+            return RequestStats(
+                bounds=list(self.bounds),
+                endpoints=[
+                    stats.model_copy(deep=True) for stats in self._endpoints.values()
+                ],
+            )
+
+    def reset(self) -> None:
+        """
+        Remove all recorded statistics
+        """
+        with self._lock:
+            self._endpoints.clear()
+
+
+_connect_times = threading.local()
+
+
+def reset_connect_time() -> None:
+    """
+    Reset time spent on opening connections by current thread
+    """
+    _connect_times.value = 0.0
+
+
+def get_connect_time() -> float:
+    """
+    Get time spent on opening connections (DNS lookup, TCP and TLS handshake)
+    by current thread since the last reset
+
+    :return: time in seconds
+    """
+    return getattr(_connect_times, "value", 0.0)
+
+
+def _timed_connect(connect):
+    def wrapper(self, *args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return connect(self, *args, **kwargs)
+        finally:
+            _connect_times.value = get_connect_time() + time.perf_counter() - start
+
+    return wrapper
+
+
+class _TimedHTTPConnection(HTTPConnection):
+    connect = _timed_connect(HTTPConnection.connect)
+
+
+class _TimedHTTPSConnection(HTTPSConnection):
+    connect = _timed_connect(HTTPSConnection.connect)
+
+
+class _TimedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = _TimedHTTPConnection
+
+
+class _TimedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = _TimedHTTPSConnection
+
+
+class TimedHTTPAdapter(HTTPAdapter):
+    """
+    HTTP adapter, whose connections record time spent on opening them (see get_connect_time).
+    Requests sent over reused keep-alive connections don't open any.
+    """
+
+    def init_poolmanager(self, *args, **kwargs) -> None:
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": _TimedHTTPConnectionPool,
+            "https": _TimedHTTPSConnectionPool,
+        }
+
+
+def get_bytes_sent(response: requests.Response) -> int:
+    """
+    Get size of the body of request, that the response answers
+
+    :param response: response
+    :return: number of bytes
+    """
+    body = getattr(getattr(response, "request", None), "body", None)
+    if isinstance(body, bytes):
+        return len(body)
+    if isinstance(body, str):
+        return len(body.encode("utf-8"))
+    return 0
+
+
+def get_bytes_received(response: requests.Response, stream: bool) -> Optional[int]:
+    """
+    Get size of the response body
+
+    :param response: response
+    :param stream: if True, body was not read yet, and its size is taken from
+        Content-Length header
+    :return: number of bytes, or None if it is not known
+    """
+    if not stream:
+        content = getattr(response, "content", None)
+        return len(content) if isinstance(content, bytes) else None
+    headers = getattr(response, "headers", None)
+    try:
+        return int(headers["Content-Length"])
+    except (TypeError, KeyError, ValueError):
+        return None
+
+
+def get_ttfb(response: requests.Response) -> Optional[float]:
+    """
+    Get time between sending the request and receiving response headers
+
+    :param response: response
+    :return: time in seconds, or None if it is not known
+    """
+    elapsed = getattr(response, "elapsed", None)
+    if isinstance(elapsed, datetime.timedelta):
+        return elapsed.total_seconds()
+    return None
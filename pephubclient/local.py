@@ -0,0 +1,163 @@
+import os
+import threading
+import time
+import warnings
+from typing import Dict, List, Optional, Tuple
+
+from pephubclient.cache import ProjectCache
+from pephubclient.constants import MIRROR_STATE_FILE_NAME
+from pephubclient.exceptions import StaleDataWarning
+from pephubclient.helpers import format_age, load_local_raw_project
+from pephubclient.models import MirrorState, RegistryPath
+
+
+def warn_stale(description: str, stored_at: float, source: str) -> None:
+    """
+    Report that data was served locally, and how old it is, with StaleDataWarning
+
+    :param description: what was served, e.g. "Project 'databio/pep:default'"
+    :param stored_at: time (unix timestamp) when data was downloaded from PEPhub
+    :param source: where data was served from
+    :return: None
+    """
+    age = time.time() - stored_at
+    warnings.warn(
+        StaleDataWarning(
+            f"{description} served from {source}, downloaded {format_age(age)} ago.",
+            age=age,
+            source=source,
+        ),
+        stacklevel=3,
+    )
+
+
+class LocalProjectSource:
+    """
+    Projects and views available without network access: entries of the project
+    cache, and projects in namespace mirrors created by PEPHubClient.mirror.
+    """
+
+    def __init__(
+        self, cache: Optional[ProjectCache] = None, mirror_dirs: List[str] = None
+    ):
+        """
+        :param cache: project cache
+        :param mirror_dirs: directories of namespace mirrors
+        """
+        self.cache = cache
+        self.mirror_dirs = list(mirror_dirs or [])
+        # parsed mirror state files, reloaded only if file was modified
+        self._mirror_states: Dict[str, Tuple[float, MirrorState]] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def build_view_key(registry_path: RegistryPath, view_name: str) -> str:
+        """
+        Build cache key of project view
+
+        :param registry_path: parsed registry path of the project
+        :param view_name: name of the view
+        :return: key in format namespace/name:tag/views/view_name
+        """
+        return f"{ProjectCache.build_key(registry_path)}/views/{view_name}"
+
+    def get_project(
+        self, registry_path: RegistryPath
+    ) -> Optional[Tuple[dict, float, str]]:
+        """
+        Find raw project in the cache or in mirrors
+
+        :param registry_path: parsed registry path of the project
+        :return: raw project, time when it was downloaded and description of the source,
+            or None if project is not available locally
+        """
+        if self.cache is not None:
+            found = self._get_from_cache(ProjectCache.build_key(registry_path))
+            if found:
+                return found
+        for mirror_dir in self.mirror_dirs:
+            found = self._get_from_mirror(mirror_dir, registry_path)
+            if found:
+                return found
+        return None
+
+    def get_view(
+        self, registry_path: RegistryPath, view_name: str
+    ) -> Optional[Tuple[dict, float, str]]:
+        """
+        Find view in the cache. Views are stored in the cache by PEPHubView.get.
+
+        :param registry_path: parsed registry path of the project
+        :param view_name: name of the view
+        :return: view as returned by PEPhub, time when it was downloaded and description
+            of the source, or None if view is not available locally
+        """
+        if self.cache is None:
+            return None
+        return self._get_from_cache(self.build_view_key(registry_path, view_name))
+
+    def set_view(self, registry_path: RegistryPath, view_name: str, view: dict) -> None:
+        """
+        Store view in the cache, if client has one. Used in prefer-local mode only,
+        so that views don't evict cached projects of online clients
+
+        :param registry_path: parsed registry path of the project
+        :param view_name: name of the view
+        :param view: view as returned by PEPhub
+        :return: None
+        """
+        if self.cache is not None:
+            # digest of views is not available, they are refreshed on every get
+            self.cache.set(self.build_view_key(registry_path, view_name), "", view)
+
+    def _get_from_cache(self, key: str) -> Optional[Tuple[dict, float, str]]:
+        stored_at = self.cache.get_stored_at(key)
+        if stored_at is None:
+            return None
+        data = self.cache.get(key)
+        if data is None:
+            return None
+        return data, stored_at, f"local cache '{self.cache.cache_dir}'"
+
+    def _get_from_mirror(
+        self, mirror_dir: str, registry_path: RegistryPath
+    ) -> Optional[Tuple[dict, float, str]]:
+        state = self._read_mirror_state(mirror_dir)
+        if state is None or state.namespace != registry_path.namespace:
+            return None
+        mirrored = state.projects.get(f"{registry_path.item}:{registry_path.tag}")
+        if mirrored is None:
+            return None
+        # mirror directory could be moved since the sync, project folders are next to the state file
+        project_path = os.path.join(mirror_dir, os.path.basename(mirrored.path))
+        if not os.path.isdir(project_path):
+            return None
+
+        # state files written before download times were recorded have sync time only
+        downloaded_at = mirrored.downloaded_at or state.last_sync
+        return (
+            load_local_raw_project(project_path),
+            downloaded_at.timestamp(),
+            f"mirror '{mirror_dir}'",
+        )
+
+    def _read_mirror_state(self, mirror_dir: str) -> Optional[MirrorState]:
+        state_path = os.path.join(mirror_dir, MIRROR_STATE_FILE_NAME)
+        try:
+            modified = os.path.getmtime(state_path)
+        except OSError:
+            return None
+        with self._lock:
+            cached = self._mirror_states.get(state_path)
+        if cached and cached[0] == modified:
+            return cached[1]
+        try:
+            with open(state_path, "r") as f:
+                state = MirrorState.model_validate_json(f.read())
+        except (OSError, ValueError):
+            return None
+        if state.last_sync is None:
+            return None
+        with self._lock:
+            self._mirror_states[state_path] = (modified, state)
+        return state
@@ -1,10 +1,24 @@
 import datetime
-from typing import Optional, List, Union
+import email.utils
+import random
+from typing import Dict, Optional, List, Set, Union
 
 from pydantic import BaseModel, Field, field_validator, ConfigDict
 from peppy.const import CONFIG_KEY, SUBSAMPLE_RAW_LIST_KEY, SAMPLE_RAW_DICT_KEY
 
 
+class RegistryPath(BaseModel):
+    protocol: Optional[str] = None
+    namespace: str
+    item: str
+    subitem: Optional[str] = None
+    tag: Optional[str] = "default"
+
+    @field_validator("tag")
+    def tag_should_not_be_none(cls, v):
+        return v or "default"
+
+
 class ProjectDict(BaseModel):
     """
     Project dict (raw) model
@@ -16,6 +30,31 @@ class ProjectDict(BaseModel):
 
     model_config = ConfigDict(populate_by_name=True, extra="allow")
 
+    @classmethod
+    def to_raw_dict(cls, project: dict) -> dict:
+        """
+        Validate top-level keys of the project and rename them to peppy raw keys.
+
+        Result is the same as ProjectDict(**project).model_dump(by_alias=True), but sample
+        and subsample lists are not validated nor copied, so it is cheap for large projects.
+        Config is copied, as it is modified when project is saved.
+
+        :param project: raw project dict, with PEPhub or peppy keys
+        :raise ValidationError: if project keys are missing or have incorrect type
+        :return: raw project dict with peppy keys
+        """
+        # lists are replaced with empty ones, to validate only their type
+        cls.model_validate(
+            {
+                key: [] if isinstance(value, list) else value
+                for key, value in project.items()
+            }
+        )
+        aliases = {name: field.alias for name, field in cls.model_fields.items()}
+        raw_project = {aliases.get(key, key): value for key, value in project.items()}
+        raw_project[CONFIG_KEY] = dict(raw_project[CONFIG_KEY])
+        return raw_project
+
 
 class ProjectUploadData(BaseModel):
     """
@@ -53,3 +92,297 @@ class SearchReturnModel(BaseModel):
     limit: int
     offset: int
     results: List[ProjectAnnotationModel]
+
+
+class PullResult(BaseModel):
+    """
+    Result of pulling single project in bulk pull
+    """
+
+    registry_path: str
+    success: bool
+    error: Optional[str] = None
+
+
+class MirroredProject(BaseModel):
+    """
+    State of one project in local mirror of namespace
+    """
+
+    digest: str
+    last_update_date: datetime.datetime
+    # project folder name, relative to mirror directory
+    path: str
+    removed: bool = False
+    downloaded_at: Optional[datetime.datetime] = None
+
+
+class MirrorState(BaseModel):
+    """
+    State of local mirror of namespace, saved in mirror directory
+    """
+
+    namespace: str
+    last_sync: Optional[datetime.datetime] = None
+    projects: Dict[str, MirroredProject] = {}
+
+
+class MirrorReport(BaseModel):
+    """
+    Result of namespace mirror synchronization
+    """
+
+    namespace: str
+    added: List[str] = []
+    updated: List[str] = []
+    unchanged: int = 0
+    removed: List[str] = []
+    failed: List[PullResult] = []
+
+
+class SampleResult(BaseModel):
+    """
+    Result of operation on single sample in batch sample operation
+    """
+
+    sample_name: str
+    success: bool
+    error: Optional[str] = None
+    sample: Optional[dict] = None
+
+
+class SampleBatchReport(BaseModel):
+    """
+    Aggregated results of batch sample operation, in input order
+    """
+
+    results: List[SampleResult] = []
+
+    @property
+    def succeeded(self) -> List[str]:
+        return [result.sample_name for result in self.results if result.success]
+
+    @property
+    def failed(self) -> List[SampleResult]:
+        return [result for result in self.results if not result.success]
+
+    @property
+    def samples(self) -> Dict[str, dict]:
+        """
+        Samples returned by get_many (sample name -> sample)
+        """
+        return {
+            result.sample_name: result.sample
+            for result in self.results
+            if result.success and result.sample is not None
+        }
+
+
+class ViewSyncReport(BaseModel):
+    """
+    Result of view membership synchronization
+    """
+
+    added: List[str] = []
+    removed: List[str] = []
+    recreated: bool = False
+    requests_sent: int = 0
+    operations_saved: int = 0
+    failed: List[SampleResult] = []
+
+
+class SampleDiff(BaseModel):
+    """
+    Samples that have to be added, updated and removed in PEPhub
+    to make remote sample table equal to the local one
+    """
+
+    added: List[str] = []
+    updated: List[str] = []
+    removed: List[str] = []
+
+    @property
+    def number_of_operations(self) -> int:
+        return len(self.added) + len(self.updated) + len(self.removed)
+
+
+class RetryPolicy(BaseModel):
+    """
+    Retry policy of requests sent to PEPhub.
+
+    Failed connections, timeouts and responses with `retry_statuses` are retried
+    with exponential backoff: backoff_factor * 2 ** attempt seconds, capped by
+    max_backoff. With jitter, random delay between 0 and backoff is used instead.
+    Retry-After header sent by the server is honoured. No attempt is started after
+    `total_timeout` seconds from the start of the call.
+    Only idempotent methods are retried, unless `retry_non_idempotent` is set;
+    requests that failed to connect (connection timed out or refused) are always
+    retried, as they never reached the server.
+    """
+
+    max_retries: int = 3
+    backoff_factor: float = 0.5
+    max_backoff: float = 30.0
+    jitter: bool = True
+    retry_statuses: Set[int] = {429, 502, 503, 504}
+    retry_methods: Set[str] = {"GET", "HEAD", "OPTIONS", "PUT", "DELETE"}
+    retry_non_idempotent: bool = False
+    respect_retry_after: bool = True
+    connect_timeout: float = 10.0
+    read_timeout: float = 10.0
+    total_timeout: Optional[float] = 120.0
+
+    def can_retry_method(self, method: str) -> bool:
+        """
+        Check if request sent with provided method can be retried
+
+        :param method: HTTP method
+        :return: True if method is idempotent, or retrying non-idempotent methods is allowed
+        """
+        return self.retry_non_idempotent or method.upper() in self.retry_methods
+
+    def get_backoff(self, attempt: int, retry_after: Optional[str] = None) -> float:
+        """
+        Get number of seconds to wait before next attempt
+
+        :param attempt: number of the attempt that failed, starting from 0
+        :param retry_after: value of Retry-After header of the failed response
+        :return: delay in seconds
+        """
+        delay = min(self.max_backoff, self.backoff_factor * 2**attempt)
+        if self.jitter:
+            delay = random.uniform(0, delay)
+        if self.respect_retry_after and retry_after:
+            delay = max(delay, self._parse_retry_after(retry_after))
+        return delay
+
+    @staticmethod
+    def _parse_retry_after(retry_after: str) -> float:
+        """
+        Parse Retry-After header value given in seconds or as HTTP date
+
+        :param retry_after: header value
+        :return: number of seconds to wait, 0 if value can't be parsed
+        """
+        try:
+            return max(0.0, float(retry_after))
+        except (TypeError, ValueError):
+            pass
+        try:
+            retry_date = email.utils.parsedate_to_datetime(retry_after)
+        except (TypeError, ValueError):
+            return 0.0
+        if retry_date is None:
+            return 0.0
+        if retry_date.tzinfo is None:
+            retry_date = retry_date.replace(tzinfo=datetime.timezone.utc)
+        now = datetime.datetime.now(datetime.timezone.utc)
+        return max(0.0, (retry_date - now).total_seconds())
+
+
+class TokenExpiryPolicy(BaseModel):
+    """
+    Check of JWT expiration at the start of long batch operations (pull_many, mirror,
+    sample batch operations and view sync), so that they don't fail halfway through
+    when the token expires.
+
+    If the token expires in less than `margin` seconds, a warning is logged, or
+    JWTExpiredError is raised, if `block` is set. Tokens that have already expired
+    are never sent to PEPhub.
+    """
+
+    margin: float = 900.0
+    block: bool = False
+
+
+class RequestEvent(BaseModel):
+    """
+    Request sent to PEPhub, passed to request hooks.
+    Status, received bytes and timings are set only in after_request.
+    """
+
+    method: str
+    url: str
+    url_template: str
+    status_code: Optional[int] = None
+    error: Optional[str] = None
+    bytes_sent: int = 0
+    # None if size of the body is not known (e.g. streamed response without Content-Length)
+    bytes_received: Optional[int] = None
+    # time spent on opening new connections (DNS lookup, TCP and TLS handshake),
+    # 0 if request was sent over a reused keep-alive connection
+    connect_time: float = 0.0
+    # time between sending the last attempt and receiving response headers
+    ttfb: Optional[float] = None
+    # time of all attempts, including backoff delays between them
+    total_time: float = 0.0
+    retries: int = 0
+
+
+class EndpointStats(BaseModel):
+    """
+    Statistics of requests sent to one endpoint (method and url template)
+    """
+
+    method: str
+    url_template: str
+    count: int = 0
+    errors: int = 0
+    retries: int = 0
+    bytes_sent: int = 0
+    bytes_received: int = 0
+    total_time: float = 0.0
+    max_time: float = 0.0
+    # number of requests in each bucket of RequestStats.bounds, last bucket is unbounded
+    histogram: List[int] = []
+
+    @property
+    def mean_time(self) -> float:
+        return self.total_time / self.count if self.count else 0.0
+
+
+class RequestStats(BaseModel):
+    """
+    Statistics of requests sent by client, collected by HistogramHook
+    """
+
+    # upper bounds of histogram buckets in seconds
+    bounds: List[float]
+    endpoints: List[EndpointStats] = []
+
+    @property
+    def count(self) -> int:
+        return sum(endpoint.count for endpoint in self.endpoints)
+
+    @property
+    def total_time(self) -> float:
+        return sum(endpoint.total_time for endpoint in self.endpoints)
+
+    def quantile(self, q: float, method: str = None, url_template: str = None) -> float:
+        """
+        Estimate quantile of request time as upper bound of the histogram bucket,
+        where it falls
+
+        :param q: quantile between 0 and 1, e.g. 0.95
+        :param method: count only requests sent with this method
+        :param url_template: count only requests sent to this endpoint
+        :return: time in seconds; max time of requests, if it falls into the last bucket
+        """
+        endpoints = [
+            endpoint
+            for endpoint in self.endpoints
+            if (method is None or endpoint.method == method)
+            and (url_template is None or endpoint.url_template == url_template)
+        ]
+        histogram = [sum(counts) for counts in zip(*(e.histogram for e in endpoints))]
+        total = sum(histogram)
+        if not total:
+            return 0.0
+        cumulative = 0
+        for bucket, count in enumerate(histogram):
+            cumulative += count
+            if cumulative >= q * total:
+                break
+        if bucket < len(self.bounds):
+            return self.bounds[bucket]
+        return max(endpoint.max_time for endpoint in endpoints)
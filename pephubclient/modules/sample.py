@@ -1,8 +1,18 @@
 import logging
+from typing import Iterable, List, Tuple, Union
 
-from pephubclient.helpers import RequestManager
-from pephubclient.constants import PEPHUB_SAMPLE_URL, ResponseStatusCodes
+import pandas as pd
+import requests
+
+from pephubclient.helpers import RequestManager, run_sample_operations
+from pephubclient.constants import (
+    DEFAULT_SAMPLE_JOBS,
+    ResponseStatusCodes,
+)
 from pephubclient.exceptions import ResponseError
+from pephubclient.instrumentation import RequestHook
+from pephubclient.models import RetryPolicy, SampleBatchReport, TokenExpiryPolicy
+from pephubclient.urls import build_sample_request_url
 
 _LOGGER = logging.getLogger("pephubclient")
 
@@ -14,11 +24,27 @@ class PEPHubSample(RequestManager):
     This class is not related to peppy.Sample class.
     """
 
-    def __init__(self, jwt_data: str = None):
+    def __init__(
+        self,
+        jwt_data: str = None,
+        session: requests.Session = None,
+        retry_policy: RetryPolicy = None,
+        hooks: List[RequestHook] = None,
+        token_policy: TokenExpiryPolicy = None,
+    ):
         """
         :param jwt_data: jwt token for authorization
+        :param session: requests session shared with other PEPhub clients
+        :param retry_policy: policy of retrying failed requests
+        :param hooks: request hooks shared with other PEPhub clients
+        :param token_policy: check of JWT expiration before batch operations
         """
-
+        super().__init__(
+            session=session,
+            retry_policy=retry_policy,
+            hooks=hooks,
+            token_policy=token_policy,
+        )
         self.__jwt_data = jwt_data
 
     def get(
@@ -37,7 +63,7 @@ class PEPHubSample(RequestManager):
         :param sample_name: sample name
         :return: Sample object
         """
-        url = self._build_sample_request_url(
+        url = build_sample_request_url(
             namespace=namespace, name=name, sample_name=sample_name
         )
 
@@ -79,7 +105,7 @@ class PEPHubSample(RequestManager):
         :param overwrite: overwrite sample if it exists
         :return: None
         """
-        url = self._build_sample_request_url(
+        url = build_sample_request_url(
             namespace=namespace,
             name=name,
             sample_name=sample_name,
@@ -134,7 +160,7 @@ class PEPHubSample(RequestManager):
         :return: None
         """
 
-        url = self._build_sample_request_url(
+        url = build_sample_request_url(
             namespace=namespace, name=name, sample_name=sample_name
         )
 
@@ -170,7 +196,7 @@ class PEPHubSample(RequestManager):
         :param sample_name: sample name
         :return: None
         """
-        url = self._build_sample_request_url(
+        url = build_sample_request_url(
             namespace=namespace, name=name, sample_name=sample_name
         )
 
@@ -195,14 +221,137 @@ class PEPHubSample(RequestManager):
                 f"Unexpected return value. Error: {response.status_code}"
             )
 
-    @staticmethod
-    def _build_sample_request_url(namespace: str, name: str, sample_name: str) -> str:
+    def get_many(
+        self,
+        namespace: str,
+        name: str,
+        tag: str,
+        sample_names: Iterable[str],
+        jobs: int = DEFAULT_SAMPLE_JOBS,
+    ) -> SampleBatchReport:
+        """
+        Get many samples from project in PEPhub concurrently.
+
+        :param namespace: namespace of project
+        :param name: name of project
+        :param tag: tag of project
+        :param sample_names: sample names
+        :param jobs: number of requests sent at the same time
+        :return: report with result of each sample. Samples are in report.samples
+        """
+        self.check_jwt_expiration(self.__jwt_data)
+        return run_sample_operations(
+            lambda sample_name: self.get(namespace, name, tag, sample_name),
+            [(sample_name, None) for sample_name in sample_names],
+            jobs=jobs,
+        )
+
+    def create_many(
+        self,
+        namespace: str,
+        name: str,
+        tag: str,
+        samples: Union[Iterable[dict], pd.DataFrame],
+        overwrite: bool = False,
+        sample_name_key: str = "sample_name",
+        jobs: int = DEFAULT_SAMPLE_JOBS,
+    ) -> SampleBatchReport:
+        """
+        Create many samples in project in PEPhub concurrently.
+        With more than one job, samples can be added to the sample table in any order.
+
+        :param namespace: namespace of project
+        :param name: name of project
+        :param tag: tag of project
+        :param samples: sample dicts, or sample table as DataFrame
+        :param overwrite: overwrite samples if they exist
+        :param sample_name_key: sample attribute with sample name
+        :param jobs: number of requests sent at the same time
+        :return: report with result of each sample
         """
-        Build url for sample request.
+        self.check_jwt_expiration(self.__jwt_data)
+        return run_sample_operations(
+            lambda sample_name, sample_dict: self.create(
+                namespace, name, tag, sample_name, sample_dict, overwrite=overwrite
+            ),
+            self._named_samples(samples, sample_name_key),
+            jobs=jobs,
+        )
+
+    def update_many(
+        self,
+        namespace: str,
+        name: str,
+        tag: str,
+        samples: Union[Iterable[dict], pd.DataFrame],
+        sample_name_key: str = "sample_name",
+        jobs: int = DEFAULT_SAMPLE_JOBS,
+    ) -> SampleBatchReport:
+        """
+        Update many samples in project in PEPhub concurrently.
+
+        :param namespace: namespace of project
+        :param name: name of project
+        :param tag: tag of project
+        :param samples: sample dicts, that contain elements to update, or DataFrame
+        :param sample_name_key: sample attribute with sample name
+        :param jobs: number of requests sent at the same time
+        :return: report with result of each sample
+        """
+        self.check_jwt_expiration(self.__jwt_data)
+        return run_sample_operations(
+            lambda sample_name, sample_dict: self.update(
+                namespace, name, tag, sample_name, sample_dict
+            ),
+            self._named_samples(samples, sample_name_key),
+            jobs=jobs,
+        )
+
+    def remove_many(
+        self,
+        namespace: str,
+        name: str,
+        tag: str,
+        sample_names: Iterable[str],
+        jobs: int = DEFAULT_SAMPLE_JOBS,
+    ) -> SampleBatchReport:
+        """
+        Remove many samples from project in PEPhub concurrently.
 
-        :param namespace: namespace where project will be uploaded
-        :return: url string
+        :param namespace: namespace of project
+        :param name: name of project
+        :param tag: tag of project
+        :param sample_names: sample names
+        :param jobs: number of requests sent at the same time
+        :return: report with result of each sample
         """
-        return PEPHUB_SAMPLE_URL.format(
-            namespace=namespace, project=name, sample_name=sample_name
+        self.check_jwt_expiration(self.__jwt_data)
+        return run_sample_operations(
+            lambda sample_name: self.remove(namespace, name, tag, sample_name),
+            [(sample_name, None) for sample_name in sample_names],
+            jobs=jobs,
         )
+
+    @staticmethod
+    def _named_samples(
+        samples: Union[Iterable[dict], pd.DataFrame], sample_name_key: str
+    ) -> List[Tuple[str, dict]]:
+        """
+        Pair samples with their names
+
+        :param samples: sample dicts, or sample table as DataFrame
+        :param sample_name_key: sample attribute with sample name
+        :return: list of (sample name, sample dict)
+        """
+        if isinstance(samples, pd.DataFrame):
+            samples = (
+                samples.astype(object)
+                .where(samples.notna(), None)
+                .to_dict(orient="records")
+            )
+        named_samples = []
+        for sample in samples:
+            if sample.get(sample_name_key) is None:
+                raise ValueError(f"Sample without '{sample_name_key}': {sample}")
+            named_samples.append((str(sample[sample_name_key]), sample))
+        return named_samples
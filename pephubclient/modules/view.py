@@ -1,15 +1,27 @@
-from typing import Union
+from typing import Iterable, List, Optional, Union
 import peppy
 import logging
+import requests
+from peppy.const import SAMPLE_RAW_DICT_KEY
 
-from pephubclient.helpers import RequestManager
+from pephubclient.helpers import RequestManager, run_sample_operations
 from pephubclient.constants import (
-    PEPHUB_VIEW_URL,
-    PEPHUB_VIEW_SAMPLE_URL,
+    ClientMode,
+    DEFAULT_SAMPLE_JOBS,
+    DEFAULT_VIEW_RECREATE_RATIO,
     ResponseStatusCodes,
 )
-from pephubclient.exceptions import ResponseError
-from pephubclient.models import ProjectDict
+from pephubclient.exceptions import LocalDataNotFoundError, ResponseError
+from pephubclient.instrumentation import RequestHook
+from pephubclient.local import LocalProjectSource, warn_stale
+from pephubclient.urls import build_view_request_url
+from pephubclient.models import (
+    ProjectDict,
+    RegistryPath,
+    RetryPolicy,
+    TokenExpiryPolicy,
+    ViewSyncReport,
+)
 
 _LOGGER = logging.getLogger("pephubclient")
 
@@ -23,12 +35,36 @@ class PEPHubView(RequestManager):
     better user experience.
     """
 
-    def __init__(self, jwt_data: str = None):
+    def __init__(
+        self,
+        jwt_data: str = None,
+        session: requests.Session = None,
+        retry_policy: RetryPolicy = None,
+        hooks: List[RequestHook] = None,
+        token_policy: TokenExpiryPolicy = None,
+        mode: ClientMode = ClientMode.ONLINE,
+        local_source: Optional[LocalProjectSource] = None,
+    ):
         """
         :param jwt_data: jwt token for authorization
+        :param session: requests session shared with other PEPhub clients
+        :param retry_policy: policy of retrying failed requests
+        :param hooks: request hooks shared with other PEPhub clients
+        :param token_policy: check of JWT expiration before batch operations
+        :param mode: client mode. In prefer-local and offline modes, get is answered
+            from local_source, if possible
+        :param local_source: local cache, where views are stored by get in
+            prefer-local mode
         """
-
+        super().__init__(
+            session=session,
+            retry_policy=retry_policy,
+            hooks=hooks,
+            token_policy=token_policy,
+        )
         self.__jwt_data = jwt_data
+        self.mode = ClientMode(mode)
+        self.__local_source = local_source
 
     def get(
         self, namespace: str, name: str, tag: str, view_name: str, raw: bool = False
@@ -43,7 +79,49 @@ class PEPHubView(RequestManager):
         :param raw: if True, return raw response
         :return: peppy.Project object or dictionary of the project (view)
         """
-        url = self._build_view_request_url(
+        registry_path = RegistryPath(namespace=namespace, item=name, tag=tag)
+        if self.mode != ClientMode.ONLINE:
+            found = (
+                self.__local_source.get_view(registry_path, view_name)
+                if self.__local_source
+                else None
+            )
+            if found:
+                output, stored_at, source = found
+                warn_stale(
+                    f"View '{view_name}' of project '{namespace}/{name}:{tag}'",
+                    stored_at,
+                    source,
+                )
+                return self._build_view_output(output, raw)
+            if self.mode == ClientMode.OFFLINE:
+                raise LocalDataNotFoundError(
+                    f"View '{view_name}' of project '{namespace}/{name}:{tag}' "
+                    f"is not available in local cache."
+                )
+
+        output = self._fetch_view(namespace, name, tag, view_name)
+        if output is None:
+            raise ResponseError("View does not exist, or you are unauthorized.")
+        # views are stored only for prefer-local mode, in online mode they
+        # would take space of cached projects
+        if self.__local_source and self.mode == ClientMode.PREFER_LOCAL:
+            self.__local_source.set_view(registry_path, view_name, output)
+        return self._build_view_output(output, raw)
+
+    def _fetch_view(
+        self, namespace: str, name: str, tag: str, view_name: str
+    ) -> Optional[dict]:
+        """
+        Request view from PEPhub, regardless of client mode
+
+        :param namespace: namespace of project
+        :param name: name of project
+        :param tag: tag of project
+        :param view_name: name of the view
+        :return: raw view, or None if view does not exist
+        """
+        url = build_view_request_url(
             namespace=namespace, name=name, view_name=view_name
         )
 
@@ -53,18 +131,20 @@ class PEPHubView(RequestManager):
             method="GET", url=url, headers=self.parse_header(self.__jwt_data)
         )
         if response.status_code == ResponseStatusCodes.OK:
-            output = self.decode_response(response, output_json=True)
-            if raw:
-                return output
-            output = ProjectDict(**output).model_dump(by_alias=True)
-            return peppy.Project.from_dict(output)
+            return self.decode_response(response, output_json=True)
         elif response.status_code == ResponseStatusCodes.NOT_EXIST:
-            raise ResponseError("View does not exist, or you are unauthorized.")
+            return None
         else:
             raise ResponseError(
                 f"Internal server error. Unexpected return value. Error: {response.status_code}"
             )
 
+    @staticmethod
+    def _build_view_output(output: dict, raw: bool) -> Union[peppy.Project, dict]:
+        if raw:
+            return output
+        return peppy.Project.from_dict(ProjectDict.to_raw_dict(output))
+
     def create(
         self,
         namespace: str,
@@ -90,7 +170,7 @@ class PEPHubView(RequestManager):
         if not sample_list or not isinstance(sample_list, list):
             raise ValueError("Sample list must be a list of sample names.")
 
-        url = self._build_view_request_url(
+        url = build_view_request_url(
             namespace=namespace, name=name, view_name=view_name
         )
 
@@ -127,7 +207,7 @@ class PEPHubView(RequestManager):
         :param view_name: name of the view
         :return: None
         """
-        url = self._build_view_request_url(
+        url = build_view_request_url(
             namespace=namespace, name=name, view_name=view_name
         )
 
@@ -166,7 +246,7 @@ class PEPHubView(RequestManager):
         :param view_name: name of the view
         :param sample_name: name of the sample
         """
-        url = self._build_view_request_url(
+        url = build_view_request_url(
             namespace=namespace,
             name=name,
             view_name=view_name,
@@ -214,7 +294,7 @@ class PEPHubView(RequestManager):
         :param sample_name: name of the sample
         :return: None
         """
-        url = self._build_view_request_url(
+        url = build_view_request_url(
             namespace=namespace,
             name=name,
             view_name=view_name,
@@ -246,27 +326,89 @@ class PEPHubView(RequestManager):
                 f"Unexpected return value. Error: {response.status_code}"
             )
 
-    @staticmethod
-    def _build_view_request_url(
-        namespace: str, name: str, view_name: str, sample_name: str = None
-    ):
+    def sync(
+        self,
+        namespace: str,
+        name: str,
+        tag: str,
+        view_name: str,
+        desired_samples: Iterable[str],
+        description: str = None,
+        sample_name_key: str = "sample_name",
+        recreate_ratio: float = DEFAULT_VIEW_RECREATE_RATIO,
+        jobs: int = DEFAULT_SAMPLE_JOBS,
+    ) -> ViewSyncReport:
         """
-        Build URL for view request.
+        Make view contain exactly desired samples.
+
+        Current view is fetched once, and only missing samples are added and
+        redundant samples removed, concurrently. If more than `recreate_ratio` of desired
+        samples would have to be changed, view is deleted and created again instead,
+        with two requests. View that doesn't exist is created.
 
         :param namespace: namespace of project
         :param name: name of project
-        :param view_name: name of view
-        :return: URL
+        :param tag: tag of project
+        :param view_name: name of the view
+        :param desired_samples: names of samples, that view should contain
+        :param description: description of the view, used if view is (re)created
+        :param sample_name_key: sample attribute with sample name
+        :param recreate_ratio: view is recreated if number of changes is larger than
+            this fraction of desired samples
+        :param jobs: number of requests sent at the same time
+        :return: report of performed operations. Operations saved are counted against
+            removing all current samples and adding all desired samples one by one.
         """
-        if sample_name:
-            return PEPHUB_VIEW_SAMPLE_URL.format(
-                namespace=namespace,
-                project=name,
-                view_name=view_name,
-                sample_name=sample_name,
+        self.check_jwt_expiration(self.__jwt_data)
+        desired = list(dict.fromkeys(desired_samples))
+        # current view is always requested from PEPhub, as it is modified
+        view = self._fetch_view(namespace, name, tag, view_name)
+        if view is None:
+            if not desired:
+                return ViewSyncReport()
+            self.create(
+                namespace, name, tag, view_name, description, sample_list=desired
             )
-        return PEPHUB_VIEW_URL.format(
-            namespace=namespace,
-            project=name,
-            view_name=view_name,
+            return ViewSyncReport(added=desired, recreated=True, requests_sent=1)
+
+        view_samples = view.get("sample_list", view.get(SAMPLE_RAW_DICT_KEY)) or []
+        current = [sample.get(sample_name_key) for sample in view_samples]
+        desired_set = set(desired)
+        current_set = set(current)
+        to_add = [
+            sample_name for sample_name in desired if sample_name not in current_set
+        ]
+        to_remove = [
+            sample_name for sample_name in current if sample_name not in desired_set
+        ]
+        number_of_changes = len(to_add) + len(to_remove)
+        report = ViewSyncReport(added=to_add, removed=to_remove)
+
+        if desired and number_of_changes > max(2, recreate_ratio * len(desired)):
+            self.delete(namespace, name, tag, view_name)
+            self.create(
+                namespace, name, tag, view_name, description, sample_list=desired
+            )
+            report.recreated = True
+            report.requests_sent = 2
+        else:
+            for sample_names, operation in (
+                (to_remove, self.remove_sample),
+                (to_add, self.add_sample),
+            ):
+                batch_report = run_sample_operations(
+                    lambda sample_name, operation=operation: operation(
+                        namespace, name, tag, view_name, sample_name
+                    ),
+                    [(sample_name, None) for sample_name in sample_names],
+                    jobs=jobs,
+                )
+                report.failed.extend(batch_report.failed)
+            report.requests_sent = number_of_changes
+
+        report.operations_saved = len(current) + len(desired) - report.requests_sent
+        _LOGGER.info(
+            f"View '{view_name}' synchronized: {len(to_add)} sample(s) added, "
+            f"{len(to_remove)} removed, {report.operations_saved} operation(s) saved."
         )
+        return report
@@ -63,7 +63,7 @@ class PEPHubAuth(RequestManager):
         """
         Requests device code from pephub
         """
-        response = PEPHubAuth.send_request(
+        response = self.send_request(
             method="POST",
             url=PEPHUB_DEVICE_INIT_URI,
             params=None,
@@ -76,7 +76,7 @@ class PEPHubAuth(RequestManager):
         Send request with device dode to pephub in order to exchange it on JWT
         :param device_code: device code that was generated by pephub
         """
-        response = PEPHubAuth.send_request(
+        response = self.send_request(
             method="POST",
             url=PEPHUB_DEVICE_TOKEN_URI,
             params=None,
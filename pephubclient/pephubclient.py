@@ -1,47 +1,226 @@
-from typing import NoReturn, Optional, Literal
+import datetime
+import logging
+import os
+import shutil
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    NoReturn,
+    Optional,
+    Literal,
+    Tuple,
+    Union,
+)
+from pathlib import Path
 from typing_extensions import deprecated
 
+import coloredlogs
+import pandas as pd
 import peppy
-from peppy.const import NAME_KEY, CONFIG_KEY
+from peppy.const import (
+    CFG_SAMPLE_TABLE_KEY,
+    CFG_SUBSAMPLE_TABLE_KEY,
+    CONFIG_KEY,
+    NAME_KEY,
+    SAMPLE_RAW_DICT_KEY,
+    SUBSAMPLE_RAW_LIST_KEY,
+)
 import urllib3
 from pydantic import ValidationError
-from ubiquerg import parse_registry_path
 
 from pephubclient.constants import (
-    PEPHUB_PEP_API_BASE_URL,
-    PEPHUB_PUSH_URL,
-    RegistryPath,
+    CLIENT_MODE_ENV,
+    MIRROR_DIRS_ENV,
+    ClientMode,
+    PEPHUB_PEP_ANNOTATION_URL,
     ResponseStatusCodes,
-    PEPHUB_PEP_SEARCH_URL,
     PATH_TO_FILE_WITH_JWT,
+    DEFAULT_POOL_SIZE,
+    DEFAULT_PREFETCH_PAGES,
+    DEFAULT_PULL_JOBS,
+    DEFAULT_TABLE_FORMAT,
+    DEFAULT_ZIP_COMPRESSION,
+    MIRROR_STATE_FILE_NAME,
+    TableFormat,
 )
+from pephubclient.cache import ProjectCache
 from pephubclient.exceptions import (
-    IncorrectQueryStringError,
+    LocalDataNotFoundError,
     ResponseError,
+    SchemaValidationError,
 )
 from pephubclient.files_manager import FilesManager
-from pephubclient.helpers import MessageHandler, RequestManager, save_pep
+from pephubclient.helpers import (
+    MessageHandler,
+    RequestManager,
+    _build_filename,
+    build_sample_tables,
+    compute_sample_diff,
+    create_session,
+    is_registry_path,
+    load_local_project,
+    load_local_tables,
+    save_pep,
+    save_pep_stream,
+    schema_path_converter,
+)
+from pephubclient.instrumentation import HistogramHook, LoggingHook, RequestHook
+from pephubclient.local import LocalProjectSource, warn_stale
 from pephubclient.models import (
     ProjectDict,
     ProjectUploadData,
     SearchReturnModel,
     ProjectAnnotationModel,
+    PullResult,
+    MirroredProject,
+    MirrorReport,
+    MirrorState,
+    RegistryPath,
+    RequestStats,
+    RetryPolicy,
+    SampleBatchReport,
+    TokenExpiryPolicy,
 )
 from pephubclient.pephub_oauth.pephub_oauth import PEPHubAuth
 from pephubclient.modules.view import PEPHubView
 from pephubclient.modules.sample import PEPHubSample
+from pephubclient.schemas.cache import SchemaCache
 from pephubclient.schemas.schema import PEPHubSchema
+from pephubclient.schemas.validation import get_project_validator
+from pephubclient.streaming import (
+    STREAM_CHUNK_SIZE,
+    DroppedIndexColumnsError,
+    ProjectFilter,
+    filter_project,
+    read_project,
+)
+from pephubclient.urls import (
+    build_project_search_url,
+    build_pull_request_url,
+    build_push_request_url,
+    parse_project_registry_path,
+)
 
 urllib3.disable_warnings()
 
+_LOGGER = logging.getLogger("pephubclient")
+coloredlogs.install(
+    logger=_LOGGER,
+    datefmt="%H:%M:%S",
+    fmt="[%(levelname)s] [%(asctime)s] %(message)s",
+)
+
 
 class PEPHubClient(RequestManager):
-    def __init__(self):
+    """
+    Client of PEPhub API.
+
+    One client instance can be shared by many threads (e.g. in a ThreadPoolExecutor):
+    project loading keeps no per-call state on the instance, and all threads share
+    client's connection pool, retry policy and project cache. Identical reads
+    (GET requests) sent by many threads at the same time are sent to PEPhub once.
+    Login and logout replace view, sample and schema clients, so they should
+    not be called while other threads are using the client.
+    """
+
+    def __init__(
+        self,
+        pool_size: int = DEFAULT_POOL_SIZE,
+        cache: Optional[ProjectCache] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        schema_cache: Optional[SchemaCache] = None,
+        mode: Optional[str] = None,
+        mirror_dirs: Optional[List[str]] = None,
+        request_hooks: Optional[List[RequestHook]] = None,
+        token_policy: Optional[TokenExpiryPolicy] = None,
+    ):
+        """
+        :param pool_size: number of keep-alive connections held by the client.
+            Connection pool is shared by view, sample and schema clients.
+        :param cache: local project cache. If provided, raw projects are served from
+            the cache when their digest in PEPhub didn't change.
+        :param retry_policy: policy of retrying failed requests, shared by view, sample
+            and schema clients. Default: RetryPolicy()
+        :param schema_cache: cache of schemas used for validation before upload.
+            Default: SchemaCache()
+        :param mode: "online" (default), "prefer-local" or "offline". In prefer-local mode,
+            load_raw_pep, load_project, view.get and schema.get are answered from the
+            project cache, mirrors or schema cache without requesting PEPhub, if data is
+            available there; in offline mode PEPhub is never requested, and
+            LocalDataNotFoundError is raised if data is not available locally.
+            Age of served data is reported with StaleDataWarning.
+            Default: value of PEPHUB_CLIENT_MODE environment variable, or "online"
+        :param mirror_dirs: directories of namespace mirrors (see mirror), where projects
+            are looked up in prefer-local and offline modes.
+            Default: PEPHUB_MIRROR_DIRS environment variable (paths separated by os.pathsep)
+        :param request_hooks: additional request hooks (see RequestHook), called before
+            and after every request sent by the client and its view, sample and schema clients.
+            Requests are always recorded by in-memory histogram (see stats) and logged
+            at debug level
+        :param token_policy: check of JWT expiration at the start of pull_many, mirror,
+            sample batch operations and view sync: warn (or raise JWTExpiredError) if
+            the token expires within margin. Default: TokenExpiryPolicy()
+        """
+        self.__request_stats = HistogramHook()
+        super().__init__(
+            session=create_session(pool_size),
+            retry_policy=retry_policy,
+            hooks=[self.__request_stats, LoggingHook(), *(request_hooks or [])],
+            token_policy=token_policy,
+        )
+        self.__cache = cache
+        self.__schema_cache = schema_cache or SchemaCache()
+        self.mode = ClientMode(mode or os.getenv(CLIENT_MODE_ENV) or ClientMode.ONLINE)
+        if mirror_dirs is None:
+            mirror_dirs = [
+                mirror_dir
+                for mirror_dir in os.getenv(MIRROR_DIRS_ENV, "").split(os.pathsep)
+                if mirror_dir
+            ]
+        self.__local_source = LocalProjectSource(cache, mirror_dirs)
         self.__jwt_data = FilesManager.load_jwt_data_from_file(PATH_TO_FILE_WITH_JWT)
+        self._init_modules()
 
-        self.__view = PEPHubView(self.__jwt_data)
-        self.__sample = PEPHubSample(self.__jwt_data)
-        self.__schema = PEPHubSchema(self.__jwt_data)
+    def _init_modules(self) -> None:
+        """
+        Create view, sample and schema clients with current jwt token
+        """
+        self.__view = PEPHubView(
+            self.__jwt_data,
+            session=self.session,
+            retry_policy=self.retry_policy,
+            hooks=self.hooks,
+            mode=self.mode,
+            local_source=self.__local_source,
+            token_policy=self.token_policy,
+        )
+        self.__sample = PEPHubSample(
+            self.__jwt_data,
+            session=self.session,
+            retry_policy=self.retry_policy,
+            hooks=self.hooks,
+            token_policy=self.token_policy,
+        )
+        self.__schema = PEPHubSchema(
+            self.__jwt_data,
+            session=self.session,
+            retry_policy=self.retry_policy,
+            hooks=self.hooks,
+            cache=self.__schema_cache,
+            mode=self.mode,
+        )
+
+    def __enter__(self) -> "PEPHubClient":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
 
     @property
     def view(self) -> PEPHubView:
@@ -55,14 +234,46 @@ class PEPHubClient(RequestManager):
     def schema(self) -> PEPHubSchema:
         return self.__schema
 
+    def stats(self) -> RequestStats:
+        """
+        Get statistics of requests sent by the client and its view, sample and schema
+        clients: number of requests, errors, retries, transferred bytes and histogram
+        of request times per endpoint
+
+        :return: copy of current statistics
+        """
+        return self.__request_stats.stats()
+
+    def check_token(self, duration: Optional[float] = None) -> Optional[float]:
+        """
+        Check that the token stays valid until a long job finishes, before starting it.
+        If it doesn't, warning is logged, or JWTExpiredError is raised if token policy blocks.
+        Expired token always raises JWTExpiredError.
+
+        :param duration: expected duration of the job in seconds.
+            Default: margin of token policy
+        :return: number of seconds until the token expires, or None if
+            user is not logged in, or expiration of the token is not known
+        """
+        return self.check_jwt_expiration(self.__jwt_data, duration=duration)
+
+    def close(self) -> None:
+        """
+        Close all keep-alive connections held by the client
+        """
+        self.session.close()
+
     def login(self) -> NoReturn:
         """
         Log in to PEPhub
         """
-        user_token = PEPHubAuth().login_to_pephub()
+        user_token = PEPHubAuth(
+            session=self.session, retry_policy=self.retry_policy, hooks=self.hooks
+        ).login_to_pephub()
 
         FilesManager.save_jwt_data_to_file(PATH_TO_FILE_WITH_JWT, user_token)
         self.__jwt_data = FilesManager.load_jwt_data_from_file(PATH_TO_FILE_WITH_JWT)
+        self._init_modules()
 
     def logout(self) -> NoReturn:
         """
@@ -70,6 +281,7 @@ class PEPHubClient(RequestManager):
         """
         FilesManager.delete_file_if_exists(PATH_TO_FILE_WITH_JWT)
         self.__jwt_data = None
+        self._init_modules()
 
     def pull(
         self,
@@ -77,6 +289,10 @@ class PEPHubClient(RequestManager):
         force: Optional[bool] = False,
         zip: Optional[bool] = False,
         output: Optional[str] = None,
+        stream: Optional[bool] = False,
+        compression: str = DEFAULT_ZIP_COMPRESSION,
+        compression_level: Optional[int] = None,
+        format: str = DEFAULT_TABLE_FORMAT,
     ) -> None:
         """
         Download project locally
@@ -85,8 +301,29 @@ class PEPHubClient(RequestManager):
         :param bool force: if project exists, overwrite it.
         :param bool zip: if True, save project as zip file
         :param str output: path where project will be saved
+        :param bool stream: if True, parse response incrementally and write sample tables
+            row by row, without loading whole project into memory. Project cache is not used.
+        :param str compression: compression method of zip file: "store" (fastest),
+            "deflate", "bzip2" or "lzma"
+        :param int compression_level: compression level of zip file. By default,
+            default level of the compression method is used
+        :param str format: format of sample and subsample tables: "csv", or typed
+            columnar "parquet" or "feather" (require pyarrow). Streaming pull writes csv only.
         :return: None
         """
+        if stream:
+            if format != TableFormat.CSV.value:
+                raise ValueError("Streaming pull can save tables only in csv format.")
+            self._pull_stream(
+                project_registry_path,
+                force=force,
+                zip=zip,
+                output=output,
+                compression=compression,
+                compression_level=compression_level,
+            )
+            return None
+
         project_dict = self.load_raw_pep(
             registry_path=project_registry_path,
         )
@@ -97,24 +334,336 @@ class PEPHubClient(RequestManager):
             force=force,
             project_path=output,
             zip=zip,
+            compression=compression,
+            compression_level=compression_level,
+            format=format,
+        )
+
+    def pull_many(
+        self,
+        project_registry_paths: Iterable[str],
+        jobs: int = DEFAULT_PULL_JOBS,
+        force: Optional[bool] = False,
+        zip: Optional[bool] = False,
+        output: Optional[str] = None,
+        progress: Optional[Callable[[PullResult], None]] = None,
+        stream: Optional[bool] = False,
+        compression: str = DEFAULT_ZIP_COMPRESSION,
+        compression_level: Optional[int] = None,
+        format: str = DEFAULT_TABLE_FORMAT,
+    ) -> List[PullResult]:
+        """
+        Download many projects concurrently.
+
+        Projects are downloaded and saved by a pool of `jobs` threads sharing client's
+        connection pool. Keep `jobs` below client `pool_size` to reuse connections.
+        Failure of one project doesn't stop the others.
+
+        :param project_registry_paths: Project registry paths in PEPhub (e.g. databio/base:default)
+        :param jobs: number of projects downloaded at the same time
+        :param force: if project exists, overwrite it.
+        :param zip: if True, save projects as zip files
+        :param output: path where projects will be saved
+        :param progress: function called with PullResult of each project as soon as it is finished
+        :param stream: if True, projects are streamed to disk (see pull)
+        :param compression: compression method of zip files (see pull)
+        :param compression_level: compression level of zip files (see pull)
+        :param format: format of sample and subsample tables (see pull)
+        :return: list of PullResult, one per unique registry path, in input order
+        """
+        if jobs < 1:
+            raise ValueError("Number of jobs must be a positive integer.")
+        self.check_jwt_expiration(self.__jwt_data)
+
+        # the same project pulled twice would write the same files at the same time
+        registry_paths = list(dict.fromkeys(project_registry_paths))
+
+        def pull_one(registry_path: str) -> PullResult:
+            try:
+                self.pull(
+                    registry_path,
+                    force=force,
+                    zip=zip,
+                    output=output,
+                    stream=stream,
+                    compression=compression,
+                    compression_level=compression_level,
+                    format=format,
+                )
+            except Exception as err:
+                return PullResult(
+                    registry_path=registry_path, success=False, error=str(err)
+                )
+            return PullResult(registry_path=registry_path, success=True)
+
+        results = {}
+        with ThreadPoolExecutor(max_workers=jobs) as executor:
+            futures = [executor.submit(pull_one, path) for path in registry_paths]
+            for future in as_completed(futures):
+                result = future.result()
+                results[result.registry_path] = result
+                if progress:
+                    progress(result)
+
+        return [results[path] for path in registry_paths]
+
+    def mirror(
+        self,
+        namespace: str,
+        output: str,
+        jobs: int = DEFAULT_PULL_JOBS,
+        delete: bool = False,
+        format: str = DEFAULT_TABLE_FORMAT,
+        progress: Optional[Callable[[PullResult], None]] = None,
+    ) -> MirrorReport:
+        """
+        Keep local copy of all projects of namespace up to date.
+
+        Projects of namespace are listed (annotations only), and only projects that are
+        new, or whose digest changed since the last sync, are pulled concurrently.
+        State of the mirror (last sync time and digest of each project) is saved in
+        `output/.phc-mirror.json`. Projects that failed to download are retried next time.
+
+        :param namespace: namespace to mirror
+        :param output: mirror directory. Every project is saved in its own folder
+        :param jobs: number of projects downloaded at the same time
+        :param delete: if True, delete local copies of projects that disappeared from
+            the namespace. Otherwise they are kept and flagged as removed in the state file
+        :param format: format of sample and subsample tables (see pull)
+        :param progress: function called with PullResult of each pulled project
+        :return: report of added, updated, removed and failed projects
+        """
+        Path(output).mkdir(parents=True, exist_ok=True)
+        state_path = os.path.join(output, MIRROR_STATE_FILE_NAME)
+        state = self._read_mirror_state(state_path, namespace)
+        sync_started = datetime.datetime.now(datetime.timezone.utc)
+
+        report = MirrorReport(namespace=namespace)
+        to_pull = {}
+        current_keys = set()
+        for annotation in self.iter_projects(namespace):
+            key = f"{annotation.name}:{annotation.tag}"
+            current_keys.add(key)
+            mirrored = state.projects.get(key)
+            if (
+                mirrored
+                and not mirrored.removed
+                and mirrored.digest == annotation.digest
+                and os.path.isdir(self._mirrored_project_path(output, mirrored))
+            ):
+                report.unchanged += 1
+                continue
+            to_pull[f"{namespace}/{key}"] = (key, annotation, mirrored)
+
+        downloaded_at = {}
+
+        def record_download(result: PullResult) -> None:
+            downloaded_at[result.registry_path] = datetime.datetime.now(
+                datetime.timezone.utc
+            )
+            if progress:
+                progress(result)
+
+        results = self.pull_many(
+            to_pull,
+            jobs=jobs,
+            force=True,
+            output=output,
+            progress=record_download,
+            format=format,
         )
+        for result in results:
+            key, annotation, mirrored = to_pull[result.registry_path]
+            if not result.success:
+                report.failed.append(result)
+                continue
+            state.projects[key] = MirroredProject(
+                digest=annotation.digest,
+                last_update_date=annotation.last_update_date,
+                path=_build_filename(
+                    RegistryPath(
+                        namespace=namespace,
+                        item=annotation.name,
+                        tag=annotation.tag,
+                    )
+                ),
+                downloaded_at=downloaded_at[result.registry_path],
+            )
+            if mirrored and not mirrored.removed:
+                report.updated.append(result.registry_path)
+            else:
+                report.added.append(result.registry_path)
+
+        for key in sorted(set(state.projects) - current_keys):
+            mirrored = state.projects[key]
+            if delete:
+                shutil.rmtree(
+                    self._mirrored_project_path(output, mirrored), ignore_errors=True
+                )
+                del state.projects[key]
+            elif mirrored.removed:
+                continue
+            else:
+                mirrored.removed = True
+            report.removed.append(f"{namespace}/{key}")
+
+        state.last_sync = sync_started
+        self._write_mirror_state(state_path, state)
+        return report
+
+    @staticmethod
+    def _mirrored_project_path(output: str, mirrored: MirroredProject) -> str:
+        """
+        Get folder of mirrored project. Older state files hold paths joined with
+        mirror directory as it was given then, so only the folder name is used.
+
+        :param output: mirror directory
+        :param mirrored: state of the project
+        :return: path of the project folder
+        """
+        return os.path.join(output, os.path.basename(mirrored.path))
+
+    @staticmethod
+    def _read_mirror_state(state_path: str, namespace: str) -> MirrorState:
+        """
+        Read state of the mirror, or create empty one for a new mirror
+
+        :param state_path: path to the state file
+        :param namespace: mirrored namespace
+        :return: mirror state
+        """
+        try:
+            with open(state_path, "r") as f:
+                state = MirrorState.model_validate_json(f.read())
+        except FileNotFoundError:
+            return MirrorState(namespace=namespace)
+        except ValidationError:
+            _LOGGER.warning(
+                f"Mirror state file is corrupted, all projects will be pulled again: {state_path}"
+            )
+            return MirrorState(namespace=namespace)
+        if state.namespace != namespace:
+            raise ValueError(
+                f"Directory is a mirror of namespace '{state.namespace}', not '{namespace}'."
+            )
+        return state
+
+    @staticmethod
+    def _write_mirror_state(state_path: str, state: MirrorState) -> None:
+        with open(state_path + ".tmp", "w") as f:
+            f.write(state.model_dump_json(indent=2))
+        os.replace(state_path + ".tmp", state_path)
 
     def load_project(
         self,
         project_registry_path: str,
         query_param: Optional[dict] = None,
+        columns: Optional[Iterable[str]] = None,
+        where: Optional[Union[Dict[str, Any], Callable[[dict], bool]]] = None,
     ) -> peppy.Project:
         """
         Load peppy project from PEPhub in peppy.Project object
 
-        :param project_registry_path: registry path of the project
+        :param project_registry_path: registry path of the project, or path to local
+            directory with project saved by pull (with tables in csv, parquet or feather
+            format). Relative path that is also a registry path has to start with './'
         :param query_param: query parameters used in get request
+        :param columns: sample and subsample table columns to keep (see load_raw_pep)
+        :param where: condition of samples to keep (see load_raw_pep)
         :return Project: peppy project.
         """
-        raw_pep = self.load_raw_pep(project_registry_path, query_param)
+        if self._is_local_project_path(project_registry_path):
+            project = load_local_project(project_registry_path)
+            if columns is None and where is None:
+                return project
+            return peppy.Project().from_dict(
+                filter_project(
+                    project.to_dict(extended=True, orient="records"),
+                    ProjectFilter(columns, where),
+                )
+            )
+        raw_pep = self.load_raw_pep(
+            project_registry_path, query_param, columns=columns, where=where
+        )
         peppy_project = peppy.Project().from_dict(raw_pep)
         return peppy_project
 
+    @staticmethod
+    def _is_local_project_path(path: str) -> bool:
+        """
+        Check if project should be loaded from local directory, instead of PEPhub.
+        Directory named like registry path (e.g. databio/example) is used only if
+        path is absolute, or starts with './' or '../'
+
+        :param path: registry path of the project, or path to local directory
+        :return: True if path is a path to local directory
+        """
+        path = os.fspath(path)
+        if not os.path.isdir(path):
+            return False
+        explicit = os.path.isabs(path) or path.startswith(
+            ("./", "../", "." + os.sep, ".." + os.sep)
+        )
+        return explicit or not is_registry_path(path)
+
+    def load_sample_table(
+        self,
+        project_registry_path: str,
+        subsamples: bool = True,
+        categorical: Union[bool, Iterable[str]] = False,
+        columns: Optional[Iterable[str]] = None,
+        where: Optional[Union[Dict[str, Any], Callable[[dict], bool]]] = None,
+        query_param: Optional[dict] = None,
+    ) -> Union[pd.DataFrame, Tuple[pd.DataFrame, List[pd.DataFrame]]]:
+        """
+        Load sample table of the project as pandas DataFrame, without creating peppy
+        project. Table is built directly from raw samples, so sample modifiers are not
+        applied and attributes are not derived. Samples are indexed by sample name.
+
+        :param project_registry_path: registry path of the project, or path to local
+            directory with project saved by pull. Relative path that is also a registry
+            path has to start with './'
+        :param subsamples: if True, subsample tables are returned too
+        :param categorical: columns converted to categorical dtype. If True, text columns
+            with few unique values (at most half of the rows)
+        :param columns: sample and subsample table columns to keep (see load_raw_pep)
+        :param where: condition of samples to keep (see load_raw_pep)
+        :param query_param: query parameters used in get request
+        :return: sample table, or sample table and list of subsample tables if subsamples is True
+        """
+        if self._is_local_project_path(project_registry_path):
+            config, sample_table, subsample_tables = load_local_tables(
+                project_registry_path
+            )
+            if columns is None and where is None:
+                raw_project = {
+                    CONFIG_KEY: config,
+                    SAMPLE_RAW_DICT_KEY: sample_table,
+                    SUBSAMPLE_RAW_LIST_KEY: subsample_tables,
+                }
+            else:
+                raw_project = filter_project(
+                    {
+                        CONFIG_KEY: config,
+                        SAMPLE_RAW_DICT_KEY: sample_table.to_dict(orient="records"),
+                        SUBSAMPLE_RAW_LIST_KEY: [
+                            table.to_dict(orient="records")
+                            for table in subsample_tables
+                        ],
+                    },
+                    ProjectFilter(columns, where),
+                )
+        else:
+            raw_project = self.load_raw_pep(
+                project_registry_path, query_param, columns=columns, where=where
+            )
+        sample_table, subsample_tables = build_sample_tables(
+            raw_project, subsamples=subsamples, categorical=categorical
+        )
+        if subsamples:
+            return sample_table, subsample_tables
+        return sample_table
+
     def push(
         self,
         cfg: str,
@@ -123,6 +672,8 @@ class PEPHubClient(RequestManager):
         tag: Optional[str] = None,
         is_private: Optional[bool] = False,
         force: Optional[bool] = False,
+        incremental: Optional[bool] = False,
+        validate_against: Optional[str] = None,
     ) -> None:
         """
         Push (upload/update) project to Pephub using config/csv path
@@ -134,6 +685,9 @@ class PEPHubClient(RequestManager):
         :param str tag: project tag
         :param bool is_private: Specifies whether project should be private [Default= False]
         :param bool force: Force push to the database. Use it to update, or upload project. [Default= False]
+        :param bool incremental: Send only changed samples of existing project (see upload) [Default= False]
+        :param str validate_against: registry path of schema (namespace/name:version), that
+            project is validated against before upload
         :return: None
         """
         peppy_project = peppy.Project(cfg=cfg)
@@ -144,6 +698,8 @@ class PEPHubClient(RequestManager):
             tag=tag,
             is_private=is_private,
             force=force,
+            incremental=incremental,
+            validate_against=validate_against,
         )
 
     def upload(
@@ -154,6 +710,8 @@ class PEPHubClient(RequestManager):
         tag: str = None,
         is_private: bool = False,
         force: bool = True,
+        incremental: bool = False,
+        validate_against: str = None,
     ) -> None:
         """
         Upload peppy project to the PEPhub.
@@ -165,6 +723,13 @@ class PEPHubClient(RequestManager):
         :param force: Force push to the database. Use it to update, or upload project.
         :param is_private: Make project private
         :param force: overwrite project if it exists
+        :param incremental: if project exists in PEPhub, compare it with the local one
+            and only add, update and remove changed samples. Whole project is uploaded
+            (and overwritten) if config or subsamples changed, or if it is cheaper than
+            sending the changes. Privacy of existing project is not changed.
+        :param validate_against: registry path of schema (namespace/name:version).
+            If provided, project is validated locally and SchemaValidationError is
+            raised, before anything is sent to PEPhub
         :return: None
         """
         pep_dict = project.to_dict(
@@ -174,6 +739,21 @@ class PEPHubClient(RequestManager):
         if name:
             pep_dict[CONFIG_KEY][NAME_KEY] = name
 
+        if validate_against:
+            self._validate_project(
+                pep_dict, validate_against, sample_name_key=project.sample_table_index
+            )
+
+        if incremental:
+            if self._upload_incremental(
+                pep_dict,
+                namespace=namespace,
+                tag=tag or "default",
+                sample_name_key=project.sample_table_index,
+            ):
+                return None
+            force = True
+
         upload_data = ProjectUploadData(
             pep_dict=pep_dict,
             tag=tag,
@@ -182,7 +762,7 @@ class PEPHubClient(RequestManager):
         )
         pephub_response = self.send_request(
             method="POST",
-            url=self._build_push_request_url(namespace=namespace),
+            url=build_push_request_url(namespace=namespace),
             headers=self.parse_header(self.__jwt_data),
             json=upload_data.model_dump(),
             cookies=None,
@@ -216,6 +796,139 @@ class PEPHubClient(RequestManager):
             )
         return None
 
+    def _validate_project(
+        self, pep_dict: dict, schema_registry_path: str, sample_name_key: str
+    ) -> None:
+        """
+        Validate raw project against schema from PEPhub
+
+        :param pep_dict: raw project
+        :param schema_registry_path: registry path of schema (namespace/name:version)
+        :param sample_name_key: sample attribute with sample name
+        :raise SchemaValidationError: if project is not valid
+        :return: None
+        """
+        namespace, schema_name, version = schema_path_converter(schema_registry_path)
+        schema = self.schema.get_cached(namespace, schema_name, version)
+        errors = get_project_validator(schema).validate(
+            pep_dict, sample_name_key=sample_name_key
+        )
+        if errors:
+            raise SchemaValidationError(schema_registry_path, errors)
+
+    def _upload_incremental(
+        self, pep_dict: dict, namespace: str, tag: str, sample_name_key: str
+    ) -> bool:
+        """
+        Update existing project in PEPhub by sending only changed samples
+
+        :param pep_dict: local raw project
+        :param namespace: namespace of the project
+        :param tag: tag of the project
+        :param sample_name_key: sample attribute with sample name
+        :return: True if project was updated, False if whole project has to be uploaded
+        """
+        name = pep_dict[CONFIG_KEY].get(NAME_KEY)
+        registry_path = f"{namespace}/{name}:{tag}"
+        try:
+            # remote copy is modified, so it is always requested from PEPhub
+            remote_project = self._request_raw_pep(
+                parse_project_registry_path(registry_path)
+            )
+        except ResponseError:
+            remote_project = None
+        if not remote_project:
+            _LOGGER.info(
+                f"Project '{registry_path}' not found, uploading whole project"
+            )
+            return False
+
+        if self._compared_config(pep_dict[CONFIG_KEY]) != self._compared_config(
+            remote_project[CONFIG_KEY]
+        ) or (pep_dict.get(SUBSAMPLE_RAW_LIST_KEY) or []) != (
+            remote_project.get(SUBSAMPLE_RAW_LIST_KEY) or []
+        ):
+            _LOGGER.info("Config or subsamples changed, uploading whole project")
+            return False
+
+        local_samples = pep_dict[SAMPLE_RAW_DICT_KEY]
+        diff = compute_sample_diff(
+            local_samples, remote_project[SAMPLE_RAW_DICT_KEY], sample_name_key
+        )
+        if diff is None or (
+            diff.number_of_operations
+            and diff.number_of_operations >= len(local_samples)
+        ):
+            _LOGGER.info("Sample table changed too much, uploading whole project")
+            return False
+
+        local_by_name = {sample[sample_name_key]: sample for sample in local_samples}
+        # samples are removed first, new samples are added one by one
+        # at the end of the table, to keep order of the local sample table
+        self._raise_for_failed_samples(
+            self.sample.remove_many(namespace, name, tag, diff.removed), registry_path
+        )
+        self._raise_for_failed_samples(
+            self.sample.update_many(
+                namespace,
+                name,
+                tag,
+                [local_by_name[sample_name] for sample_name in diff.updated],
+                sample_name_key=sample_name_key,
+            ),
+            registry_path,
+        )
+        self._raise_for_failed_samples(
+            self.sample.create_many(
+                namespace,
+                name,
+                tag,
+                [local_by_name[sample_name] for sample_name in diff.added],
+                sample_name_key=sample_name_key,
+                jobs=1,
+            ),
+            registry_path,
+        )
+
+        MessageHandler.print_success(
+            f"Project '{registry_path}' was updated: {len(diff.added)} sample(s) added, "
+            f"{len(diff.updated)} updated, {len(diff.removed)} removed"
+        )
+        return True
+
+    @staticmethod
+    def _raise_for_failed_samples(
+        report: SampleBatchReport, registry_path: str
+    ) -> None:
+        """
+        Raise error if any sample operation of incremental update failed
+
+        :param report: report of batch sample operation
+        :param registry_path: registry path of updated project
+        """
+        if report.failed:
+            errors = "; ".join(
+                f"{result.sample_name}: {result.error}" for result in report.failed[:5]
+            )
+            raise ResponseError(
+                f"Incremental update of '{registry_path}' failed for "
+                f"{len(report.failed)} sample(s). {errors}"
+            )
+
+    @staticmethod
+    def _compared_config(config: dict) -> dict:
+        """
+        Project config without keys, that don't change project content (name and table file names)
+
+        :param config: project config
+        :return: config used to compare projects
+        """
+        return {
+            key: value
+            for key, value in config.items()
+            if key not in (NAME_KEY, CFG_SAMPLE_TABLE_KEY, CFG_SUBSAMPLE_TABLE_KEY)
+        }
+
     def find_project(
         self,
         namespace: str,
@@ -253,7 +966,7 @@ class PEPHubClient(RequestManager):
             if end_date:
                 query_param["filter_end_date"] = end_date
 
-        url = self._build_project_search_url(
+        url = build_project_search_url(
             namespace=namespace,
             query_param=query_param,
         )
@@ -272,6 +985,76 @@ class PEPHubClient(RequestManager):
                 project_list.append(ProjectAnnotationModel(**project_found))
             return SearchReturnModel(**decoded_response)
 
+    def iter_projects(
+        self,
+        namespace: str,
+        query_string: str = "",
+        tag: str = None,
+        page_size: int = 100,
+        filter_by: Literal["submission_date", "last_update_date"] = None,
+        start_date: str = None,
+        end_date: str = None,
+        prefetch: int = DEFAULT_PREFETCH_PAGES,
+    ) -> Iterator[ProjectAnnotationModel]:
+        """
+        Iterate over annotations of all projects found in namespace, page by page.
+
+        Number of projects is taken from the first page, after that following pages
+        are requested in background, at most `prefetch` pages ahead of the consumer.
+
+        :param namespace: Namespace where to search for projects
+        :param query_string: Search query
+        :param tag: Project tag
+        :param page_size: Number of projects requested in one page
+        :param filter_by: Use filter date. Option: [submission_date, last_update_date]
+        :param start_date: filter beginning date
+        :param end_date: filter end date (if none today's date is used)
+        :param prefetch: maximum number of pages requested at the same time
+        :return: iterator over project annotations, in search order
+        """
+        if page_size < 1:
+            raise ValueError("Page size must be a positive integer.")
+        if prefetch < 1:
+            raise ValueError("Number of prefetched pages must be a positive integer.")
+
+        def get_page(offset: int) -> SearchReturnModel:
+            page = self.find_project(
+                namespace=namespace,
+                query_string=query_string,
+                tag=tag,
+                limit=page_size,
+                offset=offset,
+                filter_by=filter_by,
+                start_date=start_date,
+                end_date=end_date,
+            )
+            if page is None:
+                raise ResponseError(
+                    f"Unable to get projects from namespace '{namespace}' (offset: {offset})"
+                )
+            return page
+
+        first_page = get_page(0)
+        offsets = iter(range(page_size, first_page.count, page_size))
+
+        with ThreadPoolExecutor(max_workers=prefetch) as executor:
+            pending = deque(
+                executor.submit(get_page, offset)
+                for _, offset in zip(range(prefetch), offsets)
+            )
+            try:
+                yield from first_page.results
+                while pending:
+                    page = pending.popleft().result()
+                    next_offset = next(offsets, None)
+                    if next_offset is not None:
+                        pending.append(executor.submit(get_page, next_offset))
+                    yield from page.results
+            finally:
+                # consumer stopped early, or request failed
+                for future in pending:
+                    future.cancel()
+
     @deprecated("This method is deprecated. Use load_raw_pep instead.")
     def _load_raw_pep(
         self,
@@ -294,87 +1077,208 @@ class PEPHubClient(RequestManager):
         self,
         registry_path: str,
         query_param: Optional[dict] = None,
+        columns: Optional[Iterable[str]] = None,
+        where: Optional[Union[Dict[str, Any], Callable[[dict], bool]]] = None,
     ) -> dict:
         """
         Request PEPhub and return the requested project as peppy.Project object.
 
+        With columns or where, samples are filtered while the response is streamed, so
+        that dropped columns and samples are never held in memory. Index columns
+        (sample_name by default) are always kept. Filtered projects are not stored
+        in the project cache, but are served from it.
+
         :param registry_path: Project namespace, eg. "geo/GSE124224:tag"
         :param query_param: Optional variables to be passed to PEPhub
+        :param columns: sample and subsample table columns to keep. Default: all columns
+        :param where: condition of samples to keep: dict of column -> value (or list of
+            allowed values), or function called with each raw sample dict.
+            Default: all samples
         :return: Raw project in dict.
+        :raise LocalDataNotFoundError: in offline mode, if project is not available locally
         """
-        query_param = query_param or {}
-        query_param["raw"] = "true"
-
-        self._set_registry_data(registry_path)
-        pephub_response = self.send_request(
-            method="GET",
-            url=self._build_pull_request_url(query_param=query_param),
-            headers=self.parse_header(self.__jwt_data),
-            cookies=None,
+        project_filter = (
+            None if columns is None and where is None else ProjectFilter(columns, where)
         )
-        if pephub_response.status_code == ResponseStatusCodes.OK:
-            decoded_response = self.decode_response(pephub_response, output_json=True)
-            correct_proj_dict = ProjectDict(**decoded_response)
+        parsed_path = parse_project_registry_path(registry_path)
 
-            # This step is necessary because of this issue: https://github.com/pepkit/pephub/issues/124
-            return correct_proj_dict.model_dump(by_alias=True)
-
-        if pephub_response.status_code == ResponseStatusCodes.NOT_EXIST:
-            raise ResponseError("File does not exist, or you are unauthorized.")
-        if pephub_response.status_code == ResponseStatusCodes.INTERNAL_ERROR:
-            raise ResponseError(
-                f"Internal server error. Unexpected return value. Error: {pephub_response.status_code}"
+        if self.mode != ClientMode.ONLINE:
+            cache_key = ProjectCache.build_key(parsed_path)
+            # projects filtered by query parameters are never stored locally
+            found = (
+                None if query_param else self.__local_source.get_project(parsed_path)
             )
+            if found:
+                project, stored_at, source = found
+                warn_stale(f"Project '{cache_key}'", stored_at, source)
+                return (
+                    filter_project(project, project_filter)
+                    if project_filter
+                    else project
+                )
+            if self.mode == ClientMode.OFFLINE:
+                raise LocalDataNotFoundError(
+                    f"Project '{cache_key}' is not available in local cache or mirrors."
+                )
+        return self._request_raw_pep(parsed_path, query_param, project_filter)
 
-    def _set_registry_data(self, query_string: str) -> None:
-        """
-        Parse provided query string to extract project name, sample name, etc.
-
-        :param query_string: Passed by user. Contain information needed to locate the project.
-        :return: Parsed query string.
+    def _request_raw_pep(
+        self,
+        parsed_path: RegistryPath,
+        query_param: Optional[dict] = None,
+        project_filter: Optional[ProjectFilter] = None,
+    ) -> dict:
         """
-        try:
-            self.registry_path = RegistryPath(**parse_registry_path(query_string))
-        except (ValidationError, TypeError):
-            raise IncorrectQueryStringError(query_string=query_string)
+        Request raw project from PEPhub, regardless of client mode. Project cache is
+        used only if digest of the project in PEPhub didn't change.
 
-    def _build_pull_request_url(self, query_param: dict = None) -> str:
+        :param parsed_path: parsed registry path of the project
+        :param query_param: Optional variables to be passed to PEPhub
+        :param project_filter: columns and condition of samples to keep
+        :return: Raw project in dict.
         """
-        Build request for getting projects form pephub
+        original_query_param = query_param
+        # copy, caller's dict can be shared between threads
+        query_param = dict(query_param or {})
+        # projects filtered by query parameters are not cached
+        use_cache = self.__cache is not None and not query_param
+        query_param["raw"] = "true"
 
-        :param query_param: dict of parameters used in query string
-        :return: url string
-        """
-        query_param = query_param or {}
-        query_param["tag"] = self.registry_path.tag
+        digest = None
+        if use_cache:
+            cache_key = ProjectCache.build_key(parsed_path)
+            digest = self._get_project_digest(parsed_path)
+            if digest:
+                cached_project = self.__cache.get(cache_key, digest=digest)
+                if cached_project is not None:
+                    _LOGGER.debug(f"Project '{cache_key}' loaded from cache")
+                    if project_filter:
+                        return filter_project(cached_project, project_filter)
+                    return cached_project
 
-        endpoint = self.registry_path.namespace + "/" + self.registry_path.item
+        # PEPhub can't filter sample tables, filtered projects are parsed from the stream
+        pephub_response = self.send_request(
+            method="GET",
+            url=build_pull_request_url(parsed_path, query_param=query_param),
+            headers=self.parse_header(self.__jwt_data),
+            cookies=None,
+            stream=project_filter is not None,
+        )
+        try:
+            if pephub_response.status_code == ResponseStatusCodes.OK:
+                if project_filter:
+                    try:
+                        return ProjectDict.to_raw_dict(
+                            read_project(
+                                pephub_response.iter_content(
+                                    chunk_size=STREAM_CHUNK_SIZE
+                                ),
+                                project_filter,
+                            )
+                        )
+                    except DroppedIndexColumnsError as err:
+                        # samples came before config, that sets not selected index
+                        _LOGGER.debug(f"{err} Requesting project again.")
+                        return self._request_raw_pep(
+                            parsed_path,
+                            original_query_param,
+                            ProjectFilter(
+                                project_filter.columns + err.columns,
+                                project_filter.where,
+                            ),
+                        )
+                decoded_response = self.decode_response(
+                    pephub_response, output_json=True
+                )
 
-        variables_string = self.parse_query_param(query_param)
-        endpoint += variables_string
+                # This step is necessary because of this issue: https://github.com/pepkit/pephub/issues/124
+                project = ProjectDict.to_raw_dict(decoded_response)
+                if digest:
+                    self.__cache.set(cache_key, digest, project)
+                return project
 
-        return PEPHUB_PEP_API_BASE_URL + endpoint
+            if pephub_response.status_code == ResponseStatusCodes.NOT_EXIST:
+                raise ResponseError("File does not exist, or you are unauthorized.")
+            if pephub_response.status_code == ResponseStatusCodes.INTERNAL_ERROR:
+                raise ResponseError(
+                    f"Internal server error. Unexpected return value. Error: {pephub_response.status_code}"
+                )
+        finally:
+            pephub_response.close()
 
-    @staticmethod
-    def _build_project_search_url(namespace: str, query_param: dict = None) -> str:
+    def _pull_stream(
+        self,
+        registry_path: str,
+        force: bool = False,
+        zip: bool = False,
+        output: Optional[str] = None,
+        compression: str = DEFAULT_ZIP_COMPRESSION,
+        compression_level: Optional[int] = None,
+    ) -> None:
         """
-        Build request for searching projects form pephub
+        Download project and save it locally while response is being received
 
-        :param query_param: dict of parameters used in query string
-        :return: url string
+        :param registry_path: Project registry path in PEPhub (e.g. databio/base:default)
+        :param force: if project exists, overwrite it.
+        :param zip: if True, save project as zip file
+        :param output: path where project will be saved
+        :param compression: compression method of zip file (see pull)
+        :param compression_level: compression level of zip file (see pull)
+        :return: None
         """
+        parsed_path = parse_project_registry_path(registry_path)
+        pephub_response = self.send_request(
+            method="GET",
+            url=build_pull_request_url(parsed_path, query_param={"raw": "true"}),
+            headers=self.parse_header(self.__jwt_data),
+            cookies=None,
+            stream=True,
+        )
+        try:
+            if pephub_response.status_code == ResponseStatusCodes.OK:
+                save_pep_stream(
+                    pephub_response.iter_content(chunk_size=STREAM_CHUNK_SIZE),
+                    reg_path=registry_path,
+                    force=force,
+                    project_path=output,
+                    zip=zip,
+                    compression=compression,
+                    compression_level=compression_level,
+                )
+            elif pephub_response.status_code == ResponseStatusCodes.NOT_EXIST:
+                raise ResponseError("File does not exist, or you are unauthorized.")
+            elif pephub_response.status_code == ResponseStatusCodes.INTERNAL_ERROR:
+                raise ResponseError(
+                    f"Internal server error. Unexpected return value. Error: {pephub_response.status_code}"
+                )
+            else:
+                raise ResponseError(
+                    f"Unexpected return value. Error: {pephub_response.status_code}"
+                )
+        finally:
+            pephub_response.close()
 
-        variables_string = RequestManager.parse_query_param(query_param)
-        endpoint = variables_string
-
-        return PEPHUB_PEP_SEARCH_URL.format(namespace=namespace) + endpoint
-
-    @staticmethod
-    def _build_push_request_url(namespace: str) -> str:
+    def _get_project_digest(self, registry_path: RegistryPath) -> Optional[str]:
         """
-        Build project uplaod request used in pephub
+        Request project annotation and return digest of the project
 
-        :param namespace: namespace where project will be uploaded
-        :return: url string
+        :param registry_path: parsed registry path of the project
+        :return: project digest, or None if annotation is not available
         """
-        return PEPHUB_PUSH_URL.format(namespace=namespace)
+        pephub_response = self.send_request(
+            method="GET",
+            url=PEPHUB_PEP_ANNOTATION_URL.format(
+                namespace=registry_path.namespace, project=registry_path.item
+            )
+            + self.parse_query_param({"tag": registry_path.tag}),
+            headers=self.parse_header(self.__jwt_data),
+            cookies=None,
+        )
+        if pephub_response.status_code != ResponseStatusCodes.OK:
+            return None
+        try:
+            return ProjectAnnotationModel(
+                **self.decode_response(pephub_response, output_json=True)
+            ).digest
+        except (ResponseError, ValidationError, TypeError):
+            return None
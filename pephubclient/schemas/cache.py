@@ -0,0 +1,220 @@
+import copy
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+from pephubclient.cache import FileLock
+from pephubclient.schemas.constants import (
+    DEFAULT_LATEST_SCHEMA_TTL,
+    PATH_TO_SCHEMA_CACHE,
+)
+from pephubclient.schemas.models import SchemaCacheStats
+
+
+class SchemaCache:
+    """
+    Persistent local cache of schemas, shared by threads and processes.
+
+    Released schema versions don't change, so they are kept forever: in memory, and
+    on disk in `namespace/schema_name/version.json` files. Versions that `latest`
+    resolves to are stored in `latest.json` and reused for `latest_ttl` seconds.
+    Updates of `latest.json` are guarded by a file lock.
+    """
+
+    LATEST_FILE_NAME = "latest.json"
+    LOCK_FILE_NAME = ".lock"
+
+    def __init__(
+        self,
+        cache_dir: str = PATH_TO_SCHEMA_CACHE,
+        latest_ttl: float = DEFAULT_LATEST_SCHEMA_TTL,
+    ):
+        """
+        :param cache_dir: directory where schemas are stored
+        :param latest_ttl: number of seconds, for which resolved latest version is reused
+        """
+        self.cache_dir = cache_dir
+        self.latest_ttl = latest_ttl
+        self._lock = FileLock(os.path.join(cache_dir, self.LOCK_FILE_NAME))
+        self._memory_lock = threading.Lock()
+        self._schemas: Dict[Tuple[str, str, str], dict] = {}
+        self._latest: Dict[Tuple[str, str], Tuple[str, float]] = {}
+        self._stats = SchemaCacheStats()
+
+    def get(self, namespace: str, schema_name: str, version: str) -> Optional[dict]:
+        """
+        Get schema version from the cache
+
+        :param namespace: namespace of schema
+        :param schema_name: name of schema
+        :param version: version of schema (not latest)
+        :return: schema, or None if it is not cached
+        """
+        key = (namespace, schema_name, version)
+        with self._memory_lock:
+            schema = self._schemas.get(key)
+        if schema is None:
+            try:
+                with open(self._schema_path(*key), "r") as f:
+                    schema = json.load(f)
+            except (OSError, json.JSONDecodeError):
+                schema = None
+        with self._memory_lock:
+            if schema is None:
+                self._stats.misses += 1
+            else:
+                self._stats.hits += 1
+                self._schemas[key] = schema
+        # stored schema is shared by all callers, so each of them gets a copy
+        return copy.deepcopy(schema) if schema is not None else None
+
+    def set(self, namespace: str, schema_name: str, version: str, schema: dict) -> None:
+        """
+        Store schema version in the cache
+
+        :param namespace: namespace of schema
+        :param schema_name: name of schema
+        :param version: version of schema (not latest)
+        :param schema: schema
+        :return: None
+        """
+        with self._memory_lock:
+            self._schemas[(namespace, schema_name, version)] = copy.deepcopy(schema)
+        schema_path = self._schema_path(namespace, schema_name, version)
+        Path(os.path.dirname(schema_path)).mkdir(parents=True, exist_ok=True)
+        # write to temporary file and move into place, so readers never see partial files
+        with tempfile.NamedTemporaryFile(
+            "w", dir=os.path.dirname(schema_path), suffix=".tmp", delete=False
+        ) as f:
+            json.dump(schema, f)
+        os.replace(f.name, schema_path)
+
+    def get_latest_version(self, namespace: str, schema_name: str) -> Optional[str]:
+        """
+        Get version, that latest was resolved to less than `latest_ttl` seconds ago
+
+        :param namespace: namespace of schema
+        :param schema_name: name of schema
+        :return: version, or None if latest version is not known or expired
+        """
+        key = (namespace, schema_name)
+        now = time.time()
+        with self._memory_lock:
+            entry = self._latest.get(key)
+        if entry is None or now - entry[1] > self.latest_ttl:
+            with self._lock:
+                stored = self._read_latest().get(f"{namespace}/{schema_name}")
+            entry = (stored["version"], stored["resolved_at"]) if stored else None
+
+        with self._memory_lock:
+            if entry is None or now - entry[1] > self.latest_ttl:
+                self._stats.latest_misses += 1
+                return None
+            self._stats.latest_hits += 1
+            self._latest[key] = entry
+        return entry[0]
+
+    def get_stored_latest_version(
+        self, namespace: str, schema_name: str
+    ) -> Optional[Tuple[str, float]]:
+        """
+        Get version, that latest was last resolved to, regardless of `latest_ttl`.
+        Used when PEPhub is not requested (offline modes of the client).
+
+        :param namespace: namespace of schema
+        :param schema_name: name of schema
+        :return: version and time (unix timestamp) when it was resolved,
+            or None if latest version was never resolved
+        """
+        with self._memory_lock:
+            entry = self._latest.get((namespace, schema_name))
+        if entry is None:
+            with self._lock:
+                stored = self._read_latest().get(f"{namespace}/{schema_name}")
+            entry = (stored["version"], stored["resolved_at"]) if stored else None
+        return entry
+
+    def set_latest_version(
+        self, namespace: str, schema_name: str, version: str
+    ) -> None:
+        """
+        Store version, that latest was resolved to
+
+        :param namespace: namespace of schema
+        :param schema_name: name of schema
+        :param version: latest version of schema
+        :return: None
+        """
+        resolved_at = time.time()
+        with self._memory_lock:
+            self._latest[(namespace, schema_name)] = (version, resolved_at)
+        with self._lock:
+            latest = self._read_latest()
+            latest[f"{namespace}/{schema_name}"] = {
+                "version": version,
+                "resolved_at": resolved_at,
+            }
+            self._write_latest(latest)
+
+    def invalidate(
+        self, namespace: str, schema_name: str, version: Optional[str] = None
+    ) -> None:
+        """
+        Remove schema version and resolved latest version from the cache.
+        Used when schema is changed in PEPhub.
+
+        :param namespace: namespace of schema
+        :param schema_name: name of schema
+        :param version: version of schema (not latest). If None, all versions are removed
+        :return: None
+        """
+        with self._memory_lock:
+            self._latest.pop((namespace, schema_name), None)
+            for key in list(self._schemas):
+                if key[:2] == (namespace, schema_name) and version in (None, key[2]):
+                    del self._schemas[key]
+        if not os.path.isdir(self.cache_dir):
+            return None
+        if version is None:
+            shutil.rmtree(
+                os.path.join(self.cache_dir, namespace, schema_name), ignore_errors=True
+            )
+        else:
+            try:
+                os.remove(self._schema_path(namespace, schema_name, version))
+            except FileNotFoundError:
+                pass
+        with self._lock:
+            latest = self._read_latest()
+            if latest.pop(f"{namespace}/{schema_name}", None) is not None:
+                self._write_latest(latest)
+
+    def stats(self) -> SchemaCacheStats:
+        """
+        Get hit and miss statistics of this cache object
+
+        :return: copy of current statistics
+        """
+        with self._memory_lock:
+            return self._stats.model_copy()
+
+    def _schema_path(self, namespace: str, schema_name: str, version: str) -> str:
+        return os.path.join(self.cache_dir, namespace, schema_name, f"{version}.json")
+
+    def _read_latest(self) -> dict:
+        try:
+            with open(os.path.join(self.cache_dir, self.LATEST_FILE_NAME), "r") as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+
+    def _write_latest(self, latest: dict) -> None:
+        latest_path = os.path.join(self.cache_dir, self.LATEST_FILE_NAME)
+        with open(latest_path + ".tmp", "w") as f:
+            json.dump(latest, f)
+        os.replace(latest_path + ".tmp", latest_path)
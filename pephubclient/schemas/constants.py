@@ -1,4 +1,6 @@
-from pephubclient.constants import PEPHUB_BASE_URL
+import os
+
+from pephubclient.constants import PATH_TO_CACHE, PEPHUB_BASE_URL
 
 PEPHUB_SCHEMA_BASE_URL = f"{PEPHUB_BASE_URL}api/v1/schemas/"
 
@@ -15,3 +17,7 @@ PEPHUB_SCHEMA_VERSION_URL = (
 )
 
 LATEST_VERSION = "latest"
+
+PATH_TO_SCHEMA_CACHE = os.path.join(PATH_TO_CACHE, "schemas")
+# number of seconds, for which version resolved as latest is reused by schema cache
+DEFAULT_LATEST_SCHEMA_TTL = 600
@@ -75,3 +75,22 @@ class UpdateSchemaVersionFields(BaseModel):
     release_notes: Optional[Union[str, None]] = None
 
     model_config = ConfigDict(extra="forbid")
+
+
+class SchemaCacheStats(BaseModel):
+    """
+    Hit and miss statistics of schema cache
+    """
+
+    hits: int = 0
+    misses: int = 0
+    latest_hits: int = 0
+    latest_misses: int = 0
+
+    @property
+    def hit_ratio(self) -> float:
+        """
+        Fraction of schema and latest version lookups served from the cache
+        """
+        lookups = self.hits + self.misses + self.latest_hits + self.latest_misses
+        return (self.hits + self.latest_hits) / lookups if lookups else 0.0
@@ -1,8 +1,10 @@
 import logging
-from typing import Union, List
+from typing import Optional, Union, List
+
+import requests
 
 from pephubclient.helpers import RequestManager
-from pephubclient.constants import ResponseStatusCodes
+from pephubclient.constants import ClientMode, ResponseStatusCodes
 from pephubclient.schemas.constants import (
     PEPHUB_SCHEMA_VERSION_URL,
     PEPHUB_SCHEMA_VERSIONS_URL,
@@ -11,7 +13,11 @@ from pephubclient.schemas.constants import (
     PEPHUB_SCHEMA_RECORD_URL,
     LATEST_VERSION,
 )
-from pephubclient.exceptions import ResponseError
+from pephubclient.exceptions import LocalDataNotFoundError, ResponseError
+from pephubclient.instrumentation import RequestHook
+from pephubclient.local import warn_stale
+from pephubclient.models import RetryPolicy
+from pephubclient.schemas.cache import SchemaCache
 from pephubclient.schemas.models import (
     SchemaVersionResult,
     NewSchemaVersionModel,
@@ -29,18 +35,35 @@ class PEPHubSchema(RequestManager):
         getting, creating, updating and removing schemas records and schema versions.
     """
 
-    def __init__(self, jwt_data: str = None):
+    def __init__(
+        self,
+        jwt_data: str = None,
+        session: requests.Session = None,
+        retry_policy: RetryPolicy = None,
+        hooks: List[RequestHook] = None,
+        cache: SchemaCache = None,
+        mode: ClientMode = ClientMode.ONLINE,
+    ):
         """
         :param jwt_data: jwt token for authorization
+        :param session: requests session shared with other PEPhub clients
+        :param retry_policy: policy of retrying failed requests
+        :param hooks: request hooks shared with other PEPhub clients
+        :param cache: schema cache used by get_cached. Default: SchemaCache()
+        :param mode: client mode. In prefer-local and offline modes, get is answered
+            from the schema cache, if possible
         """
-
+        super().__init__(session=session, retry_policy=retry_policy, hooks=hooks)
         self.__jwt_data = jwt_data
+        self.cache = cache or SchemaCache()
+        self.mode = ClientMode(mode)
 
     def get(
         self, namespace: str, schema_name: str, version: str = LATEST_VERSION
     ) -> dict:
         """
-        Get schema value for specific schema version.
+        Get schema value for specific schema version. In online mode, schema is
+        always requested from PEPhub; use get_cached to use schema cache.
 
         :param: namespace: namespace of schema
         :param: schema_name: name of schema
@@ -48,6 +71,15 @@ class PEPHubSchema(RequestManager):
 
         :return: Schema object as dictionary
         """
+        if self.mode != ClientMode.ONLINE:
+            schema = self._get_local(namespace, schema_name, version)
+            if schema is not None:
+                return schema
+            if self.mode == ClientMode.OFFLINE:
+                raise LocalDataNotFoundError(
+                    f"Schema '{namespace}/{schema_name}:{version}' is not available "
+                    f"in schema cache '{self.cache.cache_dir}'."
+                )
 
         pephub_response = self.send_request(
             method="GET",
@@ -59,6 +91,8 @@ class PEPHubSchema(RequestManager):
         )
         if pephub_response.status_code == ResponseStatusCodes.OK:
             decoded_response = self.decode_response(pephub_response, output_json=True)
+            if self.mode != ClientMode.ONLINE and version != LATEST_VERSION:
+                self._set_cached(namespace, schema_name, version, decoded_response)
             return decoded_response
 
         if pephub_response.status_code == ResponseStatusCodes.NOT_EXIST:
@@ -72,6 +106,100 @@ class PEPHubSchema(RequestManager):
                 f"Unexpected Status code return. Error: {pephub_response.status_code}"
             )
 
+    def get_cached(
+        self, namespace: str, schema_name: str, version: str = LATEST_VERSION
+    ) -> dict:
+        """
+        Get schema value using schema cache.
+
+        Released versions are downloaded only once. Latest version is resolved with
+        get_versions, at most once per cache TTL, and downloaded only if it changed.
+        Versions changed or deleted with this client are removed from the cache.
+
+        :param namespace: namespace of schema
+        :param schema_name: name of schema
+        :param version: version of schema
+        :return: Schema object as dictionary
+        """
+        if self.mode != ClientMode.ONLINE:
+            # get already uses the cache, without resolving latest version in PEPhub
+            return self.get(namespace, schema_name, version)
+
+        if version == LATEST_VERSION:
+            version = self.cache.get_latest_version(namespace, schema_name)
+            if version is None:
+                version = self._resolve_latest_version(namespace, schema_name)
+                try:
+                    self.cache.set_latest_version(namespace, schema_name, version)
+                except OSError as err:
+                    _LOGGER.warning(f"Latest schema version could not be cached: {err}")
+
+        schema = self.cache.get(namespace, schema_name, version)
+        if schema is None:
+            schema = self.get(namespace, schema_name, version)
+            self._set_cached(namespace, schema_name, version, schema)
+        return schema
+
+    def _get_local(
+        self, namespace: str, schema_name: str, version: str
+    ) -> Optional[dict]:
+        """
+        Get schema from the cache without requesting PEPhub. Latest version is resolved
+        to the version it was last resolved to, and its age is reported with StaleDataWarning.
+
+        :param namespace: namespace of schema
+        :param schema_name: name of schema
+        :param version: version of schema
+        :return: schema, or None if it is not cached
+        """
+        if version != LATEST_VERSION:
+            # released versions don't change, cached copy is never stale
+            return self.cache.get(namespace, schema_name, version)
+
+        latest = self.cache.get_stored_latest_version(namespace, schema_name)
+        if latest is None:
+            return None
+        version, resolved_at = latest
+        schema = self.cache.get(namespace, schema_name, version)
+        if schema is not None:
+            warn_stale(
+                f"Latest version of schema '{namespace}/{schema_name}' ({version})",
+                resolved_at,
+                f"schema cache '{self.cache.cache_dir}'",
+            )
+        return schema
+
+    def _set_cached(
+        self, namespace: str, schema_name: str, version: str, schema: dict
+    ) -> None:
+        try:
+            self.cache.set(namespace, schema_name, version, schema)
+        except OSError as err:
+            _LOGGER.warning(f"Schema could not be cached: {err}")
+
+    def _invalidate_cached(
+        self, namespace: str, schema_name: str, version: Optional[str] = None
+    ) -> None:
+        try:
+            self.cache.invalidate(namespace, schema_name, version)
+        except OSError as err:
+            _LOGGER.warning(f"Cached schema could not be removed: {err}")
+
+    def _resolve_latest_version(self, namespace: str, schema_name: str) -> str:
+        """
+        Get latest (most recently released) version of schema
+
+        :param namespace: namespace of schema
+        :param schema_name: name of schema
+        :return: version
+        """
+        versions = self.get_versions(namespace, schema_name).results
+        if not versions:
+            raise ResponseError(
+                f"Schema '{namespace}/{schema_name}' doesn't have any version."
+            )
+        return max(versions, key=lambda annotation: annotation.release_date).version
+
     def get_versions(self, namespace: str, schema_name: str) -> SchemaVersionResult:
         """
         Get list of versions
@@ -163,6 +291,7 @@ class PEPHubSchema(RequestManager):
             cookies=None,
             json=request_body,
         )
+        self._invalidate_cached(namespace, schema_name)
 
         if pephub_response.status_code == ResponseStatusCodes.ACCEPTED:
             _LOGGER.info(
@@ -222,6 +351,7 @@ class PEPHubSchema(RequestManager):
             cookies=None,
             json=request_body,
         )
+        self._invalidate_cached(namespace, schema_name, version)
 
         if pephub_response.status_code == ResponseStatusCodes.ACCEPTED:
             _LOGGER.info(
@@ -339,6 +469,7 @@ class PEPHubSchema(RequestManager):
             cookies=None,
             json=update_fields,
         )
+        self._invalidate_cached(namespace, schema_name, version)
 
         if pephub_response.status_code == ResponseStatusCodes.ACCEPTED:
             _LOGGER.info(
@@ -377,6 +508,7 @@ class PEPHubSchema(RequestManager):
             headers=self.parse_header(self.__jwt_data),
             cookies=None,
         )
+        self._invalidate_cached(namespace, schema_name)
 
         if pephub_response.status_code == ResponseStatusCodes.ACCEPTED:
             _LOGGER.info(
@@ -424,6 +556,7 @@ class PEPHubSchema(RequestManager):
             headers=self.parse_header(self.__jwt_data),
             cookies=None,
         )
+        self._invalidate_cached(namespace, schema_name, version)
 
         if pephub_response.status_code == ResponseStatusCodes.ACCEPTED:
             _LOGGER.info(
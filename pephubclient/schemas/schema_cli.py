@@ -1,9 +1,10 @@
 import typer
 import os
-from typing import List
-from pephubclient.helpers import call_client_func
-from pephubclient.helpers import open_schema, schema_path_converter, save_schema
-from pephubclient.pephubclient import PEPHubClient
+from typing import TYPE_CHECKING, List
+
+# helpers and the client load peppy and pandas, so they are imported inside commands
+if TYPE_CHECKING:
+    from pephubclient.schemas.schema import PEPHubSchema
 
 schemas_app = typer.Typer(
     pretty_exceptions_short=False,
@@ -11,7 +12,16 @@ schemas_app = typer.Typer(
     help="PEPhub CLI for schemas",
 )
 
-_client_schema = PEPHubClient().schema
+
+def _get_client_schema() -> "PEPHubSchema":
+    """
+    Get schema client of the PEPhub client shared by all cli commands
+
+    :return: PEPhub schema client
+    """
+    from pephubclient.cli import get_client
+
+    return get_client().schema
 
 
 @schemas_app.command(
@@ -22,10 +32,16 @@ def get(
     output: str = typer.Option(None, help="Output directory."),
     format: str = typer.Option("json", help="Format in which file should be saved"),
 ):
+    from pephubclient.helpers import (
+        call_client_func,
+        save_schema,
+        schema_path_converter,
+    )
+
     namespace, schema_name, version = schema_path_converter(schema_registry_path)
 
     schema_value = call_client_func(
-        _client_schema.get,
+        _get_client_schema().get,
         namespace=namespace,
         schema_name=schema_name,
         version=version,
@@ -55,10 +71,12 @@ def create(
     private: bool = typer.Option(False, help="Make schema private"),
     lifecycle_stage: str = typer.Option("", help="Lifecycle stage"),
 ):
+    from pephubclient.helpers import call_client_func, open_schema
+
     schema_value = open_schema(schema)
 
     call_client_func(
-        _client_schema.create_schema,
+        _get_client_schema().create_schema,
         schema_name=schema_name,
         version=version,
         description=description,
@@ -87,9 +105,11 @@ def add_version(
     tags: List[str] = typer.Option(list(), help="Tags of the version"),
     release_notes: str = typer.Option("", help="Version release notes"),
 ):
+    from pephubclient.helpers import call_client_func, open_schema
+
     schema_value = open_schema(schema)
     call_client_func(
-        _client_schema.add_version,
+        _get_client_schema().add_version,
         namespace=namespace,
         schema_name=schema_name,
         schema_value=schema_value,
@@ -108,8 +128,10 @@ def delete_version(
     schema_name: str = typer.Option(..., help="Schema name"),
     version: str = typer.Option(..., help="Schema version"),
 ):
+    from pephubclient.helpers import call_client_func
+
     call_client_func(
-        _client_schema.delete_version,
+        _get_client_schema().delete_version,
         namespace=namespace,
         schema_name=schema_name,
         version=version,
@@ -123,8 +145,10 @@ def remove(
     namespace: str = typer.Option(..., help="Schema namespace"),
     schema_name: str = typer.Option(..., help="Schema name"),
 ):
+    from pephubclient.helpers import call_client_func
+
     call_client_func(
-        _client_schema.delete_schema,
+        _get_client_schema().delete_schema,
         namespace=namespace,
         schema_name=schema_name,
     )
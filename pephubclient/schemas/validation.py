@@ -0,0 +1,322 @@
+import json
+import logging
+import re
+from functools import lru_cache
+from typing import Callable, Dict, List, Optional, Tuple
+
+import pandas as pd
+from peppy.const import CONFIG_KEY, SAMPLE_RAW_DICT_KEY
+
+_LOGGER = logging.getLogger("pephubclient")
+
+# Optional full JSON schema validator, used for schema parts that can't be checked column-wise
+try:
+    import jsonschema
+except ImportError:
+    jsonschema = None
+
+# number of sample names listed in one validation error
+MAX_REPORTED_SAMPLES = 5
+
+_JSON_TYPES = {
+    "string": {str},
+    "integer": {int},
+    "number": {int, float},
+    "boolean": {bool},
+    "array": {list, tuple},
+    "object": {dict},
+    "null": {type(None)},
+}
+
+# keywords that don't constrain values
+_ANNOTATION_KEYWORDS = {
+    "$comment",
+    "$id",
+    "$schema",
+    "default",
+    "deprecated",
+    "description",
+    "examples",
+    "files",
+    "readOnly",
+    "required_files",
+    "sizing",
+    "tangible",
+    "title",
+    "writeOnly",
+}
+
+# check of non-missing values of column: (problem description, function returning mask of valid values).
+# Function is called with values and their python types
+ColumnCheck = Tuple[str, Callable[[pd.Series, pd.Series], pd.Series]]
+
+
+def _type_check(types_names) -> Optional[ColumnCheck]:
+    if isinstance(types_names, str):
+        types_names = [types_names]
+    if any(type_name not in _JSON_TYPES for type_name in types_names):
+        return None
+    allowed = set().union(*(_JSON_TYPES[type_name] for type_name in types_names))
+    problem = f"is not of type {' or '.join(types_names)}"
+    return problem, lambda values, types: types.isin(allowed)
+
+
+def _enum_check(enum: list, problem: str) -> Optional[ColumnCheck]:
+    try:
+        allowed = set(enum)
+    except TypeError:
+        # unhashable (array or object) options
+        return None
+    return problem, lambda values, types: values.isin(allowed)
+
+
+def _string_check(problem: str, check: Callable[[pd.Series], pd.Series]) -> ColumnCheck:
+    def valid(values: pd.Series, types: pd.Series) -> pd.Series:
+        is_string = types == str
+        result = ~is_string
+        result[is_string] = check(values[is_string].astype(str))
+        return result
+
+    return problem, valid
+
+
+def _number_check(problem: str, check: Callable[[pd.Series], pd.Series]) -> ColumnCheck:
+    def valid(values: pd.Series, types: pd.Series) -> pd.Series:
+        is_number = types.isin({int, float})
+        result = ~is_number
+        result[is_number] = check(values[is_number].astype(float))
+        return result
+
+    return problem, valid
+
+
+def _compile_column(column_schema: dict) -> Tuple[List[ColumnCheck], bool]:
+    """
+    Compile schema of one sample attribute into column-wise checks
+
+    :param column_schema: JSON schema of the attribute
+    :return: list of checks, and whether some keywords couldn't be compiled
+        (and have to be validated by jsonschema)
+    """
+    checks = []
+    residual = False
+    for keyword, value in column_schema.items():
+        check = None
+        if keyword == "type":
+            check = _type_check(value)
+        elif keyword == "enum":
+            check = _enum_check(value, f"is not one of {value}")
+        elif keyword == "const":
+            check = _enum_check([value], f"is not equal to {value!r}")
+        elif keyword == "pattern":
+            pattern = re.compile(value)
+            check = _string_check(
+                f"does not match '{value}'",
+                lambda strings, pattern=pattern: strings.str.contains(pattern),
+            )
+        elif keyword == "minLength":
+            check = _string_check(
+                f"is shorter than {value}",
+                lambda strings, value=value: strings.str.len() >= value,
+            )
+        elif keyword == "maxLength":
+            check = _string_check(
+                f"is longer than {value}",
+                lambda strings, value=value: strings.str.len() <= value,
+            )
+        elif keyword == "minimum":
+            check = _number_check(
+                f"is less than {value}", lambda numbers, value=value: numbers >= value
+            )
+        elif keyword == "maximum":
+            check = _number_check(
+                f"is greater than {value}",
+                lambda numbers, value=value: numbers <= value,
+            )
+        elif keyword == "exclusiveMinimum":
+            check = _number_check(
+                f"is not greater than {value}",
+                lambda numbers, value=value: numbers > value,
+            )
+        elif keyword == "exclusiveMaximum":
+            check = _number_check(
+                f"is not less than {value}",
+                lambda numbers, value=value: numbers < value,
+            )
+        elif keyword in _ANNOTATION_KEYWORDS:
+            continue
+
+        if check is None:
+            residual = True
+        else:
+            checks.append(check)
+    return checks, residual
+
+
+class ProjectValidator:
+    """
+    PEP schema compiled into column-wise checks of the sample table.
+
+    Sample attributes are checked with vectorized pandas operations, one column
+    at a time. Parts of the schema that can't be checked this way (config, and
+    keywords like anyOf or $ref) are validated with `jsonschema`, if installed.
+    """
+
+    def __init__(self, schema: dict):
+        """
+        :param schema: PEP schema (JSON schema of project with config and samples)
+        """
+        properties = schema.get("properties", {})
+        samples_schema = properties.get("samples", properties.get("_samples", {}))
+        sample_schema = samples_schema.get("items", {})
+
+        self.required = list(sample_schema.get("required", []))
+        self.column_checks: Dict[str, List[ColumnCheck]] = {}
+        residual_properties = {}
+        for column, column_schema in sample_schema.get("properties", {}).items():
+            checks, residual = _compile_column(column_schema)
+            if checks:
+                self.column_checks[column] = checks
+            if residual:
+                residual_properties[column] = column_schema
+        residual_sample_schema = {
+            keyword: value
+            for keyword, value in sample_schema.items()
+            if keyword not in ("properties", "required", "type")
+            and keyword not in _ANNOTATION_KEYWORDS
+        }
+        if residual_properties:
+            residual_sample_schema["properties"] = residual_properties
+
+        self._config_validator = None
+        self._sample_validator = None
+        self.not_validated = []
+        if "config" in properties:
+            self.not_validated.append("config")
+        if residual_sample_schema:
+            self.not_validated.append(
+                f"sample attributes {list(residual_properties)}"
+                if residual_properties
+                else "sample keywords"
+            )
+        if jsonschema is not None:
+            if "config" in properties:
+                self._config_validator = self._build_validator(
+                    schema, properties["config"]
+                )
+            if residual_sample_schema:
+                self._sample_validator = self._build_validator(
+                    schema, residual_sample_schema
+                )
+            self.not_validated = []
+
+    @staticmethod
+    def _build_validator(schema: dict, sub_schema: dict):
+        # definitions of the whole schema have to be available for $ref
+        sub_schema = {**sub_schema}
+        for key in ("$schema", "definitions", "$defs"):
+            if key in schema and key not in sub_schema:
+                sub_schema[key] = schema[key]
+        validator_class = jsonschema.validators.validator_for(sub_schema)
+        return validator_class(sub_schema)
+
+    def validate(
+        self, pep_dict: dict, sample_name_key: str = "sample_name"
+    ) -> List[str]:
+        """
+        Validate raw project
+
+        :param pep_dict: raw project (with samples as list of dicts)
+        :param sample_name_key: sample attribute with sample name, used in error messages
+        :return: list of errors, empty if project is valid
+        """
+        if self.not_validated:
+            _LOGGER.warning(
+                f"jsonschema is not installed, so {' and '.join(self.not_validated)} "
+                f"were not validated. Install it with: pip install pephubclient[validation]"
+            )
+        samples = pep_dict.get(SAMPLE_RAW_DICT_KEY) or []
+        # object dtype keeps values as they are: integer column with missing values
+        # is not upcast to float
+        table = pd.DataFrame(samples, dtype=object)
+        if sample_name_key in table.columns:
+            names = table[sample_name_key].astype(str)
+        else:
+            names = pd.Series(table.index.astype(str), index=table.index)
+
+        errors = []
+        for column in self.required:
+            if column not in table.columns:
+                if samples:
+                    errors.append(f"required attribute '{column}' is missing")
+                continue
+            missing = table[column].isna()
+            if missing.any():
+                errors.append(
+                    self._describe(column, "is missing", missing[missing].index, names)
+                )
+
+        for column, checks in self.column_checks.items():
+            if column not in table.columns:
+                continue
+            values = table[column]
+            values = values[values.notna()]
+            types = values.map(type)
+            for problem, check in checks:
+                valid = check(values, types)
+                if not valid.all():
+                    errors.append(
+                        self._describe(column, problem, valid[~valid].index, names)
+                    )
+
+        if self._sample_validator is not None:
+            invalid_samples: Dict[Tuple[str, str], list] = {}
+            for position, sample in enumerate(samples):
+                for error in self._sample_validator.iter_errors(sample):
+                    column = error.path[0] if error.path else "sample"
+                    key = (column, f"is not valid ({error.validator})")
+                    invalid_samples.setdefault(key, []).append(position)
+            for (column, problem), positions in invalid_samples.items():
+                errors.append(self._describe(column, problem, positions, names))
+
+        if self._config_validator is not None:
+            for error in self._config_validator.iter_errors(
+                pep_dict.get(CONFIG_KEY, {})
+            ):
+                path = ".".join(str(part) for part in error.path)
+                errors.append(f"config{'.' + path if path else ''}: {error.message}")
+        return errors
+
+    @staticmethod
+    def _describe(column: str, problem: str, invalid, names: pd.Series) -> str:
+        """
+        Build error message of samples, that didn't pass the check
+
+        :param column: name of checked attribute
+        :param problem: description of the problem
+        :param invalid: index of invalid samples
+        :param names: sample names
+        :return: error message
+        """
+        listed = list(names.loc[list(invalid[:MAX_REPORTED_SAMPLES])])
+        if len(invalid) > MAX_REPORTED_SAMPLES:
+            listed.append("...")
+        return (
+            f"attribute '{column}' {problem} in {len(invalid)} sample(s): "
+            f"{', '.join(listed)}"
+        )
+
+
+@lru_cache(maxsize=32)
+def _compile_schema(schema_json: str) -> ProjectValidator:
+    return ProjectValidator(json.loads(schema_json))
+
+
+def get_project_validator(schema: dict) -> ProjectValidator:
+    """
+    Get validator of schema. Validators are compiled once per process and reused.
+
+    :param schema: PEP schema
+    :return: compiled validator
+    """
+    return _compile_schema(json.dumps(schema, sort_keys=True))
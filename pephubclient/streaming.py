@@ -0,0 +1,557 @@
+import codecs
+import csv
+import json
+import os
+import re
+import tempfile
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from peppy.const import (
+    CONFIG_KEY,
+    SAMPLE_NAME_ATTR,
+    SAMPLE_RAW_DICT_KEY,
+    SAMPLE_TABLE_INDEX_KEY,
+    SUBSAMPLE_NAME_ATTR,
+    SUBSAMPLE_RAW_LIST_KEY,
+    SUBSAMPLE_TABLE_INDEX_KEY,
+)
+
+from pephubclient.exceptions import ResponseError
+
+# size of chunks read from streamed response body
+STREAM_CHUNK_SIZE = 64 * 1024
+
+SAMPLE_TABLE_FILE_NAME = "sample_table.csv"
+SUBSAMPLE_TABLE_FILE_NAME = "subsample_table{number}.csv"
+
+# PEPhub keys and peppy raw keys of project parts
+_CONFIG_KEYS = ("config", CONFIG_KEY)
+_SAMPLE_KEYS = ("sample_list", SAMPLE_RAW_DICT_KEY)
+_SUBSAMPLE_KEYS = ("subsample_list", SUBSAMPLE_RAW_LIST_KEY)
+
+_NOT_WHITESPACE = re.compile(r"[^ \t\n\r]")
+
+
+class JSONStream:
+    """
+    Incremental reader of JSON document from iterable of byte chunks.
+
+    Holds in memory only not yet consumed part of the document, so arrays can be read
+    element by element, no matter how large they are.
+    """
+
+    def __init__(self, chunks: Iterable[bytes]):
+        """
+        :param chunks: byte chunks of utf-8 encoded JSON document
+        """
+        self._chunks = iter(chunks)
+        self._text_decoder = codecs.getincrementaldecoder("utf-8")()
+        self._json_decoder = json.JSONDecoder()
+        self._buffer = ""
+        self._position = 0
+        self._eof = False
+
+    def _fill(self, min_size: int = 1) -> bool:
+        """
+        Drop consumed text and read next chunks, until buffer grows by at least min_size
+
+        :param min_size: number of characters to add to the buffer
+        :return: False if end of document was reached before anything was read
+        """
+        self._buffer = self._buffer[self._position :]
+        self._position = 0
+        target_size = len(self._buffer) + min_size
+        read = False
+        while not self._eof and len(self._buffer) < target_size:
+            chunk = next(self._chunks, None)
+            if chunk is None:
+                self._buffer += self._text_decoder.decode(b"", final=True)
+                self._eof = True
+            else:
+                self._buffer += self._text_decoder.decode(chunk)
+            read = True
+        return read
+
+    def _error(self, message: str) -> ResponseError:
+        return ResponseError(f"Error in response encoding format: {message}")
+
+    def peek(self) -> str:
+        """
+        Skip whitespaces and return next character of the document
+
+        :return: next character, or empty string at the end of document
+        """
+        while True:
+            match = _NOT_WHITESPACE.search(self._buffer, self._position)
+            if match:
+                self._position = match.start()
+                return self._buffer[self._position]
+            self._position = len(self._buffer)
+            if not self._fill():
+                return ""
+
+    def expect(self, char: str) -> None:
+        """
+        Consume next character, that has to be equal to char
+
+        :param char: expected character
+        """
+        if self.peek() != char:
+            raise self._error(f"expected '{char}'")
+        self._position += 1
+
+    def read_value(self) -> Any:
+        """
+        Read and decode next JSON value (object, array, string, number or literal)
+
+        :return: decoded value
+        """
+        return self.read_raw_value()[0]
+
+    def read_raw_value(self) -> Tuple[Any, str]:
+        """
+        Read next JSON value and return it both decoded and as JSON text
+
+        :return: decoded value and its JSON text
+        """
+        if not self.peek():
+            raise self._error("unexpected end of document")
+        while True:
+            try:
+                value, end = self._json_decoder.raw_decode(self._buffer, self._position)
+            except json.JSONDecodeError as err:
+                # value doesn't fit in the buffer yet. Buffer is at least doubled,
+                # so large values are not parsed over and over again
+                if self._fill(min_size=len(self._buffer) - self._position + 1):
+                    continue
+                raise self._error(str(err))
+            # number at the end of buffer can continue in the next chunk
+            if end == len(self._buffer) and self._fill():
+                continue
+            raw_value = self._buffer[self._position : end]
+            self._position = end
+            return value, raw_value
+
+    def iter_array(self) -> Iterator[None]:
+        """
+        Iterate over array elements. Caller has to consume each element (e.g. with read_value)
+        before requesting next one.
+        """
+        self.expect("[")
+        if self.peek() == "]":
+            self._position += 1
+            return
+        while True:
+            yield
+            char = self.peek()
+            self._position += 1
+            if char == "]":
+                return
+            if char != ",":
+                raise self._error("expected ',' or ']' in array")
+
+    def iter_object_keys(self) -> Iterator[str]:
+        """
+        Iterate over object keys. Caller has to consume value of each key
+        before requesting next one.
+        """
+        self.expect("{")
+        if self.peek() == "}":
+            self._position += 1
+            return
+        while True:
+            if self.peek() != '"':
+                raise self._error("expected object key")
+            key = self.read_value()
+            self.expect(":")
+            yield key
+            char = self.peek()
+            self._position += 1
+            if char == "}":
+                return
+            if char != ",":
+                raise self._error("expected ',' or '}' in object")
+
+
+class DroppedIndexColumnsError(Exception):
+    """
+    Index columns set in config were dropped from tables streamed before the config
+    """
+
+    def __init__(self, columns: List[str]):
+        """
+        :param columns: dropped index columns
+        """
+        self.columns = columns
+        super().__init__(
+            f"Index columns {columns} were dropped from tables read before config."
+        )
+
+
+class ProjectFilter:
+    """
+    Column projection and row filter of sample and subsample tables of a raw project.
+
+    Index columns (sample_name, or sample_table_index and subsample_table_index of
+    the config) are always kept, so that peppy project can be created from filtered
+    tables. Subsample rows of samples that were filtered out are removed, as are
+    subsample tables left without rows, or without any column besides index columns.
+    """
+
+    def __init__(
+        self,
+        columns: Optional[Iterable[str]] = None,
+        where: Optional[Union[Dict[str, Any], Callable[[dict], bool]]] = None,
+    ):
+        """
+        :param columns: sample and subsample table columns to keep. Default: all columns
+        :param where: condition of samples to keep: dict of column -> value (or list of
+            allowed values), or function called with raw sample dict. Condition is checked
+            before columns are dropped, so it can use columns that are not kept
+        """
+        if where is not None and not callable(where) and not isinstance(where, dict):
+            raise TypeError("Condition 'where' must be a dict or a function.")
+        self.columns = None if columns is None else list(dict.fromkeys(columns))
+        self.where = where
+        self.sample_index = SAMPLE_NAME_ATTR
+        self.subsample_index = [SAMPLE_NAME_ATTR, SUBSAMPLE_NAME_ATTR]
+
+    def set_config(self, config: Any) -> None:
+        """
+        Take index columns of sample and subsample tables from project config
+
+        :param config: project config
+        """
+        if not isinstance(config, dict):
+            return None
+        self.sample_index = config.get(SAMPLE_TABLE_INDEX_KEY) or SAMPLE_NAME_ATTR
+        subsample_index = config.get(SUBSAMPLE_TABLE_INDEX_KEY) or self.subsample_index
+        if isinstance(subsample_index, str):
+            subsample_index = [subsample_index]
+        self.subsample_index = list(subsample_index)
+
+    def matches(self, sample: dict) -> bool:
+        """
+        Check if sample meets the condition
+
+        :param sample: raw sample dict
+        :return: True if sample is kept
+        """
+        if self.where is None:
+            return True
+        if callable(self.where):
+            return bool(self.where(sample))
+        for column, allowed in self.where.items():
+            value = sample.get(column)
+            if isinstance(allowed, (list, tuple, set, frozenset)):
+                if value not in allowed:
+                    return False
+            elif value != allowed:
+                return False
+        return True
+
+    def filter_samples(self, samples: Iterable[dict]) -> List[dict]:
+        """
+        Keep samples that meet the condition, with selected columns only.
+        Samples are consumed one by one, so that dropped columns are never stored.
+
+        :param samples: raw sample dicts
+        :return: filtered samples
+        """
+        keep = self._sample_columns()
+        filtered = []
+        for sample in samples:
+            if not isinstance(sample, dict):
+                raise ResponseError(f"Incorrect table row in response: {sample}")
+            if not self.matches(sample):
+                continue
+            if keep is not None:
+                sample = {column: sample[column] for column in keep if column in sample}
+            filtered.append(sample)
+        return filtered
+
+    def project_samples(self, samples: List[dict]) -> List[dict]:
+        """
+        Drop columns of samples, that are not selected
+
+        :param samples: samples that meet the condition
+        :return: samples with selected columns only
+        """
+        keep = self._sample_columns()
+        if keep is None:
+            return samples
+        return [
+            {column: sample[column] for column in keep if column in sample}
+            for sample in samples
+        ]
+
+    def project_subsamples(self, rows: Iterable[dict]) -> List[dict]:
+        """
+        Drop columns of subsample rows, that are not selected.
+        Rows are consumed one by one, so that dropped columns are never stored.
+
+        :param rows: raw subsample dicts
+        :return: subsample rows with selected columns only
+        """
+        keep = self._subsample_columns()
+        projected = []
+        for row in rows:
+            if not isinstance(row, dict):
+                raise ResponseError(f"Incorrect table row in response: {row}")
+            if keep is not None:
+                row = {column: row[column] for column in keep if column in row}
+            projected.append(row)
+        return projected
+
+    def filter_subsamples(self, subsample_tables: list, samples: List[dict]) -> list:
+        """
+        Remove subsample rows of filtered out samples, columns that are not selected,
+        and tables left without rows or without any column besides index columns
+
+        :param subsample_tables: list of subsample tables (lists of row dicts)
+        :param samples: filtered samples
+        :return: filtered subsample tables
+        """
+        index = self._subsample_index_columns()
+        sample_names = (
+            None
+            if self.where is None
+            else {sample.get(self.sample_index) for sample in samples}
+        )
+        filtered_tables = []
+        for table in subsample_tables:
+            rows = [
+                row
+                for row in self.project_subsamples(table)
+                if sample_names is None or row.get(self.sample_index) in sample_names
+            ]
+            if not rows or (
+                self.columns is not None
+                and not any(column not in index for row in rows for column in row)
+            ):
+                continue
+            filtered_tables.append(rows)
+        return filtered_tables
+
+    def _subsample_index_columns(self) -> List[str]:
+        return list(dict.fromkeys([self.sample_index, *self.subsample_index]))
+
+    def _sample_columns(self) -> Optional[List[str]]:
+        return self._columns_to_keep([self.sample_index])
+
+    def _subsample_columns(self) -> Optional[List[str]]:
+        return self._columns_to_keep(self._subsample_index_columns())
+
+    def _columns_to_keep(self, index: List[str]) -> Optional[List[str]]:
+        if self.columns is None:
+            return None
+        return list(dict.fromkeys([*index, *self.columns]))
+
+
+def filter_project(project: dict, project_filter: ProjectFilter) -> dict:
+    """
+    Filter sample and subsample tables of raw project held in memory
+
+    :param project: raw project dict with peppy keys
+    :param project_filter: columns and condition of samples to keep
+    :return: new raw project with filtered tables. Config is not copied
+    """
+    project_filter.set_config(project.get(CONFIG_KEY))
+    samples = project_filter.filter_samples(project.get(SAMPLE_RAW_DICT_KEY) or [])
+    subsamples = project.get(SUBSAMPLE_RAW_LIST_KEY)
+    return {
+        **project,
+        SAMPLE_RAW_DICT_KEY: samples,
+        SUBSAMPLE_RAW_LIST_KEY: (
+            project_filter.filter_subsamples(subsamples, samples)
+            if subsamples
+            else subsamples
+        ),
+    }
+
+
+def read_project(chunks: Iterable[bytes], project_filter: ProjectFilter) -> dict:
+    """
+    Parse raw project streamed from PEPhub, filtering sample and subsample tables
+    row by row, so that only kept columns of kept samples are stored in memory.
+    Tables that come before the config (as written by peppy) are projected with
+    default index columns (sample_name, subsample_name). If config sets other index
+    columns, that were not selected, DroppedIndexColumnsError is raised, and project
+    has to be read again with these columns selected.
+
+    :param chunks: byte chunks of raw project in JSON format
+    :param project_filter: columns and condition of samples to keep
+    :raise DroppedIndexColumnsError: if index columns set in config were dropped
+    :return: raw project dict, with keys as in the response
+    """
+    stream = JSONStream(chunks)
+
+    def iter_rows() -> Iterator[Any]:
+        for _ in stream.iter_array():
+            yield stream.read_value()
+
+    project = {}
+    config_read = False
+    samples_key = subsamples_key = None
+    # tables read before config keep columns of default index columns
+    default_columns = {
+        "samples": project_filter._sample_columns(),
+        "subsamples": project_filter._subsample_columns(),
+    }
+    read_before_config = set()
+    for key in stream.iter_object_keys():
+        if key in _CONFIG_KEYS:
+            project[key] = stream.read_value()
+            project_filter.set_config(project[key])
+            config_read = True
+        elif key in _SAMPLE_KEYS:
+            samples_key = key
+            if not config_read:
+                read_before_config.add("samples")
+            project[key] = project_filter.filter_samples(iter_rows())
+        elif key in _SUBSAMPLE_KEYS and stream.peek() == "[":
+            subsamples_key = key
+            if not config_read:
+                read_before_config.add("subsamples")
+            project[key] = [
+                project_filter.project_subsamples(iter_rows())
+                for _ in stream.iter_array()
+            ]
+        else:
+            project[key] = stream.read_value()
+
+    if samples_key is None:
+        raise ResponseError("Incorrect project in response: samples missing.")
+    columns = {
+        "samples": project_filter._sample_columns(),
+        "subsamples": project_filter._subsample_columns(),
+    }
+    dropped = [
+        column
+        for table in read_before_config
+        if columns[table] is not None
+        for column in columns[table]
+        if column not in default_columns[table]
+    ]
+    if dropped:
+        raise DroppedIndexColumnsError(sorted(set(dropped)))
+    if "samples" in read_before_config:
+        # default index columns, that are not index columns of the project
+        project[samples_key] = project_filter.project_samples(project[samples_key])
+    if subsamples_key is not None:
+        # rows are matched with samples when all samples are known
+        project[subsamples_key] = project_filter.filter_subsamples(
+            project[subsamples_key], project[samples_key]
+        )
+    return project
+
+
+class CSVTableWriter:
+    """
+    Writer of csv table with columns not known in advance.
+
+    Rows are spooled to temporary file (one JSON line per row), while union of columns
+    is collected. Table is written, with columns in order of first appearance,
+    when all rows are known.
+    """
+
+    def __init__(self, path: str):
+        """
+        :param path: path of the csv file
+        """
+        self.path = path
+        self._columns = {}
+        self._spool = tempfile.TemporaryFile(
+            "w+", encoding="utf-8", dir=os.path.dirname(path) or None
+        )
+
+    def add_row(self, row: dict, raw_row: Optional[str] = None) -> None:
+        """
+        Add row to the table
+
+        :param row: row as dict (column name -> value)
+        :param raw_row: row as JSON text, if known (saves encoding it again)
+        """
+        if not isinstance(row, dict):
+            raise ResponseError(f"Incorrect table row in response: {row}")
+        for column in row:
+            if column not in self._columns:
+                self._columns[column] = None
+        if raw_row is None:
+            raw_row = json.dumps(row)
+        else:
+            # new lines in JSON text can only be whitespaces between tokens
+            raw_row = raw_row.replace("\n", " ").replace("\r", " ")
+        self._spool.write(raw_row)
+        self._spool.write("\n")
+
+    def write(self) -> None:
+        """
+        Write csv file and remove spooled rows
+        """
+        try:
+            self._spool.seek(0)
+            with open(self.path, "w", newline="", encoding="utf-8") as csv_file:
+                columns = list(self._columns)
+                writer = csv.writer(csv_file, lineterminator=os.linesep)
+                writer.writerow(columns)
+                for line in self._spool:
+                    row = json.loads(line)
+                    writer.writerow([row.get(column) for column in columns])
+        finally:
+            self._spool.close()
+
+    def close(self) -> None:
+        """
+        Remove spooled rows without writing the table
+        """
+        self._spool.close()
+
+
+def write_project_tables(chunks: Iterable[bytes], folder_path: str) -> dict:
+    """
+    Parse raw project streamed from PEPhub and write its sample table and
+    subsample tables to folder, row by row.
+
+    :param chunks: byte chunks of raw project in JSON format
+    :param folder_path: folder where tables are written
+    :return: project config, with sample and subsample table file names
+    """
+    stream = JSONStream(chunks)
+    config = None
+    sample_table_written = False
+    subsample_tables: List[str] = []
+    writer: Optional[CSVTableWriter] = None
+
+    try:
+        for key in stream.iter_object_keys():
+            if key in _CONFIG_KEYS:
+                config = stream.read_value()
+            elif key in _SAMPLE_KEYS:
+                writer = CSVTableWriter(
+                    os.path.join(folder_path, SAMPLE_TABLE_FILE_NAME)
+                )
+                for _ in stream.iter_array():
+                    writer.add_row(*stream.read_raw_value())
+                writer.write()
+                sample_table_written = True
+            elif key in _SUBSAMPLE_KEYS and stream.peek() == "[":
+                for number, _ in enumerate(stream.iter_array(), start=1):
+                    file_name = SUBSAMPLE_TABLE_FILE_NAME.format(number=number)
+                    writer = CSVTableWriter(os.path.join(folder_path, file_name))
+                    for _ in stream.iter_array():
+                        writer.add_row(*stream.read_raw_value())
+                    writer.write()
+                    subsample_tables.append(file_name)
+            else:
+                stream.read_value()
+    finally:
+        if writer:
+            writer.close()
+
+    if not isinstance(config, dict) or not sample_table_written:
+        raise ResponseError("Incorrect project in response: config or samples missing.")
+
+    config["sample_table"] = SAMPLE_TABLE_FILE_NAME
+    config["subsample_table"] = subsample_tables
+    return config
@@ -0,0 +1,113 @@
+from typing import Optional
+from urllib.parse import urlencode
+
+from pydantic import ValidationError
+from ubiquerg import parse_registry_path
+
+from pephubclient.constants import (
+    PEPHUB_PEP_API_BASE_URL,
+    PEPHUB_PEP_SEARCH_URL,
+    PEPHUB_PUSH_URL,
+    PEPHUB_SAMPLE_URL,
+    PEPHUB_VIEW_SAMPLE_URL,
+    PEPHUB_VIEW_URL,
+)
+from pephubclient.exceptions import IncorrectQueryStringError
+from pephubclient.models import RegistryPath
+
+
+def parse_project_registry_path(registry_path: str) -> RegistryPath:
+    """
+    Parse provided registry path to extract namespace, project name and tag.
+
+    :param registry_path: Passed by user. Contain information needed to locate the project.
+    :return: Parsed registry path.
+    """
+    try:
+        return RegistryPath(**parse_registry_path(registry_path))
+    except (ValidationError, TypeError):
+        raise IncorrectQueryStringError(query_string=registry_path)
+
+
+def build_pull_request_url(
+    registry_path: RegistryPath, query_param: Optional[dict] = None
+) -> str:
+    """
+    Build request for getting projects form pephub
+
+    :param registry_path: parsed registry path of the project
+    :param query_param: dict of parameters used in query string
+    :return: url string
+    """
+    query_param = dict(query_param or {})
+    query_param["tag"] = registry_path.tag
+
+    endpoint = registry_path.namespace + "/" + registry_path.item
+    endpoint += "?" + urlencode(query_param)
+
+    return PEPHUB_PEP_API_BASE_URL + endpoint
+
+
+def build_project_search_url(namespace: str, query_param: Optional[dict] = None) -> str:
+    """
+    Build request for searching projects form pephub
+
+    :param namespace: searched namespace
+    :param query_param: dict of parameters used in query string
+    :return: url string
+    """
+    return (
+        PEPHUB_PEP_SEARCH_URL.format(namespace=namespace)
+        + "?"
+        + urlencode(query_param or {})
+    )
+
+
+def build_push_request_url(namespace: str) -> str:
+    """
+    Build project uplaod request used in pephub
+
+    :param namespace: namespace where project will be uploaded
+    :return: url string
+    """
+    return PEPHUB_PUSH_URL.format(namespace=namespace)
+
+
+def build_view_request_url(
+    namespace: str, name: str, view_name: str, sample_name: Optional[str] = None
+) -> str:
+    """
+    Build URL for view request.
+
+    :param namespace: namespace of project
+    :param name: name of project
+    :param view_name: name of view
+    :param sample_name: name of sample in the view
+    :return: URL
+    """
+    if sample_name:
+        return PEPHUB_VIEW_SAMPLE_URL.format(
+            namespace=namespace,
+            project=name,
+            view_name=view_name,
+            sample_name=sample_name,
+        )
+    return PEPHUB_VIEW_URL.format(
+        namespace=namespace,
+        project=name,
+        view_name=view_name,
+    )
+
+
+def build_sample_request_url(namespace: str, name: str, sample_name: str) -> str:
+    """
+    Build url for sample request.
+
+    :param namespace: namespace of project
+    :param name: name of project
+    :param sample_name: name of sample
+    :return: url string
+    """
+    return PEPHUB_SAMPLE_URL.format(
+        namespace=namespace, project=name, sample_name=sample_name
+    )
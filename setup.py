@@ -25,6 +25,12 @@ def read_reqs(reqs_name):
 
 
 extra["install_requires"] = read_reqs("all")
+extra["extras_require"] = {
+    "async": read_reqs("async"),
+    "fast": read_reqs("fast"),
+    "validation": read_reqs("validation"),
+    "arrow": read_reqs("arrow"),
+}
 
 with open("README.md") as f:
     long_description = f.read()
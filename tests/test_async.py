@@ -0,0 +1,175 @@
+import asyncio
+import os
+import subprocess
+import sys
+from unittest.mock import Mock
+
+import pytest
+
+pytest.importorskip("httpx")
+
+from pephubclient.aio import AsyncPEPHubClient  # noqa: E402
+from pephubclient.exceptions import ResponseError  # noqa: E402
+
+SAMPLE_PEP = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)),
+    "data",
+    "sample_pep",
+    "subsamp_config.yaml",
+)
+
+
+async def _with_client(func):
+    async with AsyncPEPHubClient() as client:
+        return await func(client)
+
+
+class TestAsyncClient:
+    def test_modules_share_client_pool(self):
+        async def check(client):
+            assert client.view.client is client.client
+            assert client.sample.client is client.client
+            assert client.schema.client is client.client
+
+        asyncio.run(_with_client(check))
+
+    def test_import_does_not_load_sync_client(self):
+        code = (
+            "import sys, pephubclient.aio; "
+            "print(' '.join(m for m in ('pephubclient.pephubclient', 'coloredlogs') "
+            "if m in sys.modules))"
+        )
+        result = subprocess.run(
+            [sys.executable, "-c", code], capture_output=True, text=True, check=True
+        )
+
+        assert result.stdout.strip() == ""
+
+    def test_load_raw_pep(self, mocker, test_raw_pep_return):
+        requests_mock = mocker.patch(
+            "httpx.AsyncClient.request",
+            return_value=Mock(status_code=200),
+        )
+        mocker.patch(
+            "pephubclient.helpers.RequestManager.decode_response",
+            return_value=test_raw_pep_return,
+        )
+
+        raw_pep = asyncio.run(
+            _with_client(lambda client: client.load_raw_pep("some/project"))
+        )
+
+        assert requests_mock.called
+        assert raw_pep["_config"]["name"] == "sample name"
+        assert len(raw_pep["_sample_dict"]) == 3
+
+    def test_concurrent_loads(self, mocker, test_raw_pep_return):
+        requests_mock = mocker.patch(
+            "httpx.AsyncClient.request",
+            return_value=Mock(status_code=200),
+        )
+        mocker.patch(
+            "pephubclient.helpers.RequestManager.decode_response",
+            return_value=test_raw_pep_return,
+        )
+
+        async def load_many(client):
+            return await asyncio.gather(
+                *[client.load_raw_pep(f"namespace/project{i}") for i in range(20)]
+            )
+
+        projects = asyncio.run(_with_client(load_many))
+
+        assert len(projects) == 20
+        assert requests_mock.call_count == 20
+        urls = {call.kwargs["url"] for call in requests_mock.call_args_list}
+        assert len(urls) == 20
+
+    @pytest.mark.parametrize(
+        "status_code, expected_error_message",
+        [
+            (404, "File does not exist, or you are unauthorized."),
+            (500, "Internal server error. Unexpected return value. Error: 500"),
+        ],
+    )
+    def test_load_raw_pep_error_response(
+        self, mocker, status_code, expected_error_message
+    ):
+        mocker.patch(
+            "httpx.AsyncClient.request",
+            return_value=Mock(status_code=status_code),
+        )
+        with pytest.raises(ResponseError, match=expected_error_message):
+            asyncio.run(
+                _with_client(lambda client: client.load_raw_pep("some/project"))
+            )
+
+    def test_push(self, mocker):
+        requests_mock = mocker.patch(
+            "httpx.AsyncClient.request", return_value=Mock(status_code=202)
+        )
+        asyncio.run(
+            _with_client(
+                lambda client: client.push(SAMPLE_PEP, namespace="s_name", name="name")
+            )
+        )
+
+        assert requests_mock.called
+
+    def test_sample_get(self, mocker):
+        return_value = {"sample_name": "gg1", "genome": "phc_test1"}
+        mocker.patch("httpx.AsyncClient.request", return_value=Mock(status_code=200))
+        mocker.patch(
+            "pephubclient.helpers.RequestManager.decode_response",
+            return_value=return_value,
+        )
+        sample = asyncio.run(
+            _with_client(
+                lambda client: client.sample.get(
+                    "test_namespace", "taest_name", "default", "gg1"
+                )
+            )
+        )
+
+        assert sample == return_value
+
+    def test_view_create_drops_none_params(self, mocker):
+        requests_mock = mocker.patch(
+            "httpx.AsyncClient.request", return_value=Mock(status_code=202)
+        )
+        asyncio.run(
+            _with_client(
+                lambda client: client.view.create(
+                    "test_namespace",
+                    "taest_name",
+                    "default",
+                    "gg1",
+                    sample_list=["sample1", "sample2"],
+                )
+            )
+        )
+
+        assert requests_mock.call_args.kwargs["params"] == {"no_fail": False}
+
+    @pytest.mark.parametrize(
+        "status_code, expected_error_message",
+        [
+            (404, "Schema doesn't exist in PEPhub"),
+            (401, "User not authorized"),
+            (500, "Unexpected error. Status code: 500"),
+        ],
+    )
+    def test_schema_delete_error_response(
+        self, mocker, status_code, expected_error_message
+    ):
+        mocker.patch(
+            "httpx.AsyncClient.request", return_value=Mock(status_code=status_code)
+        )
+        with pytest.raises(ResponseError, match=expected_error_message):
+            asyncio.run(
+                _with_client(
+                    lambda client: client.schema.delete_schema(
+                        namespace="databio", schema_name="pep"
+                    )
+                )
+            )
@@ -0,0 +1,363 @@
+import copy
+import datetime
+import os
+from concurrent.futures import ProcessPoolExecutor
+from unittest.mock import Mock
+
+import pytest
+
+from pephubclient.cache import ProjectCache
+from pephubclient.constants import MIRROR_STATE_FILE_NAME
+from pephubclient.exceptions import LocalDataNotFoundError, StaleDataWarning
+from pephubclient.helpers import save_pep
+from pephubclient.models import MirroredProject, MirrorState, ProjectDict
+from pephubclient.pephubclient import PEPHubClient
+
+ANNOTATION = {
+    "namespace": "namespace",
+    "name": "project",
+    "tag": "default",
+    "is_private": False,
+    "number_of_samples": 3,
+    "description": "desc",
+    "last_update_date": "2023-08-27 19:07:31.552861+00:00",
+    "submission_date": "2023-08-27 19:07:31.552858+00:00",
+    "digest": "08cbcdbf4974fc84bee824c562b324b5",
+}
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return ProjectCache(cache_dir=str(tmp_path / "cache"))
+
+
+@pytest.fixture
+def pephub_mock(mocker, test_raw_pep_return):
+    annotation = copy.deepcopy(ANNOTATION)
+
+    def request(method, url, **kwargs):
+        if "/annotation" in url:
+            return Mock(status_code=200, json=Mock(return_value=annotation))
+        return Mock(
+            status_code=200,
+            json=Mock(return_value=copy.deepcopy(test_raw_pep_return)),
+        )
+
+    request_mock = mocker.patch("requests.Session.request", side_effect=request)
+    request_mock.annotation = annotation
+    return request_mock
+
+
+def _fill_cache(cache_dir: str, worker: int) -> None:
+    cache = ProjectCache(cache_dir=cache_dir)
+    for number in range(10):
+        cache.set(f"namespace/project{worker}_{number}:default", "digest", {"a": 1})
+
+
+def _project_requests(request_mock) -> int:
+    return len(
+        [
+            call
+            for call in request_mock.call_args_list
+            if "/annotation" not in call.kwargs["url"]
+        ]
+    )
+
+
+class TestProjectCache:
+    def test_set_get(self, cache, test_raw_pep_return):
+        cache.set("namespace/project:default", "digest1", test_raw_pep_return)
+
+        assert cache.get("namespace/project:default") == test_raw_pep_return
+        assert (
+            cache.get("namespace/project:default", digest="digest1")
+            == test_raw_pep_return
+        )
+        assert cache.get_digest("namespace/project:default") == "digest1"
+
+    def test_digest_mismatch(self, cache, test_raw_pep_return):
+        cache.set("namespace/project:default", "digest1", test_raw_pep_return)
+
+        assert cache.get("namespace/project:default", digest="digest2") is None
+
+    def test_missing_key(self, cache):
+        assert cache.get("namespace/project:default") is None
+
+    def test_shared_between_instances(self, cache, test_raw_pep_return):
+        cache.set("namespace/project:default", "digest1", test_raw_pep_return)
+        other_cache = ProjectCache(cache_dir=cache.cache_dir)
+
+        assert other_cache.get("namespace/project:default") == test_raw_pep_return
+
+    def test_concurrent_processes(self, cache):
+        with ProcessPoolExecutor(max_workers=4) as executor:
+            list(executor.map(_fill_cache, [cache.cache_dir] * 4, range(4)))
+
+        for worker in range(4):
+            for number in range(10):
+                assert cache.get(f"namespace/project{worker}_{number}:default") == {
+                    "a": 1
+                }
+
+    def test_lru_eviction(self, cache, test_raw_pep_return):
+        cache.set("namespace/project1:default", "digest", test_raw_pep_return)
+        cache.max_size = cache.size * 2
+        cache.set("namespace/project2:default", "digest", test_raw_pep_return)
+        # project1 becomes most recently used
+        cache.get("namespace/project1:default")
+        cache.set("namespace/project3:default", "digest", test_raw_pep_return)
+
+        assert cache.get("namespace/project1:default") is not None
+        assert cache.get("namespace/project2:default") is None
+        assert cache.get("namespace/project3:default") is not None
+        assert cache.size <= cache.max_size
+
+    def test_hits_are_not_written_at_once(self, mocker, cache, test_raw_pep_return):
+        cache.set("namespace/project:default", "digest", test_raw_pep_return)
+        write_mock = mocker.spy(cache, "_write_index")
+
+        for _ in range(3):
+            assert cache.get("namespace/project:default") is not None
+        assert not write_mock.called
+
+        cache.flush()
+        assert write_mock.call_count == 1
+        assert cache._read_index()["namespace/project:default"]["last_access"] > (
+            cache._read_index()["namespace/project:default"]["stored_at"]
+        )
+
+    def test_replaced_entry_is_not_removed(self, cache, test_raw_pep_return):
+        key = "namespace/project:default"
+        cache.set(key, "digest1", test_raw_pep_return)
+        with cache._lock:
+            old_entry = cache._read_index()[key]
+        # other process replaced the entry after it was read
+        cache.set(key, "digest2", test_raw_pep_return)
+
+        cache._remove_entry(key, old_entry)
+        assert cache.get(key, digest="digest2") == test_raw_pep_return
+
+        cache._remove_entry(key, cache._read_index()[key])
+        assert cache.get(key) is None
+
+    def test_project_larger_than_cache(self, tmp_path, test_raw_pep_return):
+        cache = ProjectCache(cache_dir=str(tmp_path), max_size=10)
+        cache.set("namespace/project:default", "digest", test_raw_pep_return)
+
+        assert cache.get("namespace/project:default") is None
+
+    def test_clear(self, cache, test_raw_pep_return):
+        cache.set("namespace/project:default", "digest", test_raw_pep_return)
+        cache.clear()
+
+        assert cache.get("namespace/project:default") is None
+        assert cache.size == 0
+
+
+class TestClientCache:
+    def test_cached_project_is_served(self, pephub_mock, cache, test_raw_pep_return):
+        client = PEPHubClient(cache=cache)
+
+        first = client.load_raw_pep("namespace/project")
+        second = client.load_raw_pep("namespace/project")
+
+        assert first == second
+        assert first["_sample_dict"] == test_raw_pep_return["sample_list"]
+        assert _project_requests(pephub_mock) == 1
+
+    def test_changed_digest_downloads_project(self, pephub_mock, cache):
+        client = PEPHubClient(cache=cache)
+
+        client.load_raw_pep("namespace/project")
+        pephub_mock.annotation["digest"] = "new_digest"
+        client.load_raw_pep("namespace/project")
+
+        assert _project_requests(pephub_mock) == 2
+        assert cache.get_digest("namespace/project:default") == "new_digest"
+
+    def test_query_param_bypasses_cache(self, pephub_mock, cache):
+        client = PEPHubClient(cache=cache)
+
+        client.load_raw_pep("namespace/project", query_param={"limit": 1})
+        client.load_raw_pep("namespace/project", query_param={"limit": 1})
+
+        assert _project_requests(pephub_mock) == 2
+        assert cache.size == 0
+
+    def test_no_cache(self, pephub_mock):
+        client = PEPHubClient()
+
+        client.load_raw_pep("namespace/project")
+        client.load_raw_pep("namespace/project")
+
+        assert pephub_mock.call_count == 2
+
+
+class TestOfflineMode:
+    @pytest.fixture
+    def mirror_dir(self, tmp_path, test_raw_pep_return):
+        mirror_dir = tmp_path / "mirror"
+        mirror_dir.mkdir()
+        project = ProjectDict.to_raw_dict(test_raw_pep_return)
+        project["_config"]["name"] = "project"
+        save_pep(
+            project,
+            reg_path="namespace/project:default",
+            project_path=str(mirror_dir),
+        )
+        state = MirrorState(
+            namespace="namespace",
+            last_sync=datetime.datetime.now(datetime.timezone.utc)
+            - datetime.timedelta(hours=5),
+            projects={
+                "project:default": MirroredProject(
+                    digest="digest",
+                    last_update_date="2026-01-01T00:00:00Z",
+                    path="/moved/namespace_project_default",
+                )
+            },
+        )
+        with open(mirror_dir / MIRROR_STATE_FILE_NAME, "w") as f:
+            f.write(state.model_dump_json())
+        return str(mirror_dir)
+
+    def test_cached_project_is_served_offline(self, pephub_mock, cache):
+        project = PEPHubClient(cache=cache).load_raw_pep("namespace/project")
+        pephub_mock.reset_mock()
+
+        with pytest.warns(StaleDataWarning, match="local cache") as record:
+            offline_project = PEPHubClient(cache=cache, mode="offline").load_raw_pep(
+                "namespace/project"
+            )
+
+        assert offline_project == project
+        assert not pephub_mock.called
+        assert 0 <= record[0].message.age < 60
+
+    def test_offline_without_local_data(self, pephub_mock, cache):
+        client = PEPHubClient(cache=cache, mode="offline")
+
+        with pytest.raises(LocalDataNotFoundError, match="namespace/project:default"):
+            client.load_project("namespace/project")
+        assert not pephub_mock.called
+
+    def test_query_param_is_never_served_offline(self, pephub_mock, cache):
+        PEPHubClient(cache=cache).load_raw_pep("namespace/project")
+
+        with pytest.raises(LocalDataNotFoundError):
+            PEPHubClient(cache=cache, mode="offline").load_raw_pep(
+                "namespace/project", query_param={"limit": 1}
+            )
+
+    def test_prefer_local_falls_back_to_pephub(self, pephub_mock, cache):
+        client = PEPHubClient(cache=cache, mode="prefer-local")
+
+        client.load_raw_pep("namespace/project")
+        assert _project_requests(pephub_mock) == 1
+
+        pephub_mock.reset_mock()
+        with pytest.warns(StaleDataWarning):
+            client.load_raw_pep("namespace/project")
+        # digest is not checked either
+        assert not pephub_mock.called
+
+    def test_mode_from_environment(self, monkeypatch, mirror_dir):
+        monkeypatch.setenv("PEPHUB_CLIENT_MODE", "offline")
+        monkeypatch.setenv("PEPHUB_MIRROR_DIRS", mirror_dir)
+        client = PEPHubClient()
+
+        assert client.mode == "offline"
+        with pytest.warns(StaleDataWarning, match="downloaded 5h 0m ago"):
+            client.load_raw_pep("namespace/project")
+
+    def test_project_is_served_from_mirror(
+        self, pephub_mock, mirror_dir, test_raw_pep_return
+    ):
+        client = PEPHubClient(mode="offline", mirror_dirs=[mirror_dir])
+
+        with pytest.warns(StaleDataWarning, match="mirror") as record:
+            project = client.load_project("namespace/project")
+
+        assert not pephub_mock.called
+        assert record[0].message.age == pytest.approx(5 * 3600, abs=60)
+        assert list(project.sample_table["sample_name"]) == [
+            sample["sample_name"] for sample in test_raw_pep_return["sample_list"]
+        ]
+        with pytest.raises(LocalDataNotFoundError):
+            client.load_project("other_namespace/project")
+
+    def test_raw_project_is_served_from_mirror(
+        self, pephub_mock, mirror_dir, test_raw_pep_return
+    ):
+        state_path = os.path.join(mirror_dir, MIRROR_STATE_FILE_NAME)
+        with open(state_path) as f:
+            state = MirrorState.model_validate_json(f.read())
+        state.projects["project:default"].downloaded_at = datetime.datetime.now(
+            datetime.timezone.utc
+        ) - datetime.timedelta(hours=2)
+        with open(state_path, "w") as f:
+            f.write(state.model_dump_json())
+        client = PEPHubClient(mode="offline", mirror_dirs=[mirror_dir])
+
+        with pytest.warns(StaleDataWarning, match="downloaded 2h 0m ago"):
+            project = client.load_raw_pep("namespace/project")
+
+        expected = ProjectDict.to_raw_dict(copy.deepcopy(test_raw_pep_return))
+        expected["_config"]["name"] = "project"
+        assert project == expected
+
+    def test_view_is_served_offline(self, mocker, cache, test_raw_pep_return):
+        request_mock = mocker.patch(
+            "requests.Session.request",
+            return_value=Mock(
+                status_code=200, json=Mock(return_value=test_raw_pep_return)
+            ),
+        )
+        view = PEPHubClient(cache=cache, mode="prefer-local").view.get(
+            "namespace", "project", "default", "view1", raw=True
+        )
+        request_mock.reset_mock()
+
+        offline_client = PEPHubClient(cache=cache, mode="offline")
+        with pytest.warns(StaleDataWarning, match="View 'view1'"):
+            assert (
+                offline_client.view.get(
+                    "namespace", "project", "default", "view1", raw=True
+                )
+                == view
+            )
+        assert not request_mock.called
+        with pytest.raises(LocalDataNotFoundError):
+            offline_client.view.get("namespace", "project", "default", "view2")
+
+    def test_online_view_is_not_cached(self, mocker, cache, test_raw_pep_return):
+        mocker.patch(
+            "requests.Session.request",
+            return_value=Mock(
+                status_code=200, json=Mock(return_value=test_raw_pep_return)
+            ),
+        )
+        PEPHubClient(cache=cache).view.get(
+            "namespace", "project", "default", "view1", raw=True
+        )
+
+        with pytest.raises(LocalDataNotFoundError):
+            PEPHubClient(cache=cache, mode="offline").view.get(
+                "namespace", "project", "default", "view1"
+            )
+
+    def test_prefer_local_modifications_use_pephub(self, pephub_mock, cache):
+        client = PEPHubClient(cache=cache, mode="prefer-local")
+        client.load_raw_pep("namespace/project")
+        pephub_mock.reset_mock()
+
+        pep_dict = {
+            "_config": {"name": "project", "description": "changed"},
+            "_sample_dict": [],
+        }
+        assert not client._upload_incremental(
+            pep_dict, "namespace", "default", "sample_name"
+        )
+
+        # cached copy is used only after its digest is checked in PEPhub
+        assert pephub_mock.called
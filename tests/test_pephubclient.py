@@ -1,11 +1,43 @@
+import base64
+import copy
+import datetime
+import json
 import os
+import subprocess
+import sys
+import threading
+import time
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from unittest.mock import Mock
+from urllib.parse import parse_qs, urlparse
 
+import pandas as pd
+import peppy
 import pytest
+import requests
+import yaml
+from pydantic import ValidationError
+from urllib3.exceptions import MaxRetryError, NewConnectionError
 
-from pephubclient.exceptions import ResponseError
+from pephubclient.exceptions import JWTExpiredError, ResponseError
+from pephubclient.files_manager import FilesManager
+from pephubclient.instrumentation import RequestHook, get_url_template
+from pephubclient.models import (
+    ProjectAnnotationModel,
+    ProjectDict,
+    RetryPolicy,
+    TokenExpiryPolicy,
+)
 from pephubclient.pephubclient import PEPHubClient
-from pephubclient.helpers import is_registry_path
+from pephubclient.helpers import (
+    RequestManager,
+    compute_sample_diff,
+    get_jwt_expiration,
+    is_registry_path,
+    save_pep,
+)
 
 SAMPLE_PEP = os.path.join(
     os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
@@ -22,7 +54,7 @@ class TestSmoke:
         Test if device login request was sent to pephub
         """
         requests_mock = mocker.patch(
-            "requests.request",
+            "requests.Session.request",
             return_value=Mock(content=device_code_return, status_code=200),
         )
         pephub_response_mock = mocker.patch(
@@ -57,7 +89,7 @@ class TestSmoke:
             return_value=test_jwt,
         )
         requests_mock = mocker.patch(
-            "requests.request",
+            "requests.Session.request",
             return_value=Mock(content="some return", status_code=200),
         )
         mocker.patch(
@@ -79,6 +111,46 @@ class TestSmoke:
         assert save_yaml_mock.called
         assert save_sample_mock.called
 
+    def test_pull_many(self, mocker, test_raw_pep_return, tmp_path):
+        requests_mock = mocker.patch(
+            "requests.Session.request",
+            return_value=Mock(status_code=200),
+        )
+        mocker.patch(
+            "pephubclient.helpers.RequestManager.decode_response",
+            side_effect=lambda *args, **kwargs: copy.deepcopy(test_raw_pep_return),
+        )
+        progress = []
+
+        results = PEPHubClient().pull_many(
+            ["namespace/project1", "namespace/project2", "bad/registry/path"],
+            jobs=2,
+            output=str(tmp_path),
+            progress=progress.append,
+        )
+
+        assert [result.registry_path for result in results] == [
+            "namespace/project1",
+            "namespace/project2",
+            "bad/registry/path",
+        ]
+        assert [result.success for result in results] == [True, True, False]
+        assert results[2].error
+        assert len(progress) == 3
+        assert requests_mock.call_count == 2
+        assert (tmp_path / "namespace_project1_default" / "sample_table.csv").is_file()
+        assert (tmp_path / "namespace_project2_default" / "sample_table.csv").is_file()
+
+    def test_pull_many_deduplicates_paths(self, mocker, test_raw_pep_return):
+        pull_mock = mocker.patch("pephubclient.pephubclient.PEPHubClient.pull")
+
+        results = PEPHubClient().pull_many(
+            ["namespace/project1", "namespace/project1"], jobs=2
+        )
+
+        assert len(results) == 1
+        assert pull_mock.call_count == 1
+
     @pytest.mark.parametrize(
         "status_code, expected_error_message",
         [
@@ -100,7 +172,7 @@ class TestSmoke:
             return_value=test_jwt,
         )
         mocker.patch(
-            "requests.request",
+            "requests.Session.request",
             return_value=Mock(
                 content=b'{"detail": "Some error message"}', status_code=status_code
             ),
@@ -113,7 +185,7 @@ class TestSmoke:
 
     def test_push(self, mocker, test_jwt):
         requests_mock = mocker.patch(
-            "requests.request", return_value=Mock(status_code=202)
+            "requests.Session.request", return_value=Mock(status_code=202)
         )
 
         PEPHubClient().push(
@@ -141,7 +213,9 @@ class TestSmoke:
     def test_push_with_pephub_error_response(
         self, mocker, status_code, expected_error_message
     ):
-        mocker.patch("requests.request", return_value=Mock(status_code=status_code))
+        mocker.patch(
+            "requests.Session.request", return_value=Mock(status_code=status_code)
+        )
         with pytest.raises(ResponseError, match=expected_error_message):
             PEPHubClient().push(
                 SAMPLE_PEP,
@@ -175,7 +249,7 @@ class TestSmoke:
             "can_edit": False,
         }
         mocker.patch(
-            "requests.request",
+            "requests.Session.request",
             return_value=Mock(content=return_value, status_code=200),
         )
         mocker.patch(
@@ -187,6 +261,950 @@ class TestSmoke:
         assert return_value.count == 1
         assert len(return_value.results) == 1
 
+    @pytest.fixture
+    def search_mock(self, mocker):
+        def search(method, url, **kwargs):
+            query = parse_qs(urlparse(url).query)
+            offset, limit = int(query["offset"][0]), int(query["limit"][0])
+            results = [
+                {
+                    "namespace": "namespace1",
+                    "name": f"project{number}",
+                    "tag": "default",
+                    "is_private": False,
+                    "number_of_samples": 2,
+                    "description": "None",
+                    "last_update_date": "2023-08-27 19:07:31.552861+00:00",
+                    "submission_date": "2023-08-27 19:07:31.552858+00:00",
+                    "digest": "08cbcdbf4974fc84bee824c562b324b5",
+                }
+                for number in range(offset, min(offset + limit, 25))
+            ]
+            return Mock(
+                status_code=200,
+                json=Mock(
+                    return_value={
+                        "count": 25,
+                        "limit": limit,
+                        "offset": offset,
+                        "results": results,
+                    }
+                ),
+            )
+
+        return mocker.patch("requests.Session.request", side_effect=search)
+
+    def test_iter_projects(self, search_mock):
+        projects = list(
+            PEPHubClient().iter_projects(
+                namespace="namespace1", page_size=4, prefetch=2
+            )
+        )
+
+        assert [project.name for project in projects] == [
+            f"project{number}" for number in range(25)
+        ]
+        assert search_mock.call_count == 7
+
+    def test_iter_projects_stopped_early(self, search_mock):
+        projects = PEPHubClient().iter_projects(
+            namespace="namespace1", page_size=4, prefetch=2
+        )
+        next(projects)
+        projects.close()
+
+        assert search_mock.call_count <= 3
+
+    def test_iter_projects_error(self, mocker):
+        mocker.patch("requests.Session.request", return_value=Mock(status_code=500))
+
+        with pytest.raises(ResponseError):
+            list(PEPHubClient().iter_projects(namespace="namespace1"))
+
+
+class TestThreadSafety:
+    def test_concurrent_loads_of_different_projects(self, mocker, test_raw_pep_return):
+        def request(method, url, **kwargs):
+            # project name is echoed back in config, so every answer can be verified
+            project = copy.deepcopy(test_raw_pep_return)
+            project["config"]["name"] = urlparse(url).path.rsplit("/", 1)[-1]
+            project["config"]["tag"] = parse_qs(urlparse(url).query)["tag"][0]
+            return Mock(status_code=200, json=Mock(return_value=project))
+
+        mocker.patch("requests.Session.request", side_effect=request)
+        client = PEPHubClient()
+        registry_paths = [
+            f"namespace/project{number}:tag{number}" for number in range(200)
+        ]
+
+        with ThreadPoolExecutor(max_workers=16) as executor:
+            projects = list(executor.map(client.load_raw_pep, registry_paths))
+
+        for number, project in enumerate(projects):
+            assert project["_config"]["name"] == f"project{number}"
+            assert project["_config"]["tag"] == f"tag{number}"
+
+    def test_query_param_is_not_modified(self, mocker, test_raw_pep_return):
+        mocker.patch(
+            "requests.Session.request",
+            return_value=Mock(
+                status_code=200, json=Mock(return_value=test_raw_pep_return)
+            ),
+        )
+        query_param = {"limit": 1}
+
+        PEPHubClient().load_raw_pep("namespace/project", query_param=query_param)
+
+        assert query_param == {"limit": 1}
+
+    def test_logout_updates_modules(self, mocker, test_jwt):
+        mocker.patch(
+            "pephubclient.files_manager.FilesManager.load_jwt_data_from_file",
+            return_value=test_jwt,
+        )
+        mocker.patch("pephubclient.files_manager.FilesManager.delete_file_if_exists")
+        client = PEPHubClient()
+        client.logout()
+
+        assert client.view._PEPHubView__jwt_data is None
+        assert client.sample._PEPHubSample__jwt_data is None
+        assert client.schema._PEPHubSchema__jwt_data is None
+
+
+class TestCoalescing:
+    @staticmethod
+    def run_concurrently(function, number_of_threads: int = 8) -> list:
+        barrier = threading.Barrier(number_of_threads)
+
+        def call(_):
+            barrier.wait()
+            try:
+                return function()
+            except Exception as err:
+                return err
+
+        with ThreadPoolExecutor(max_workers=number_of_threads) as executor:
+            return list(executor.map(call, range(number_of_threads)))
+
+    @pytest.fixture
+    def slow_request(self, mocker):
+        def slow_request(response=None, error=None):
+            def request(method, url, **kwargs):
+                # long enough for all threads to join the request in flight
+                time.sleep(0.2)
+                if error:
+                    raise error
+                return response
+
+            return mocker.patch("requests.Session.request", side_effect=request)
+
+        return slow_request
+
+    def test_identical_reads_are_sent_once(self, slow_request, test_raw_pep_return):
+        request_mock = slow_request(
+            Mock(status_code=200, content=json.dumps(test_raw_pep_return).encode())
+        )
+        client = PEPHubClient()
+
+        projects = self.run_concurrently(
+            lambda: client.load_raw_pep("namespace/project:tag")
+        )
+
+        assert request_mock.call_count == 1
+        assert all(project == projects[0] for project in projects)
+        # every caller gets its own decoded project
+        assert len({id(project) for project in projects}) == len(projects)
+        assert client.stats().count == 1
+
+    def test_different_reads_are_not_coalesced(self, slow_request):
+        request_mock = slow_request(Mock(status_code=200, content=b"{}"))
+        client = PEPHubClient()
+        numbers = iter(range(4))
+        lock = threading.Lock()
+
+        def get_view():
+            with lock:
+                number = next(numbers)
+            return client.view.get(
+                "databio", "pep", "default", f"view{number}", raw=True
+            )
+
+        self.run_concurrently(get_view, number_of_threads=4)
+
+        assert request_mock.call_count == 4
+
+    def test_errors_are_seen_by_every_caller(self, slow_request):
+        request_mock = slow_request(Mock(status_code=404, content=b"{}"))
+        client = PEPHubClient()
+
+        results = self.run_concurrently(
+            lambda: client.load_raw_pep("namespace/project:tag")
+        )
+        assert request_mock.call_count == 1
+        assert all(isinstance(result, ResponseError) for result in results)
+
+        request_mock = slow_request(error=requests.ConnectionError("refused"))
+        client = PEPHubClient(retry_policy=RetryPolicy(max_retries=0))
+        results = self.run_concurrently(
+            lambda: client.load_raw_pep("namespace/project:tag")
+        )
+        assert request_mock.call_count == 1
+        assert all(isinstance(result, requests.ConnectionError) for result in results)
+
+    def test_writes_are_not_coalesced(self, slow_request):
+        request_mock = slow_request(Mock(status_code=202))
+        client = PEPHubClient()
+
+        self.run_concurrently(
+            lambda: client.sample.remove("databio", "pep", "default", "s1"),
+            number_of_threads=4,
+        )
+
+        assert request_mock.call_count == 4
+
+
+class TestCli:
+    def test_cli_import_does_not_load_heavy_modules(self):
+        # fresh interpreter, modules imported by other tests are already loaded here
+        code = (
+            "import sys, pephubclient.cli; "
+            "print(' '.join(m for m in ('peppy', 'pandas', 'pydantic', 'coloredlogs') "
+            "if m in sys.modules))"
+        )
+        result = subprocess.run(
+            [sys.executable, "-c", code], capture_output=True, text=True, check=True
+        )
+
+        assert result.stdout.strip() == ""
+
+    def test_client_created_once_per_call(self, mocker):
+        from pephubclient.cli import get_client
+
+        get_client.cache_clear()
+        client_mock = mocker.patch("pephubclient.pephubclient.PEPHubClient")
+        get_client()
+        get_client()
+        get_client.cache_clear()
+
+        assert client_mock.call_count == 1
+
+    def test_missing_pyarrow_is_reported(
+        self, mocker, capsys, tmp_path, test_raw_pep_return
+    ):
+        from typer.testing import CliRunner
+
+        from pephubclient.cli import app, get_client
+
+        get_client.cache_clear()
+        mocker.patch("importlib.util.find_spec", return_value=None)
+        mocker.patch(
+            "pephubclient.pephubclient.PEPHubClient.load_raw_pep",
+            return_value=ProjectDict.to_raw_dict(test_raw_pep_return),
+        )
+        result = CliRunner().invoke(
+            app,
+            [
+                "pull",
+                "namespace/project",
+                "--format",
+                "parquet",
+                "--output",
+                str(tmp_path),
+            ],
+        )
+        get_client.cache_clear()
+
+        assert result.exception is None
+        assert "pip install pephubclient[arrow]" in (
+            capsys.readouterr().out + result.output
+        )
+
+    def test_pull_many_error_is_reported(self, mocker, capsys):
+        from typer.testing import CliRunner
+
+        from pephubclient.cli import app, get_client
+
+        get_client.cache_clear()
+        mocker.patch(
+            "pephubclient.pephubclient.PEPHubClient.pull_many",
+            side_effect=JWTExpiredError("Token expired"),
+        )
+        result = CliRunner().invoke(app, ["pull", "namespace/a", "namespace/b"])
+        get_client.cache_clear()
+
+        assert result.exit_code == 1
+        assert "Token expired" in capsys.readouterr().out + result.output
+
+
+class TestIncrementalPush:
+    @pytest.fixture
+    def remote_project(self):
+        project = peppy.Project(SAMPLE_PEP).to_dict(extended=True, orient="records")
+        project["_config"]["name"] = "name"
+        return project
+
+    @pytest.fixture
+    def request_mock(self, mocker):
+        return mocker.patch(
+            "requests.Session.request", return_value=Mock(status_code=202)
+        )
+
+    def _push(self, mocker, remote_project, cfg=SAMPLE_PEP):
+        mocker.patch(
+            "pephubclient.pephubclient.PEPHubClient._request_raw_pep",
+            return_value=remote_project,
+        )
+        PEPHubClient().push(
+            cfg, namespace="namespace", name="name", tag="default", incremental=True
+        )
+
+    @staticmethod
+    def _calls(request_mock):
+        return [
+            (call.kwargs["method"], urlparse(call.kwargs["url"]).path)
+            for call in request_mock.call_args_list
+        ]
+
+    def test_changed_sample(self, mocker, request_mock, remote_project):
+        remote_project["_sample_dict"][1]["protocol"] = "old_protocol"
+        self._push(mocker, remote_project)
+
+        assert self._calls(request_mock) == [
+            ("PATCH", "/api/v1/projects/namespace/name/samples/frog_2")
+        ]
+        assert request_mock.call_args.kwargs["json"]["protocol"] == "anySampleType"
+
+    def test_added_and_removed_samples(self, mocker, request_mock, remote_project):
+        remote_project["_sample_dict"].append(
+            dict(remote_project["_sample_dict"][0], sample_name="removed_frog")
+        )
+        added = remote_project["_sample_dict"].pop(3)
+        self._push(mocker, remote_project)
+
+        assert self._calls(request_mock) == [
+            ("DELETE", "/api/v1/projects/namespace/name/samples/removed_frog"),
+            ("POST", f"/api/v1/projects/namespace/name/samples/{added['sample_name']}"),
+        ]
+
+    def test_no_changes(self, mocker, request_mock, remote_project):
+        self._push(mocker, remote_project)
+
+        assert request_mock.call_count == 0
+
+    @pytest.mark.parametrize(
+        "change",
+        [
+            lambda project: project["_config"].update({"description": "old"}),
+            lambda project: project["_subsample_list"][0].pop(),
+            lambda project: project["_sample_dict"].reverse(),
+        ],
+    )
+    def test_full_upload(self, mocker, request_mock, remote_project, change):
+        change(remote_project)
+        self._push(mocker, remote_project)
+
+        assert self._calls(request_mock) == [
+            ("POST", "/api/v1/namespaces/namespace/projects/json")
+        ]
+        assert request_mock.call_args.kwargs["json"]["overwrite"] is True
+
+    def test_not_existing_project(self, mocker, request_mock):
+        mocker.patch(
+            "pephubclient.pephubclient.PEPHubClient._request_raw_pep",
+            side_effect=ResponseError("File does not exist, or you are unauthorized."),
+        )
+        PEPHubClient().push(
+            SAMPLE_PEP, namespace="namespace", name="name", incremental=True
+        )
+
+        assert self._calls(request_mock) == [
+            ("POST", "/api/v1/namespaces/namespace/projects/json")
+        ]
+
+
+class TestMirror:
+    @pytest.fixture
+    def namespace_mock(self, mocker):
+        namespace = {"a": "digest-a", "b": "digest-b", "c": "digest-c"}
+
+        def iter_projects(namespace_name, *args, **kwargs):
+            for name, digest in namespace.items():
+                yield ProjectAnnotationModel(
+                    namespace=namespace_name,
+                    name=name,
+                    tag="default",
+                    is_private=False,
+                    number_of_samples=1,
+                    description="",
+                    last_update_date="2026-01-01T00:00:00Z",
+                    submission_date="2026-01-01T00:00:00Z",
+                    digest=digest,
+                )
+
+        mocker.patch.object(PEPHubClient, "iter_projects", side_effect=iter_projects)
+        return namespace
+
+    @pytest.fixture
+    def pull_mock(self, mocker):
+        failing = set()
+
+        def pull(registry_path, output=None, **kwargs):
+            if registry_path in failing:
+                raise ResponseError("Internal server error.")
+            namespace, name_tag = registry_path.split("/")
+            name, tag = name_tag.split(":")
+            os.makedirs(
+                os.path.join(output, f"{namespace}_{name}_{tag}"), exist_ok=True
+            )
+
+        pull_mock = mocker.patch.object(PEPHubClient, "pull", side_effect=pull)
+        pull_mock.failing = failing
+        return pull_mock
+
+    def pulled(self, pull_mock):
+        return sorted(call.args[0] for call in pull_mock.call_args_list)
+
+    def test_first_sync(self, namespace_mock, pull_mock, tmp_path):
+        report = PEPHubClient().mirror("databio", str(tmp_path))
+
+        assert sorted(report.added) == [
+            "databio/a:default",
+            "databio/b:default",
+            "databio/c:default",
+        ]
+        assert self.pulled(pull_mock) == sorted(report.added)
+        with open(tmp_path / ".phc-mirror.json") as f:
+            state = json.load(f)
+        assert state["last_sync"] is not None
+        assert state["projects"]["a:default"]["digest"] == "digest-a"
+        assert state["projects"]["a:default"]["downloaded_at"] >= state["last_sync"]
+
+    def test_only_changed_projects_are_pulled(
+        self, namespace_mock, pull_mock, tmp_path
+    ):
+        PEPHubClient().mirror("databio", str(tmp_path))
+        pull_mock.reset_mock()
+        namespace_mock["b"] = "digest-b2"
+        namespace_mock["d"] = "digest-d"
+        del namespace_mock["c"]
+
+        report = PEPHubClient().mirror("databio", str(tmp_path))
+
+        assert self.pulled(pull_mock) == ["databio/b:default", "databio/d:default"]
+        assert report.updated == ["databio/b:default"]
+        assert report.added == ["databio/d:default"]
+        assert report.removed == ["databio/c:default"]
+        assert report.unchanged == 1
+        # removed project is kept and flagged
+        assert (tmp_path / "databio_c_default").is_dir()
+        with open(tmp_path / ".phc-mirror.json") as f:
+            assert json.load(f)["projects"]["c:default"]["removed"] is True
+
+        pull_mock.reset_mock()
+        report = PEPHubClient().mirror("databio", str(tmp_path))
+        assert not pull_mock.called
+        assert report.removed == []
+        assert report.unchanged == 3
+
+    def test_delete_removed_projects(self, namespace_mock, pull_mock, tmp_path):
+        PEPHubClient().mirror("databio", str(tmp_path))
+        del namespace_mock["c"]
+
+        report = PEPHubClient().mirror("databio", str(tmp_path), delete=True)
+
+        assert report.removed == ["databio/c:default"]
+        assert not (tmp_path / "databio_c_default").exists()
+        with open(tmp_path / ".phc-mirror.json") as f:
+            assert "c:default" not in json.load(f)["projects"]
+
+    def test_failed_project_is_retried(self, namespace_mock, pull_mock, tmp_path):
+        pull_mock.failing.add("databio/b:default")
+
+        report = PEPHubClient().mirror("databio", str(tmp_path))
+        assert [result.registry_path for result in report.failed] == [
+            "databio/b:default"
+        ]
+
+        pull_mock.failing.clear()
+        pull_mock.reset_mock()
+        report = PEPHubClient().mirror("databio", str(tmp_path))
+        assert self.pulled(pull_mock) == ["databio/b:default"]
+        assert report.added == ["databio/b:default"]
+
+    def test_missing_local_copy_is_pulled(self, namespace_mock, pull_mock, tmp_path):
+        PEPHubClient().mirror("databio", str(tmp_path))
+        os.rmdir(tmp_path / "databio_a_default")
+        pull_mock.reset_mock()
+
+        PEPHubClient().mirror("databio", str(tmp_path))
+        assert self.pulled(pull_mock) == ["databio/a:default"]
+
+    def test_relative_mirror_directory(
+        self, namespace_mock, pull_mock, tmp_path, monkeypatch
+    ):
+        (tmp_path / "first").mkdir()
+        monkeypatch.chdir(tmp_path / "first")
+        PEPHubClient().mirror("databio", "mirror")
+        # unrelated directory with the same relative name as a mirrored project
+        unrelated = tmp_path / "mirror" / "databio_c_default"
+        unrelated.mkdir(parents=True)
+        del namespace_mock["c"]
+        pull_mock.reset_mock()
+
+        monkeypatch.chdir(tmp_path)
+        report = PEPHubClient().mirror("databio", "first/mirror", delete=True)
+
+        assert not pull_mock.called
+        assert report.unchanged == 2
+        assert not (tmp_path / "first" / "mirror" / "databio_c_default").exists()
+        assert unrelated.is_dir()
+        with open(tmp_path / "first" / "mirror" / ".phc-mirror.json") as f:
+            assert json.load(f)["projects"]["a:default"]["path"] == "databio_a_default"
+
+    def test_mirror_of_other_namespace(self, namespace_mock, pull_mock, tmp_path):
+        PEPHubClient().mirror("databio", str(tmp_path))
+
+        with pytest.raises(ValueError, match="mirror of namespace 'databio'"):
+            PEPHubClient().mirror("other", str(tmp_path))
+
+
+class TestSession:
+    def test_modules_share_client_session(self):
+        client = PEPHubClient()
+
+        assert client.view.session is client.session
+        assert client.sample.session is client.session
+        assert client.schema.session is client.session
+
+    def test_pool_size(self):
+        with PEPHubClient(pool_size=3) as client:
+            adapter = client.session.get_adapter("https://pephub-api.databio.org/")
+
+            assert adapter._pool_maxsize == 3
+
+    def test_requests_reuse_session(self, mocker):
+        requests_mock = mocker.patch(
+            "requests.Session.request", return_value=Mock(status_code=202)
+        )
+        client = PEPHubClient()
+        client.sample.remove("test_namespace", "taest_name", "default", "gg1")
+        client.view.delete("test_namespace", "taest_name", "default", "gg1")
+
+        assert requests_mock.call_count == 2
+
+    def test_send_request_called_on_class(self, mocker):
+        requests_mock = mocker.patch(
+            "requests.Session.request", return_value=Mock(status_code=200)
+        )
+        for _ in range(2):
+            response = RequestManager.send_request(
+                method="GET", url="https://pephub-api.databio.org/api/v1/"
+            )
+            assert response.status_code == 200
+
+        assert requests_mock.call_count == 2
+        assert RequestManager.default() is RequestManager.default()
+        assert requests_mock.call_args.kwargs["timeout"] is not None
+
+
+class TestRetry:
+    @pytest.fixture
+    def sleep_mock(self, mocker):
+        return mocker.patch("pephubclient.helpers.time.sleep")
+
+    def test_get_retried_on_unavailable(self, mocker, sleep_mock):
+        requests_mock = mocker.patch(
+            "requests.Session.request",
+            side_effect=[
+                Mock(status_code=503, headers={}),
+                Mock(status_code=502, headers={}),
+                Mock(status_code=202),
+            ],
+        )
+        PEPHubClient().sample.remove("test_namespace", "taest_name", "default", "gg1")
+
+        assert requests_mock.call_count == 3
+        assert sleep_mock.call_count == 2
+
+    def test_post_not_retried(self, mocker, sleep_mock):
+        requests_mock = mocker.patch(
+            "requests.Session.request",
+            return_value=Mock(status_code=503, headers={}),
+        )
+        with pytest.raises(ResponseError):
+            PEPHubClient().view.add_sample(
+                "test_namespace", "taest_name", "default", "gg1", "sample1"
+            )
+
+        assert requests_mock.call_count == 1
+
+    def test_post_retried_when_allowed(self, mocker, sleep_mock):
+        requests_mock = mocker.patch(
+            "requests.Session.request",
+            side_effect=[Mock(status_code=503, headers={}), Mock(status_code=202)],
+        )
+        PEPHubClient(
+            retry_policy=RetryPolicy(retry_non_idempotent=True)
+        ).view.add_sample("test_namespace", "taest_name", "default", "gg1", "sample1")
+
+        assert requests_mock.call_count == 2
+
+    def test_connection_error_retried(self, mocker, sleep_mock):
+        requests_mock = mocker.patch(
+            "requests.Session.request",
+            side_effect=requests.exceptions.ConnectionError("connection refused"),
+        )
+        with pytest.raises(requests.exceptions.ConnectionError):
+            PEPHubClient(retry_policy=RetryPolicy(max_retries=2)).sample.get(
+                "test_namespace", "taest_name", "default", "gg1"
+            )
+
+        assert requests_mock.call_count == 3
+
+    def test_refused_post_retried(self, mocker, sleep_mock):
+        refused = requests.exceptions.ConnectionError(
+            MaxRetryError(None, "/", NewConnectionError(None, "Connection refused"))
+        )
+        requests_mock = mocker.patch(
+            "requests.Session.request",
+            side_effect=[refused, Mock(status_code=202)],
+        )
+        PEPHubClient().view.add_sample(
+            "test_namespace", "taest_name", "default", "gg1", "sample1"
+        )
+
+        assert requests_mock.call_count == 2
+
+    def test_failed_post_not_retried(self, mocker, sleep_mock):
+        requests_mock = mocker.patch(
+            "requests.Session.request",
+            side_effect=requests.exceptions.ConnectionError("connection reset"),
+        )
+        with pytest.raises(requests.exceptions.ConnectionError):
+            PEPHubClient().view.add_sample(
+                "test_namespace", "taest_name", "default", "gg1", "sample1"
+            )
+
+        assert requests_mock.call_count == 1
+
+    def test_retry_after(self, mocker, sleep_mock):
+        mocker.patch(
+            "requests.Session.request",
+            side_effect=[
+                Mock(status_code=429, headers={"Retry-After": "7"}),
+                Mock(status_code=202),
+            ],
+        )
+        PEPHubClient().sample.remove("test_namespace", "taest_name", "default", "gg1")
+
+        assert sleep_mock.call_args.args[0] >= 7
+
+    def test_deadline(self, mocker, sleep_mock):
+        requests_mock = mocker.patch(
+            "requests.Session.request",
+            return_value=Mock(status_code=429, headers={"Retry-After": "60"}),
+        )
+        client = PEPHubClient(retry_policy=RetryPolicy(total_timeout=30))
+        with pytest.raises(ResponseError):
+            client.sample.get("test_namespace", "taest_name", "default", "gg1")
+
+        assert requests_mock.call_count == 1
+        assert not sleep_mock.called
+
+    @pytest.mark.parametrize("attempt", [0, 1, 5, 10])
+    def test_backoff_limits(self, attempt):
+        policy = RetryPolicy(backoff_factor=1, max_backoff=8)
+
+        assert 0 <= policy.get_backoff(attempt) <= min(8, 2**attempt)
+        assert RetryPolicy(jitter=False, backoff_factor=1, max_backoff=8).get_backoff(
+            attempt
+        ) == min(8, 2**attempt)
+
+
+class TestInstrumentation:
+    class RecordingHook(RequestHook):
+        def __init__(self):
+            self.before = []
+            self.after = []
+
+        def before_request(self, event):
+            self.before.append(event.model_copy())
+
+        def after_request(self, event):
+            self.after.append(event)
+
+    @pytest.mark.parametrize(
+        "url, template",
+        [
+            (
+                "https://pephub-api.databio.org/api/v1/projects/databio/pep?tag=default&raw=true",
+                "api/v1/projects/{namespace}/{project}",
+            ),
+            (
+                "https://pephub-api.databio.org/api/v1/projects/databio/pep/samples/s1",
+                "api/v1/projects/{namespace}/{project}/samples/{sample_name}",
+            ),
+            (
+                "https://pephub-api.databio.org/api/v1/schemas/databio/pep/versions/json",
+                "api/v1/schemas/{namespace}/{schema_name}/versions/json",
+            ),
+            (
+                "https://pephub-api.databio.org/api/v1/schemas/databio/pep/versions/2.1.0",
+                "api/v1/schemas/{namespace}/{schema_name}/versions/{version}",
+            ),
+            ("https://pephub-api.databio.org/other/path", "/other/path"),
+        ],
+    )
+    def test_url_template(self, url, template):
+        assert get_url_template(url) == template
+
+    def test_hooks_and_stats(self, mocker):
+        mocker.patch("pephubclient.helpers.time.sleep")
+        mocker.patch(
+            "requests.Session.request",
+            side_effect=[
+                Mock(status_code=503, headers={}),
+                Mock(
+                    status_code=200,
+                    content=b'{"sample_name": "s1"}',
+                    elapsed=datetime.timedelta(milliseconds=20),
+                    request=Mock(body=None),
+                ),
+            ],
+        )
+        hook = self.RecordingHook()
+        client = PEPHubClient(request_hooks=[hook])
+
+        client.sample.get("databio", "pep", "default", "s1")
+
+        assert [event.status_code for event in hook.before] == [None]
+        event = hook.after[0]
+        assert event.method == "GET"
+        assert event.url_template.endswith("/samples/{sample_name}")
+        assert event.status_code == 200
+        assert event.retries == 1
+        assert event.bytes_received == 21
+        assert event.ttfb == pytest.approx(0.02)
+        assert event.total_time >= 0
+
+        stats = client.stats()
+        assert stats.count == 1
+        endpoint = stats.endpoints[0]
+        assert (endpoint.count, endpoint.retries, endpoint.errors) == (1, 1, 0)
+        assert endpoint.bytes_received == 21
+        assert sum(endpoint.histogram) == 1
+        assert stats.quantile(0.5) <= stats.bounds[-1]
+
+    def test_failed_request_is_recorded(self, mocker):
+        mocker.patch(
+            "requests.Session.request",
+            side_effect=requests.ConnectionError("connection refused"),
+        )
+        hook = self.RecordingHook()
+        client = PEPHubClient(
+            retry_policy=RetryPolicy(max_retries=0), request_hooks=[hook]
+        )
+
+        with pytest.raises(requests.ConnectionError):
+            client.sample.get("databio", "pep", "default", "s1")
+
+        assert "connection refused" in hook.after[0].error
+        assert client.stats().endpoints[0].errors == 1
+
+    def test_failing_hook_is_ignored(self, mocker):
+        mocker.patch("requests.Session.request", return_value=Mock(status_code=202))
+
+        class FailingHook(RequestHook):
+            def after_request(self, event):
+                raise RuntimeError("broken hook")
+
+        client = PEPHubClient(request_hooks=[FailingHook()])
+        client.sample.remove("databio", "pep", "default", "s1")
+
+        assert client.stats().count == 1
+
+    def test_connect_time_of_new_connections(self):
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                self.send_response(200)
+                self.send_header("Content-Length", "2")
+                self.end_headers()
+                self.wfile.write(b"{}")
+
+            def log_message(self, *args):
+                pass
+
+        server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        hook = self.RecordingHook()
+        url = f"http://127.0.0.1:{server.server_address[1]}/api/v1/ping"
+        try:
+            with PEPHubClient(request_hooks=[hook]) as client:
+                client.send_request(method="GET", url=url)
+                client.send_request(method="GET", url=url)
+        finally:
+            server.shutdown()
+
+        first, second = hook.after
+        assert first.connect_time > 0
+        # keep-alive connection is reused
+        assert second.connect_time == 0
+        assert first.bytes_received == 2
+
+
+class TestSampleTable:
+    @pytest.fixture
+    def project_mock(self, mocker, test_raw_pep_return):
+        project = copy.deepcopy(test_raw_pep_return)
+        project["subsample_list"] = [
+            [
+                {"sample_name": "pig_0h", "read": "r1"},
+                {"sample_name": "pig_0h", "read": "r2"},
+            ]
+        ]
+        mocker.patch(
+            "requests.Session.request",
+            return_value=Mock(content=json.dumps(project).encode(), status_code=200),
+        )
+        return project
+
+    def test_load_sample_table(self, project_mock):
+        samples, subsamples = PEPHubClient().load_sample_table("databio/pep:default")
+
+        assert list(samples.index) == ["pig_0h", "pig_1h", "frog_0h"]
+        assert samples.to_dict(orient="records") == project_mock["sample_list"]
+        assert len(subsamples) == 1
+        assert subsamples[0]["read"].tolist() == ["r1", "r2"]
+
+    def test_categorical(self, project_mock):
+        client = PEPHubClient()
+        samples = client.load_sample_table(
+            "databio/pep:default", subsamples=False, categorical=True
+        )
+
+        assert isinstance(samples, pd.DataFrame)
+        # single value in all rows
+        assert samples["file_path"].dtype == "category"
+        assert samples["time"].dtype != "category"
+        assert samples["sample_name"].dtype != "category"
+
+        samples, _ = client.load_sample_table(
+            "databio/pep:default", categorical=["time"]
+        )
+        assert samples["time"].dtype == "category"
+        assert list(samples["time"].cat.categories) == ["0", "1"]
+
+    def test_local_project(self, test_raw_pep_return, tmp_path):
+        save_pep(
+            ProjectDict.to_raw_dict(test_raw_pep_return),
+            reg_path="databio/pep:default",
+            project_path=str(tmp_path),
+        )
+        project_path = str(tmp_path / "databio_pep_default")
+        client = PEPHubClient()
+
+        samples, subsamples = client.load_sample_table(project_path)
+        assert list(samples.index) == ["pig_0h", "pig_1h", "frog_0h"]
+        assert subsamples == []
+
+        samples = client.load_sample_table(
+            project_path, subsamples=False, columns=["time"], where={"time": "0"}
+        )
+        assert list(samples.columns) == ["sample_name", "time"]
+        assert list(samples.index) == ["pig_0h", "frog_0h"]
+
+
+class TestTokenExpiry:
+    @staticmethod
+    def make_jwt(expires_in: float) -> str:
+        payload = json.dumps({"login": "user", "exp": int(time.time() + expires_in)})
+        encoded = base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+        return f"eyJhbGciOiJIUzI1NiJ9.{encoded}.signature"
+
+    @pytest.fixture
+    def login_mock(self, mocker):
+        def login(jwt_data):
+            return mocker.patch(
+                "pephubclient.files_manager.FilesManager.load_jwt_data_from_file",
+                return_value=jwt_data,
+            )
+
+        return login
+
+    def test_get_jwt_expiration(self, test_jwt):
+        jwt_data = self.make_jwt(3600)
+
+        assert get_jwt_expiration(jwt_data) == pytest.approx(time.time() + 3600, abs=5)
+        # token without exp claim, and token that can't be decoded
+        assert get_jwt_expiration(test_jwt) is None
+        assert get_jwt_expiration("not a token") is None
+
+    def test_expired_token_is_not_sent(self, mocker, login_mock):
+        login_mock(self.make_jwt(-10))
+        requests_mock = mocker.patch("requests.Session.request")
+
+        with pytest.raises(JWTExpiredError):
+            PEPHubClient().sample.get("databio", "pep", "default", "s1")
+        requests_mock.assert_not_called()
+
+    def test_check_token(self, login_mock, caplog):
+        login_mock(self.make_jwt(1800))
+        client = PEPHubClient(token_policy=TokenExpiryPolicy(margin=600))
+
+        assert client.check_token() == pytest.approx(1800, abs=5)
+        assert not caplog.records
+        client.check_token(duration=3600)
+        assert "JWT expires in" in caplog.text
+
+    def test_check_token_not_logged_in(self, login_mock, test_jwt):
+        login_mock(None)
+        assert PEPHubClient().check_token(duration=10**6) is None
+        login_mock(test_jwt)
+        assert PEPHubClient().check_token(duration=10**6) is None
+
+    def test_batch_operations_blocked(self, mocker, login_mock):
+        login_mock(self.make_jwt(60))
+        requests_mock = mocker.patch("requests.Session.request")
+        client = PEPHubClient(token_policy=TokenExpiryPolicy(block=True))
+
+        with pytest.raises(JWTExpiredError, match="JWT expires in"):
+            client.pull_many(["databio/pep:default"])
+        with pytest.raises(JWTExpiredError):
+            client.sample.remove_many("databio", "pep", "default", ["s1"])
+        with pytest.raises(JWTExpiredError):
+            client.view.sync("databio", "pep", "default", "view", ["s1"])
+        requests_mock.assert_not_called()
+        # single requests are still sent
+        mocker.patch("requests.Session.request", return_value=Mock(status_code=202))
+        client.sample.remove("databio", "pep", "default", "s1")
+
+    def test_expired_token_response(self, mocker):
+        mocker.patch(
+            "requests.Session.request",
+            return_value=Mock(
+                status_code=401, content=b'{"detail": "JWT has expired"}'
+            ),
+        )
+
+        with pytest.raises(JWTExpiredError, match="Please log in again"):
+            PEPHubClient().send_request(method="GET", url="https://pephub.databio.org")
+
+    def test_token_file_is_read_once(self, mocker, tmp_path):
+        path = str(tmp_path / "jwt.txt")
+        FilesManager.save_jwt_data_to_file(path, "token1")
+        open_mock = mocker.patch("builtins.open", wraps=open)
+
+        assert FilesManager.load_jwt_data_from_file(path) == "token1"
+        assert FilesManager.load_jwt_data_from_file(path) == "token1"
+        assert open_mock.call_count == 1
+
+        FilesManager.save_jwt_data_to_file(path, "new token")
+        assert FilesManager.load_jwt_data_from_file(path) == "new token"
+        os.remove(path)
+        assert FilesManager.load_jwt_data_from_file(path) is None
+
 
 class TestHelpers:
     @pytest.mark.parametrize(
@@ -229,6 +1247,202 @@ class TestHelpers:
     def test_is_registry_path(self, input_str, expected_output):
         assert is_registry_path(input_str) is expected_output
 
+    @pytest.fixture(params=[True, False], ids=["fast_decoder", "json_decoder"])
+    def json_decoder(self, request, monkeypatch):
+        if not request.param:
+            monkeypatch.setattr("pephubclient.helpers._fast_json_loads", None)
+
+    def test_decode_json_response(self, json_decoder, test_raw_pep_return):
+        response = requests.Response()
+        response._content = json.dumps(test_raw_pep_return).encode("utf-8")
+
+        assert (
+            RequestManager.decode_response(response, output_json=True)
+            == test_raw_pep_return
+        )
+
+    def test_decode_incorrect_json_response(self, json_decoder):
+        response = requests.Response()
+        response._content = b"{not json"
+
+        with pytest.raises(ResponseError):
+            RequestManager.decode_response(response, output_json=True)
+
+    @pytest.mark.parametrize(
+        "local_names, remote_names, expected",
+        [
+            (["a", "b", "c"], ["a", "b", "c"], ([], [], [])),
+            (["a", "c", "d"], ["a", "b", "c"], (["d"], [], ["b"])),
+            (["b", "a"], ["a", "b"], None),
+            (["d", "a"], ["a"], None),
+            (["a", "a"], ["a"], None),
+        ],
+    )
+    def test_compute_sample_diff(self, local_names, remote_names, expected):
+        diff = compute_sample_diff(
+            [{"sample_name": name, "value": 1} for name in local_names],
+            [{"sample_name": name, "value": 1} for name in remote_names],
+            "sample_name",
+        )
+
+        if expected is None:
+            assert diff is None
+        else:
+            assert (diff.added, diff.updated, diff.removed) == expected
+
+    def test_compute_sample_diff_updated(self):
+        diff = compute_sample_diff(
+            [{"sample_name": "a", "value": 2}, {"value": 1, "sample_name": "b"}],
+            [{"sample_name": "a", "value": 1}, {"sample_name": "b", "value": 1}],
+            "sample_name",
+        )
+
+        assert diff.updated == ["a"]
+        assert diff.number_of_operations == 1
+
+    def test_project_to_raw_dict(self, test_raw_pep_return):
+        raw_project = ProjectDict.to_raw_dict(test_raw_pep_return)
+
+        assert raw_project == ProjectDict(**test_raw_pep_return).model_dump(
+            by_alias=True
+        )
+        # samples are not copied
+        assert raw_project["_sample_dict"] is test_raw_pep_return["sample_list"]
+        assert raw_project["_config"] is not test_raw_pep_return["config"]
+
+    @pytest.mark.parametrize(
+        "project",
+        [
+            {"config": {}, "subsample_list": None},
+            {"config": {}, "subsample_list": None, "sample_list": {"a": 1}},
+            {"config": [], "subsample_list": None, "sample_list": []},
+        ],
+    )
+    def test_project_to_raw_dict_incorrect(self, project):
+        with pytest.raises(ValidationError):
+            ProjectDict.to_raw_dict(project)
+
+    @pytest.mark.parametrize(
+        "compression, compress_type",
+        [
+            ("store", zipfile.ZIP_STORED),
+            ("deflate", zipfile.ZIP_DEFLATED),
+            ("lzma", zipfile.ZIP_LZMA),
+        ],
+    )
+    def test_save_pep_zip(
+        self, test_raw_pep_return, tmp_path, compression, compress_type
+    ):
+        save_pep(
+            test_raw_pep_return,
+            reg_path="databio/pep:default",
+            project_path=str(tmp_path),
+            zip=True,
+            compression=compression,
+        )
+
+        with zipfile.ZipFile(tmp_path / "databio_pep_default.zip") as zip_file:
+            assert sorted(zip_file.namelist()) == [
+                "sample name_config.yaml",
+                "sample_table.csv",
+            ]
+            assert all(
+                info.compress_type == compress_type for info in zip_file.infolist()
+            )
+            sample_table = zip_file.read("sample_table.csv").decode("utf-8")
+            config = yaml.safe_load(zip_file.read("sample name_config.yaml"))
+        assert sample_table == pd.DataFrame(test_raw_pep_return["sample_list"]).to_csv(
+            index=False
+        )
+        assert config["sample_table"] == ["sample_table.csv"]
+
+    def test_save_pep_zip_incorrect_compression(self, test_raw_pep_return, tmp_path):
+        with pytest.raises(ValueError, match="Unknown compression method"):
+            save_pep(
+                test_raw_pep_return,
+                project_path=str(tmp_path),
+                zip=True,
+                compression="gzip",
+            )
+        assert not list(tmp_path.iterdir())
+
+    @pytest.fixture
+    def typed_raw_pep(self):
+        return {
+            "_config": {"pep_version": "2.1.0", "name": "typed", "description": None},
+            "_sample_dict": [
+                {"sample_name": "a", "time": 1, "ratio": 0.5, "mixed": "x"},
+                {"sample_name": "b", "time": 2, "ratio": None, "mixed": 3},
+            ],
+            "_subsample_list": [[{"sample_name": "a", "read": "r1"}]],
+        }
+
+    @pytest.mark.parametrize("table_format", ["parquet", "feather"])
+    def test_save_pep_columnar(self, typed_raw_pep, tmp_path, table_format):
+        pytest.importorskip("pyarrow")
+        save_pep(
+            typed_raw_pep,
+            reg_path="databio/typed:default",
+            project_path=str(tmp_path),
+            format=table_format,
+        )
+        project_path = tmp_path / "databio_typed_default"
+        assert sorted(os.listdir(project_path)) == [
+            f"sample_table.{table_format}",
+            f"subsample_table1.{table_format}",
+            "typed_config.yaml",
+        ]
+
+        samples = FilesManager.load_table(
+            str(project_path / f"sample_table.{table_format}")
+        )
+        assert samples["time"].dtype == "int64"
+        assert samples["ratio"].dtype == "float64"
+        assert list(samples["mixed"]) == ["x", "3"]
+
+        project = PEPHubClient().load_project(str(project_path))
+        assert project.name == "typed"
+        assert list(project.sample_table["sample_name"]) == ["a", "b"]
+        assert list(project.subsample_table["read"]) == ["r1"]
+
+    def test_load_project_from_csv_directory(self, typed_raw_pep, tmp_path):
+        save_pep(typed_raw_pep, project_path=str(tmp_path))
+
+        project = PEPHubClient().load_project(str(tmp_path / "typed"))
+        assert list(project.sample_table["sample_name"]) == ["a", "b"]
+
+    @pytest.mark.parametrize(
+        "path, local", [("databio/typed", False), ("./databio/typed", True)]
+    )
+    def test_directory_named_like_registry_path(
+        self, mocker, monkeypatch, typed_raw_pep, tmp_path, path, local
+    ):
+        (tmp_path / "databio").mkdir()
+        save_pep(typed_raw_pep, project_path=str(tmp_path / "databio"))
+        monkeypatch.chdir(tmp_path)
+        remote_pep = copy.deepcopy(typed_raw_pep)
+        remote_pep["_config"]["name"] = "remote"
+        load_mock = mocker.patch(
+            "pephubclient.pephubclient.PEPHubClient.load_raw_pep",
+            return_value=remote_pep,
+        )
+
+        project = PEPHubClient().load_project(path)
+        assert project.name == ("typed" if local else "remote")
+        assert load_mock.called is not local
+
+    def test_save_pep_columnar_zip(self, typed_raw_pep, tmp_path):
+        with pytest.raises(ValueError, match="Only csv tables"):
+            save_pep(
+                typed_raw_pep, project_path=str(tmp_path), zip=True, format="parquet"
+            )
+
+    def test_save_pep_columnar_without_pyarrow(self, mocker, typed_raw_pep, tmp_path):
+        mocker.patch("importlib.util.find_spec", return_value=None)
+
+        with pytest.raises(ImportError, match="pephubclient\\[arrow\\]"):
+            save_pep(typed_raw_pep, project_path=str(tmp_path), format="feather")
+
 
 class TestSamples:
     def test_get(self, mocker):
@@ -238,7 +1452,7 @@ class TestSamples:
             "sample_name": "gg1",
         }
         mocker.patch(
-            "requests.request",
+            "requests.Session.request",
             return_value=Mock(content=return_value, status_code=200),
         )
         mocker.patch(
@@ -273,7 +1487,9 @@ class TestSamples:
     def test_sample_get_with_pephub_error_response(
         self, mocker, status_code, expected_error_message
     ):
-        mocker.patch("requests.request", return_value=Mock(status_code=status_code))
+        mocker.patch(
+            "requests.Session.request", return_value=Mock(status_code=status_code)
+        )
         with pytest.raises(ResponseError, match=expected_error_message):
             PEPHubClient().sample.get(
                 "test_namespace",
@@ -292,7 +1508,7 @@ class TestSamples:
     def test_create(self, mocker, prj_dict):
         return_value = prj_dict
         mocker_obj = mocker.patch(
-            "requests.request",
+            "requests.Session.request",
             return_value=Mock(content=return_value, status_code=202),
         )
 
@@ -325,7 +1541,9 @@ class TestSamples:
     def test_sample_create_with_pephub_error_response(
         self, mocker, status_code, expected_error_message
     ):
-        mocker.patch("requests.request", return_value=Mock(status_code=status_code))
+        mocker.patch(
+            "requests.Session.request", return_value=Mock(status_code=status_code)
+        )
         with pytest.raises(ResponseError, match=expected_error_message):
             PEPHubClient().sample.create(
                 "test_namespace",
@@ -341,7 +1559,7 @@ class TestSamples:
 
     def test_delete(self, mocker):
         mocker_obj = mocker.patch(
-            "requests.request",
+            "requests.Session.request",
             return_value=Mock(status_code=202),
         )
 
@@ -369,7 +1587,9 @@ class TestSamples:
     def test_sample_delete_with_pephub_error_response(
         self, mocker, status_code, expected_error_message
     ):
-        mocker.patch("requests.request", return_value=Mock(status_code=status_code))
+        mocker.patch(
+            "requests.Session.request", return_value=Mock(status_code=status_code)
+        )
         with pytest.raises(ResponseError, match=expected_error_message):
             PEPHubClient().sample.remove(
                 "test_namespace",
@@ -380,7 +1600,7 @@ class TestSamples:
 
     def test_update(self, mocker):
         mocker_obj = mocker.patch(
-            "requests.request",
+            "requests.Session.request",
             return_value=Mock(status_code=202),
         )
 
@@ -413,7 +1633,9 @@ class TestSamples:
     def test_sample_update_with_pephub_error_response(
         self, mocker, status_code, expected_error_message
     ):
-        mocker.patch("requests.request", return_value=Mock(status_code=status_code))
+        mocker.patch(
+            "requests.Session.request", return_value=Mock(status_code=status_code)
+        )
         with pytest.raises(ResponseError, match=expected_error_message):
             PEPHubClient().sample.update(
                 "test_namespace",
@@ -427,12 +1649,90 @@ class TestSamples:
                 },
             )
 
+    def test_get_many(self, mocker):
+        def request(method, url, **kwargs):
+            sample_name = urlparse(url).path.rsplit("/", 1)[-1]
+            if sample_name == "missing":
+                return Mock(status_code=404)
+            return Mock(
+                status_code=200,
+                json=Mock(return_value={"sample_name": sample_name}),
+            )
+
+        mocker.patch("requests.Session.request", side_effect=request)
+        report = PEPHubClient().sample.get_many(
+            "test_namespace", "taest_name", "default", ["s1", "missing", "s2"], jobs=2
+        )
+
+        assert [result.sample_name for result in report.results] == [
+            "s1",
+            "missing",
+            "s2",
+        ]
+        assert report.succeeded == ["s1", "s2"]
+        assert report.samples == {
+            "s1": {"sample_name": "s1"},
+            "s2": {"sample_name": "s2"},
+        }
+        assert report.failed[0].sample_name == "missing"
+        assert "does not exist" in report.failed[0].error
+
+    def test_create_many_from_dataframe(self, mocker):
+        requests_mock = mocker.patch(
+            "requests.Session.request", return_value=Mock(status_code=202)
+        )
+        samples = pd.DataFrame({"sample_name": ["s1", "s2"], "genome": ["hg38", None]})
+        report = PEPHubClient().sample.create_many(
+            "test_namespace", "taest_name", "default", samples, overwrite=True
+        )
+
+        assert report.succeeded == ["s1", "s2"]
+        assert sorted(
+            (call.kwargs["json"]["sample_name"], call.kwargs["json"]["genome"])
+            for call in requests_mock.call_args_list
+        ) == [("s1", "hg38"), ("s2", None)]
+        assert "overwrite=True" in requests_mock.call_args.kwargs["url"]
+
+    def test_update_many(self, mocker):
+        requests_mock = mocker.patch(
+            "requests.Session.request", return_value=Mock(status_code=202)
+        )
+        report = PEPHubClient().sample.update_many(
+            "test_namespace",
+            "taest_name",
+            "default",
+            [{"sample_name": f"s{number}", "genome": "hg38"} for number in range(20)],
+        )
+
+        assert len(report.succeeded) == 20
+        assert {call.kwargs["method"] for call in requests_mock.call_args_list} == {
+            "PATCH"
+        }
+
+    def test_update_many_sample_without_name(self):
+        with pytest.raises(ValueError):
+            PEPHubClient().sample.update_many(
+                "test_namespace", "taest_name", "default", [{"genome": "hg38"}]
+            )
+
+    def test_remove_many(self, mocker):
+        mocker.patch(
+            "requests.Session.request",
+            side_effect=[Mock(status_code=202), Mock(status_code=500)],
+        )
+        report = PEPHubClient().sample.remove_many(
+            "test_namespace", "taest_name", "default", ["s1", "s2"], jobs=1
+        )
+
+        assert report.succeeded == ["s1"]
+        assert [result.sample_name for result in report.failed] == ["s2"]
+
 
 class TestViews:
     def test_get(self, mocker, test_raw_pep_return):
         return_value = test_raw_pep_return
         mocker.patch(
-            "requests.request",
+            "requests.Session.request",
             return_value=Mock(content=return_value, status_code=200),
         )
         mocker.patch(
@@ -464,7 +1764,9 @@ class TestViews:
     def test_view_get_with_pephub_error_response(
         self, mocker, status_code, expected_error_message
     ):
-        mocker.patch("requests.request", return_value=Mock(status_code=status_code))
+        mocker.patch(
+            "requests.Session.request", return_value=Mock(status_code=status_code)
+        )
         with pytest.raises(ResponseError, match=expected_error_message):
             PEPHubClient().view.get(
                 "test_namespace",
@@ -475,7 +1777,7 @@ class TestViews:
 
     def test_create(self, mocker):
         mocker_obj = mocker.patch(
-            "requests.request",
+            "requests.Session.request",
             return_value=Mock(status_code=202),
         )
 
@@ -504,7 +1806,9 @@ class TestViews:
     def test_view_create_with_pephub_error_response(
         self, mocker, status_code, expected_error_message
     ):
-        mocker.patch("requests.request", return_value=Mock(status_code=status_code))
+        mocker.patch(
+            "requests.Session.request", return_value=Mock(status_code=status_code)
+        )
         with pytest.raises(ResponseError, match=expected_error_message):
             PEPHubClient().view.create(
                 "test_namespace",
@@ -516,7 +1820,7 @@ class TestViews:
 
     def test_delete(self, mocker):
         mocker_obj = mocker.patch(
-            "requests.request",
+            "requests.Session.request",
             return_value=Mock(status_code=202),
         )
 
@@ -544,7 +1848,9 @@ class TestViews:
     def test_view_delete_with_pephub_error_response(
         self, mocker, status_code, expected_error_message
     ):
-        mocker.patch("requests.request", return_value=Mock(status_code=status_code))
+        mocker.patch(
+            "requests.Session.request", return_value=Mock(status_code=status_code)
+        )
         with pytest.raises(ResponseError, match=expected_error_message):
             PEPHubClient().view.delete(
                 "test_namespace",
@@ -555,7 +1861,7 @@ class TestViews:
 
     def test_add_sample(self, mocker):
         mocker_obj = mocker.patch(
-            "requests.request",
+            "requests.Session.request",
             return_value=Mock(status_code=202),
         )
 
@@ -570,7 +1876,7 @@ class TestViews:
 
     def test_delete_sample(self, mocker):
         mocker_obj = mocker.patch(
-            "requests.request",
+            "requests.Session.request",
             return_value=Mock(status_code=202),
         )
 
@@ -583,6 +1889,112 @@ class TestViews:
         )
         assert mocker_obj.called
 
+    @pytest.fixture
+    def view_requests(self, mocker):
+        def view_response(sample_names):
+            view = {
+                "config": {"name": "gg1"},
+                "sample_list": [{"sample_name": name} for name in sample_names],
+                "subsample_list": [],
+            }
+            return Mock(content=json.dumps(view).encode(), status_code=200)
+
+        def mock_requests(view_samples):
+            def request(method, url, **kwargs):
+                if method == "GET":
+                    if view_samples is None:
+                        return Mock(status_code=404)
+                    return view_response(view_samples)
+                return Mock(status_code=202)
+
+            return mocker.patch("requests.Session.request", side_effect=request)
+
+        return mock_requests
+
+    def test_sync_adds_and_removes_missing_samples(self, view_requests):
+        mocker_obj = view_requests(["s1", "s2", "s3", "s4", "s5"])
+
+        report = PEPHubClient().view.sync(
+            "test_namespace",
+            "taest_name",
+            "default",
+            "gg1",
+            ["s1", "s2", "s3", "s4", "s6", "s6"],
+        )
+        calls = sorted(
+            (call.kwargs["method"], call.kwargs["url"].split("/")[-1].split("?")[0])
+            for call in mocker_obj.call_args_list
+            if call.kwargs["method"] != "GET"
+        )
+        assert calls == [("DELETE", "s5"), ("POST", "s6")]
+        assert report.added == ["s6"]
+        assert report.removed == ["s5"]
+        assert not report.recreated
+        assert report.requests_sent == 2
+        assert report.operations_saved == 8
+        assert report.failed == []
+
+    def test_sync_recreates_view(self, view_requests):
+        mocker_obj = view_requests(["s1", "s2", "s3", "s4"])
+
+        report = PEPHubClient().view.sync(
+            "test_namespace", "taest_name", "default", "gg1", ["s5", "s6", "s7"]
+        )
+        methods = [call.kwargs["method"] for call in mocker_obj.call_args_list]
+        assert methods == ["GET", "DELETE", "POST"]
+        assert mocker_obj.call_args.kwargs["json"] == ["s5", "s6", "s7"]
+        assert report.recreated
+        assert report.requests_sent == 2
+        assert report.operations_saved == 5
+
+    def test_sync_creates_missing_view(self, view_requests):
+        mocker_obj = view_requests(None)
+
+        report = PEPHubClient().view.sync(
+            "test_namespace", "taest_name", "default", "gg1", ["s1", "s2"]
+        )
+        assert [call.kwargs["method"] for call in mocker_obj.call_args_list] == [
+            "GET",
+            "POST",
+        ]
+        assert report.added == ["s1", "s2"]
+        assert report.recreated
+
+    def test_sync_failed_get_is_raised(self, mocker):
+        mocker_obj = mocker.patch(
+            "requests.Session.request", return_value=Mock(status_code=500)
+        )
+
+        with pytest.raises(ResponseError, match="Internal server error"):
+            PEPHubClient().view.sync(
+                "test_namespace", "taest_name", "default", "gg1", ["s1"]
+            )
+        # view is not created when current view can't be read
+        assert {call.kwargs["method"] for call in mocker_obj.call_args_list} == {"GET"}
+
+    def test_sync_without_changes(self, view_requests):
+        mocker_obj = view_requests(["s1", "s2"])
+
+        report = PEPHubClient().view.sync(
+            "test_namespace", "taest_name", "default", "gg1", ["s2", "s1"]
+        )
+        assert mocker_obj.call_count == 1
+        assert report.requests_sent == 0
+        assert report.operations_saved == 4
+
+    def test_sync_collects_failed_samples(self, mocker, view_requests):
+        view_requests(["s1"])
+        mocker.patch(
+            "pephubclient.modules.view.PEPHubView.add_sample",
+            side_effect=ResponseError("Sample 's2' or project does not exist."),
+        )
+
+        report = PEPHubClient().view.sync(
+            "test_namespace", "taest_name", "default", "gg1", ["s1", "s2"]
+        )
+        assert [result.sample_name for result in report.failed] == ["s2"]
+        assert "does not exist" in report.failed[0].error
+
 
 ###
 
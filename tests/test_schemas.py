@@ -1,6 +1,27 @@
-from pephubclient import PEPHubClient
+import copy
+import json
+import logging
+from concurrent.futures import ThreadPoolExecutor
 from unittest.mock import Mock
 
+import pandas as pd
+import peppy
+import pytest
+
+from pephubclient import PEPHubClient
+from pephubclient.exceptions import (
+    LocalDataNotFoundError,
+    ResponseError,
+    SchemaValidationError,
+    StaleDataWarning,
+)
+from pephubclient.schemas.validation import (
+    ProjectValidator,
+    get_project_validator,
+    jsonschema,
+)
+from pephubclient.schemas.cache import SchemaCache
+
 example_schema = {
     "a": "b",
     "c": 1,
@@ -30,7 +51,7 @@ class TestSchemas:
             return_value=test_jwt,
         )
         requests_mock = mocker.patch(
-            "requests.request",
+            "requests.Session.request",
             return_value=Mock(content="some return", status_code=200),
         )
         mocker.patch(
@@ -51,7 +72,7 @@ class TestSchemas:
             return_value=test_jwt,
         )
         requests_mock = mocker.patch(
-            "requests.request",
+            "requests.Session.request",
             return_value=Mock(content="some return", status_code=200),
         )
         mocker.patch(
@@ -75,7 +96,7 @@ class TestSchemas:
             return_value=test_jwt,
         )
         requests_mock = mocker.patch(
-            "requests.request",
+            "requests.Session.request",
             return_value=Mock(content="some return", status_code=202),
         )
 
@@ -98,7 +119,7 @@ class TestSchemas:
             return_value=test_jwt,
         )
         requests_mock = mocker.patch(
-            "requests.request",
+            "requests.Session.request",
             return_value=Mock(content="some return", status_code=202),
         )
 
@@ -123,7 +144,7 @@ class TestSchemas:
             return_value=test_jwt,
         )
         requests_mock = mocker.patch(
-            "requests.request",
+            "requests.Session.request",
             return_value=Mock(content="some return", status_code=202),
         )
 
@@ -143,7 +164,7 @@ class TestSchemas:
             return_value=test_jwt,
         )
         requests_mock = mocker.patch(
-            "requests.request",
+            "requests.Session.request",
             return_value=Mock(content="some return", status_code=202),
         )
 
@@ -166,7 +187,7 @@ class TestSchemas:
             return_value=test_jwt,
         )
         requests_mock = mocker.patch(
-            "requests.request",
+            "requests.Session.request",
             return_value=Mock(content="some return", status_code=202),
         )
 
@@ -191,7 +212,7 @@ class TestSchemas:
             return_value=test_jwt,
         )
         requests_mock = mocker.patch(
-            "requests.request",
+            "requests.Session.request",
             return_value=Mock(content="some return", status_code=202),
         )
 
@@ -205,3 +226,339 @@ class TestSchemas:
 
         assert jwt_mock.called
         assert requests_mock.called
+
+
+pep_schema = {
+    "properties": {
+        "samples": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "sample_name": {"type": "string", "pattern": "^[a-z]+_[0-9]+h$"},
+                    "time": {"type": "string", "enum": ["0", "1"]},
+                    "file_path": {"type": "string", "description": "path"},
+                },
+                "required": ["sample_name", "time"],
+            },
+        }
+    },
+}
+
+
+def raw_project(samples):
+    return {
+        "_config": {"name": "test", "pep_version": "2.1.0"},
+        "_sample_dict": samples,
+        "_subsample_list": [],
+    }
+
+
+class TestSchemaValidation:
+    def test_valid_project(self):
+        pep_dict = raw_project(
+            [
+                {"sample_name": "pig_0h", "time": "0", "file_path": "source1"},
+                {"sample_name": "pig_1h", "time": "1", "file_path": None},
+            ]
+        )
+        assert ProjectValidator(pep_schema).validate(pep_dict) == []
+
+    def test_invalid_project(self):
+        pep_dict = raw_project(
+            [
+                {"sample_name": "pig_0h", "time": "0", "file_path": 1},
+                {"sample_name": "Frog", "time": "2", "file_path": "source1"},
+                {"sample_name": "cow_1h", "time": None, "file_path": "source1"},
+            ]
+        )
+        errors = ProjectValidator(pep_schema).validate(pep_dict)
+
+        assert errors == [
+            "attribute 'time' is missing in 1 sample(s): cow_1h",
+            "attribute 'sample_name' does not match '^[a-z]+_[0-9]+h$' in 1 sample(s): Frog",
+            "attribute 'time' is not one of ['0', '1'] in 1 sample(s): Frog",
+            "attribute 'file_path' is not of type string in 1 sample(s): pig_0h",
+        ]
+
+    def test_optional_integer_attribute(self):
+        schema = {
+            "properties": {
+                "samples": {
+                    "items": {
+                        "properties": {
+                            "reads": {"type": "integer"},
+                            "ratio": {"type": "number"},
+                        }
+                    }
+                }
+            }
+        }
+        pep_dict = raw_project(
+            [
+                {"sample_name": "pig_0h", "reads": 1, "ratio": 0.5},
+                {"sample_name": "pig_1h", "ratio": 1},
+                {"sample_name": "frog_0h", "reads": 2.5},
+            ]
+        )
+
+        assert ProjectValidator(schema).validate(pep_dict) == [
+            "attribute 'reads' is not of type integer in 1 sample(s): frog_0h"
+        ]
+
+    def test_number_of_reported_samples_is_limited(self):
+        pep_dict = raw_project(
+            [{"sample_name": f"s_{i}h", "time": "5"} for i in range(100)]
+        )
+        (error,) = ProjectValidator(pep_schema).validate(pep_dict)
+
+        assert "in 100 sample(s): s_0h, s_1h, s_2h, s_3h, s_4h, ..." in error
+
+    def test_missing_required_column(self):
+        pep_dict = raw_project([{"sample_name": "pig_0h"}])
+
+        assert ProjectValidator(pep_schema).validate(pep_dict) == [
+            "required attribute 'time' is missing"
+        ]
+
+    def test_compiled_validator_is_reused(self):
+        assert get_project_validator(pep_schema) is get_project_validator(
+            copy.deepcopy(pep_schema)
+        )
+
+    def test_get_cached_pinned_version(self, mocker, tmp_path):
+        requests_mock = mocker.patch(
+            "requests.Session.request",
+            return_value=Mock(content=json.dumps(pep_schema).encode(), status_code=200),
+        )
+
+        for _ in range(2):
+            # new client and cache object: schema is read from disk
+            phc = PEPHubClient(schema_cache=SchemaCache(str(tmp_path)))
+            schema = phc.schema.get_cached("databio", "pep", "2.1.0")
+            assert schema == pep_schema
+        assert requests_mock.call_count == 1
+        assert (tmp_path / "databio" / "pep" / "2.1.0.json").exists()
+        assert phc.schema.cache.stats().hits == 1
+
+    def test_upload_invalid_project(self, mocker):
+        mocker.patch(
+            "pephubclient.schemas.schema.PEPHubSchema.get_cached",
+            return_value=pep_schema,
+        )
+        requests_mock = mocker.patch("requests.Session.request")
+        project = peppy.Project.from_pandas(
+            pd.DataFrame({"sample_name": ["pig_0h", "Frog"], "time": ["0", "3"]})
+        )
+
+        with pytest.raises(SchemaValidationError) as err:
+            PEPHubClient().upload(
+                project, namespace="databio", validate_against="databio/pep:2.1.0"
+            )
+        assert len(err.value.errors) == 2
+        assert not requests_mock.called
+
+    def test_upload_valid_project(self, mocker):
+        get_cached_mock = mocker.patch(
+            "pephubclient.schemas.schema.PEPHubSchema.get_cached",
+            return_value=pep_schema,
+        )
+        requests_mock = mocker.patch(
+            "requests.Session.request", return_value=Mock(status_code=202)
+        )
+        project = peppy.Project.from_pandas(
+            pd.DataFrame({"sample_name": ["pig_0h", "frog_1h"], "time": ["0", "1"]})
+        )
+
+        PEPHubClient().upload(
+            project, namespace="databio", validate_against="databio/pep:2.1.0"
+        )
+        get_cached_mock.assert_called_once_with("databio", "pep", "2.1.0")
+        assert requests_mock.called
+
+    @pytest.mark.skipif(jsonschema is not None, reason="jsonschema is installed")
+    def test_config_not_validated_without_jsonschema(self, caplog):
+        schema = {**pep_schema, "properties": {**pep_schema["properties"]}}
+        schema["properties"]["config"] = {"required": ["pep_version"]}
+
+        with caplog.at_level(logging.WARNING, logger="pephubclient"):
+            ProjectValidator(schema).validate(raw_project([]))
+        assert "config were not validated" in caplog.text
+
+    @pytest.mark.skipif(jsonschema is None, reason="jsonschema is not installed")
+    def test_config_and_residual_keywords(self):
+        schema = copy.deepcopy(pep_schema)
+        schema["properties"]["config"] = {"required": ["description"]}
+        schema["properties"]["samples"]["items"]["properties"]["file_path"] = {
+            "anyOf": [{"type": "string"}, {"type": "array"}]
+        }
+        pep_dict = raw_project([{"sample_name": "pig_0h", "time": "0", "file_path": 1}])
+
+        assert ProjectValidator(schema).validate(pep_dict) == [
+            "attribute 'file_path' is not valid (anyOf) in 1 sample(s): pig_0h",
+            "config: 'description' is a required property",
+        ]
+
+
+def versions_response(*versions):
+    return {
+        "pagination": {"page": 0, "page_size": 100, "total": len(versions)},
+        "results": [
+            {
+                "namespace": "databio",
+                "schema_name": "pep",
+                "version": version,
+                "release_date": f"2025-0{number}-02T18:27:22.829003Z",
+                "last_update_date": f"2025-0{number}-02T18:27:22.829003Z",
+            }
+            for number, version in enumerate(versions, start=1)
+        ],
+    }
+
+
+class TestSchemaCache:
+    @pytest.fixture
+    def schema_requests(self, mocker):
+        server = {"versions": ["2.0.0", "2.1.0"]}
+
+        def request(method, url, **kwargs):
+            if url.endswith("/versions"):
+                body = versions_response(*server["versions"])
+            else:
+                body = {**pep_schema, "version": url.rsplit("/", 1)[-1]}
+            return Mock(content=json.dumps(body).encode(), status_code=200)
+
+        server["mock"] = mocker.patch("requests.Session.request", side_effect=request)
+        return server
+
+    def requested_urls(self, requests_mock):
+        return [call.kwargs["url"] for call in requests_mock.call_args_list]
+
+    def test_latest_is_resolved_with_versions(self, schema_requests, tmp_path):
+        phc = PEPHubClient(schema_cache=SchemaCache(str(tmp_path)))
+
+        for _ in range(3):
+            schema = phc.schema.get_cached("databio", "pep")
+            assert schema["version"] == "2.1.0"
+
+        urls = self.requested_urls(schema_requests["mock"])
+        assert len(urls) == 2
+        assert urls[0].endswith("/databio/pep/versions")
+        assert urls[1].endswith("/databio/pep/versions/2.1.0")
+        stats = phc.schema.cache.stats()
+        assert (stats.latest_hits, stats.latest_misses) == (2, 1)
+        assert (stats.hits, stats.misses) == (2, 1)
+        assert stats.hit_ratio == pytest.approx(4 / 6)
+
+    def test_latest_is_shared_by_cache_objects(self, schema_requests, tmp_path):
+        PEPHubClient(schema_cache=SchemaCache(str(tmp_path))).schema.get_cached(
+            "databio", "pep"
+        )
+        schema_requests["mock"].reset_mock()
+
+        phc = PEPHubClient(schema_cache=SchemaCache(str(tmp_path)))
+        assert phc.schema.get_cached("databio", "pep")["version"] == "2.1.0"
+        assert not schema_requests["mock"].called
+
+    def test_latest_expires(self, schema_requests, tmp_path):
+        phc = PEPHubClient(schema_cache=SchemaCache(str(tmp_path), latest_ttl=0))
+        phc.schema.get_cached("databio", "pep")
+        schema_requests["versions"].append("3.0.0")
+
+        assert phc.schema.get_cached("databio", "pep")["version"] == "3.0.0"
+        # version list is checked again, older schema is still cached
+        schema_requests["mock"].reset_mock()
+        assert phc.schema.get_cached("databio", "pep", "2.1.0")["version"] == "2.1.0"
+        assert not schema_requests["mock"].called
+
+    def test_cached_schema_is_copied(self, schema_requests, tmp_path):
+        phc = PEPHubClient(schema_cache=SchemaCache(str(tmp_path)))
+        phc.schema.get_cached("databio", "pep", "2.1.0")["properties"].clear()
+
+        assert phc.schema.get_cached("databio", "pep", "2.1.0")["properties"]
+        assert len(schema_requests["mock"].call_args_list) == 1
+
+    def test_online_get_is_not_cached(self, schema_requests, tmp_path):
+        phc = PEPHubClient(schema_cache=SchemaCache(str(tmp_path)))
+        phc.schema.get("databio", "pep", "2.1.0")
+        phc.schema.get("databio", "pep", "2.1.0")
+
+        assert len(schema_requests["mock"].call_args_list) == 2
+        assert not (tmp_path / "databio").exists()
+
+    @pytest.mark.parametrize(
+        "change, removed_version",
+        [
+            (
+                lambda schema: schema.update_version(
+                    "databio", "pep", "2.1.0", {"schema_value": "{}"}
+                ),
+                "2.1.0",
+            ),
+            (lambda schema: schema.delete_version("databio", "pep", "2.1.0"), "2.1.0"),
+            (lambda schema: schema.delete_schema("databio", "pep"), "2.1.0"),
+            (
+                lambda schema: schema.add_version("databio", "pep", {}, "3.0.0"),
+                None,
+            ),
+        ],
+    )
+    def test_changed_schema_is_invalidated(
+        self, schema_requests, tmp_path, change, removed_version
+    ):
+        phc = PEPHubClient(schema_cache=SchemaCache(str(tmp_path)))
+        phc.schema.get_cached("databio", "pep")
+        schema_requests["mock"].side_effect = None
+        schema_requests["mock"].return_value = Mock(status_code=202)
+        change(phc.schema)
+
+        # other processes using the same cache directory see the change too
+        for schema_cache in (phc.schema.cache, SchemaCache(str(tmp_path))):
+            assert schema_cache.get_latest_version("databio", "pep") is None
+            assert (schema_cache.get("databio", "pep", "2.1.0") is None) == (
+                removed_version is not None
+            )
+
+    def test_schema_without_versions(self, schema_requests, tmp_path):
+        schema_requests["versions"].clear()
+        phc = PEPHubClient(schema_cache=SchemaCache(str(tmp_path)))
+
+        with pytest.raises(ResponseError, match="doesn't have any version"):
+            phc.schema.get_cached("databio", "pep")
+
+    def test_cache_shared_by_threads(self, schema_requests, tmp_path):
+        phc = PEPHubClient(schema_cache=SchemaCache(str(tmp_path)))
+        phc.schema.get_cached("databio", "pep", "2.0.0")
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            schemas = list(
+                executor.map(
+                    lambda _: phc.schema.get_cached("databio", "pep", "2.0.0"),
+                    range(50),
+                )
+            )
+        assert all(schema["version"] == "2.0.0" for schema in schemas)
+        assert phc.schema.cache.stats().hits == 50
+
+    def test_offline_get(self, schema_requests, tmp_path):
+        PEPHubClient(schema_cache=SchemaCache(str(tmp_path))).schema.get_cached(
+            "databio", "pep"
+        )
+        schema_requests["mock"].reset_mock()
+
+        phc = PEPHubClient(schema_cache=SchemaCache(str(tmp_path)), mode="offline")
+        assert phc.schema.get("databio", "pep", "2.1.0")["version"] == "2.1.0"
+        # latest is resolved to the last known version, regardless of TTL
+        phc.schema.cache.latest_ttl = 0
+        with pytest.warns(StaleDataWarning, match=r"schema 'databio/pep' \(2.1.0\)"):
+            assert phc.schema.get("databio", "pep")["version"] == "2.1.0"
+        with pytest.raises(LocalDataNotFoundError, match="databio/pep:2.0.0"):
+            phc.schema.get("databio", "pep", "2.0.0")
+        assert not schema_requests["mock"].called
+
+    def test_prefer_local_get_is_cached(self, schema_requests, tmp_path):
+        phc = PEPHubClient(schema_cache=SchemaCache(str(tmp_path)), mode="prefer-local")
+
+        for _ in range(2):
+            assert phc.schema.get("databio", "pep", "2.0.0")["version"] == "2.0.0"
+        assert schema_requests["mock"].call_count == 1
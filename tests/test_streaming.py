@@ -0,0 +1,367 @@
+import json
+import os
+import tracemalloc
+import zipfile
+from unittest.mock import Mock
+
+import pandas as pd
+import pytest
+import yaml
+
+from pephubclient.exceptions import PEPExistsError, ResponseError
+from pephubclient.pephubclient import PEPHubClient
+from pephubclient.helpers import save_pep
+from pephubclient.models import ProjectDict
+from pephubclient.streaming import (
+    JSONStream,
+    DroppedIndexColumnsError,
+    ProjectFilter,
+    filter_project,
+    read_project,
+    write_project_tables,
+)
+
+PROJECT = {
+    "config": {
+        "pep_version": "2.1.0",
+        "name": "streamed",
+        "description": "ünïcode description",
+    },
+    "sample_list": [
+        {"sample_name": "pig_0h", "time": 0, "file_path": "source1"},
+        {"sample_name": "frög_1h", "time": 10, "file_path": "source,1"},
+        {"sample_name": "extra", "time": 1, "file_path": "source2", "extra": True},
+    ],
+    "subsample_list": [
+        [
+            {"sample_name": "pig_0h", "read": "r1"},
+            {"sample_name": "pig_0h", "read": "r2"},
+        ],
+        [{"sample_name": "frög_1h", "lane": 1}],
+    ],
+}
+
+
+def _chunks(document: dict, size: int):
+    content = json.dumps(document, ensure_ascii=False).encode("utf-8")
+    return [content[start : start + size] for start in range(0, len(content), size)]
+
+
+def _read(path) -> str:
+    with open(path, encoding="utf-8") as file:
+        return file.read()
+
+
+class TestJSONStream:
+    @pytest.mark.parametrize("chunk_size", [1, 3, 7, 1024])
+    def test_read_document(self, chunk_size):
+        document = {"a": [1, 22, 333, {"b": "ünï"}], "c": 12345, "d": None, "e": []}
+        stream = JSONStream(_chunks(document, chunk_size))
+        result = {}
+        for key in stream.iter_object_keys():
+            if key == "a":
+                result[key] = [stream.read_value() for _ in stream.iter_array()]
+            else:
+                result[key] = stream.read_value()
+
+        assert result == document
+
+    @pytest.mark.parametrize(
+        "content", [b'{"a": [1, 2', b'{"a" 1}', b'{"a": [1 2]}', b"[]"]
+    )
+    def test_incorrect_document(self, content):
+        stream = JSONStream([content])
+
+        with pytest.raises(ResponseError):
+            for key in stream.iter_object_keys():
+                for _ in stream.iter_array():
+                    stream.read_value()
+
+
+class TestWriteProjectTables:
+    @pytest.mark.parametrize("chunk_size", [1, 5, 65536])
+    def test_tables_match_pandas(self, tmp_path, chunk_size):
+        config = write_project_tables(_chunks(PROJECT, chunk_size), str(tmp_path))
+
+        assert _read(tmp_path / "sample_table.csv") == pd.DataFrame(
+            PROJECT["sample_list"]
+        ).to_csv(index=False)
+        for number, subsample in enumerate(PROJECT["subsample_list"], start=1):
+            assert _read(tmp_path / f"subsample_table{number}.csv") == pd.DataFrame(
+                subsample
+            ).to_csv(index=False)
+        assert config["sample_table"] == "sample_table.csv"
+        assert config["subsample_table"] == [
+            "subsample_table1.csv",
+            "subsample_table2.csv",
+        ]
+
+    def test_keys_in_any_order(self, tmp_path):
+        project = {
+            "sample_list": PROJECT["sample_list"],
+            "subsample_list": None,
+            "config": PROJECT["config"],
+        }
+        config = write_project_tables(_chunks(project, 16), str(tmp_path))
+
+        assert config["name"] == "streamed"
+        assert config["subsample_table"] == []
+        assert os.listdir(tmp_path) == ["sample_table.csv"]
+
+    def test_missing_samples(self, tmp_path):
+        with pytest.raises(ResponseError):
+            write_project_tables(_chunks({"config": {}}, 16), str(tmp_path))
+
+    def test_memory_is_bounded(self, tmp_path):
+        number_of_samples = 20000
+
+        def chunks():
+            yield b'{"config": {"name": "large"}, "subsample_list": [], "sample_list": ['
+            for number in range(number_of_samples):
+                separator = b"," if number else b""
+                yield separator + json.dumps(
+                    {"sample_name": f"sample{number}", "value": "x" * 50}
+                ).encode("utf-8")
+            yield b"]}"
+
+        tracemalloc.start()
+        write_project_tables(chunks(), str(tmp_path))
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        assert peak < 1024**2
+        assert len(_read(tmp_path / "sample_table.csv").splitlines()) == (
+            number_of_samples + 1
+        )
+
+
+class TestStreamingPull:
+    @pytest.fixture
+    def stream_mock(self, mocker):
+        return mocker.patch(
+            "requests.Session.request",
+            return_value=Mock(
+                status_code=200,
+                iter_content=Mock(return_value=_chunks(PROJECT, 10)),
+            ),
+        )
+
+    def test_pull(self, stream_mock, tmp_path):
+        PEPHubClient().pull("namespace/project:tag", output=str(tmp_path), stream=True)
+
+        project_path = tmp_path / "namespace_project_tag"
+        assert sorted(os.listdir(project_path)) == [
+            "sample_table.csv",
+            "streamed_config.yaml",
+            "subsample_table1.csv",
+            "subsample_table2.csv",
+        ]
+        with open(project_path / "streamed_config.yaml") as file:
+            config = yaml.safe_load(file)
+        assert config["sample_table"] == "sample_table.csv"
+        assert stream_mock.call_args.kwargs["stream"] is True
+        assert "raw=true" in stream_mock.call_args.kwargs["url"]
+
+    def test_pull_zip(self, stream_mock, tmp_path):
+        PEPHubClient().pull(
+            "namespace/project:tag", output=str(tmp_path), zip=True, stream=True
+        )
+
+        with zipfile.ZipFile(tmp_path / "namespace_project_tag.zip") as zip_file:
+            assert sorted(zip_file.namelist()) == [
+                "sample_table.csv",
+                "streamed_config.yaml",
+                "subsample_table1.csv",
+                "subsample_table2.csv",
+            ]
+        assert os.listdir(tmp_path) == ["namespace_project_tag.zip"]
+
+    def test_pull_zip_without_compression(self, stream_mock, tmp_path):
+        PEPHubClient().pull(
+            "namespace/project:tag",
+            output=str(tmp_path),
+            zip=True,
+            stream=True,
+            compression="store",
+        )
+
+        with zipfile.ZipFile(tmp_path / "namespace_project_tag.zip") as zip_file:
+            assert all(
+                info.compress_type == zipfile.ZIP_STORED for info in zip_file.infolist()
+            )
+
+    def test_pull_existing_project(self, stream_mock, tmp_path):
+        PEPHubClient().pull("namespace/project:tag", output=str(tmp_path), stream=True)
+        stream_mock.return_value.iter_content.return_value = _chunks(PROJECT, 10)
+
+        with pytest.raises(PEPExistsError):
+            PEPHubClient().pull(
+                "namespace/project:tag", output=str(tmp_path), stream=True
+            )
+        # temporary files are removed
+        assert len(os.listdir(tmp_path / "namespace_project_tag")) == 4
+
+    def test_pull_not_existing_project(self, mocker, tmp_path):
+        mocker.patch("requests.Session.request", return_value=Mock(status_code=404))
+
+        with pytest.raises(ResponseError):
+            PEPHubClient().pull(
+                "namespace/project:tag", output=str(tmp_path), stream=True
+            )
+
+
+class TestFilteredLoad:
+    def test_columns(self):
+        project = read_project(_chunks(PROJECT, 10), ProjectFilter(columns=["time"]))
+
+        assert project["config"] == PROJECT["config"]
+        assert project["sample_list"] == [
+            {"sample_name": "pig_0h", "time": 0},
+            {"sample_name": "frög_1h", "time": 10},
+            {"sample_name": "extra", "time": 1},
+        ]
+        # subsample tables without selected columns are dropped
+        assert project["subsample_list"] == []
+
+    @pytest.mark.parametrize(
+        "where",
+        [{"time": [0, 10]}, lambda sample: "extra" not in sample],
+    )
+    def test_where(self, where):
+        project = read_project(
+            _chunks(PROJECT, 10), ProjectFilter(columns=["read"], where=where)
+        )
+
+        assert [sample["sample_name"] for sample in project["sample_list"]] == [
+            "pig_0h",
+            "frög_1h",
+        ]
+        assert project["subsample_list"] == [PROJECT["subsample_list"][0]]
+
+    def test_subsamples_of_removed_samples(self):
+        project = read_project(
+            _chunks(PROJECT, 10), ProjectFilter(where={"sample_name": "frög_1h"})
+        )
+
+        assert project["sample_list"] == [PROJECT["sample_list"][1]]
+        assert project["subsample_list"] == [PROJECT["subsample_list"][1]]
+
+    @pytest.mark.parametrize("config_first", [True, False])
+    def test_index_columns_from_config(self, config_first):
+        config = {
+            "name": "indexed",
+            "sample_table_index": "id",
+            "subsample_table_index": ["id", "part"],
+        }
+        tables = {
+            "_sample_dict": [{"id": "a", "x": 1, "y": 2}, {"id": "b", "x": 3, "y": 4}],
+            "_subsample_list": [[{"id": "a", "part": 1, "x": 5, "y": 6}]],
+        }
+        document = (
+            {"_config": config, **tables}
+            if config_first
+            else {**tables, "_config": config}
+        )
+
+        if not config_first:
+            # index columns were dropped before config was read
+            with pytest.raises(DroppedIndexColumnsError) as err:
+                read_project(
+                    _chunks(document, 10), ProjectFilter(columns=["x"], where={"y": 2})
+                )
+            assert err.value.columns == ["id", "part"]
+
+        project = read_project(
+            _chunks(document, 10),
+            ProjectFilter(
+                columns=["x"] if config_first else ["x", "id", "part"],
+                where={"y": 2},
+            ),
+        )
+
+        assert project["_sample_dict"] == [{"id": "a", "x": 1}]
+        assert project["_subsample_list"] == [[{"id": "a", "part": 1, "x": 5}]]
+
+    def test_dropped_index_columns_are_requested_again(self, mocker):
+        document = {
+            "_sample_dict": [{"id": "a", "x": 1, "y": 2}],
+            "_config": {"name": "indexed", "sample_table_index": "id"},
+            "_subsample_list": [],
+        }
+        request_mock = mocker.patch(
+            "requests.Session.request",
+            side_effect=lambda **kwargs: Mock(
+                status_code=200,
+                iter_content=Mock(return_value=_chunks(document, 10)),
+            ),
+        )
+        project = PEPHubClient().load_raw_pep("namespace/project:tag", columns=["x"])
+
+        assert project["_sample_dict"] == [{"id": "a", "x": 1}]
+        assert request_mock.call_count == 2
+
+    def test_filter_project_in_memory(self):
+        project_filter = ProjectFilter(columns=["file_path"], where={"time": 10})
+
+        assert filter_project(
+            ProjectDict.to_raw_dict(PROJECT), project_filter
+        ) == ProjectDict.to_raw_dict(read_project(_chunks(PROJECT, 7), project_filter))
+
+    def test_incorrect_where(self):
+        with pytest.raises(TypeError):
+            ProjectFilter(where="time == 0")
+
+    @pytest.mark.parametrize("config_first", [True, False])
+    def test_dropped_columns_are_not_stored(self, config_first):
+        number_of_samples = 2000
+        config = b'"config": {"name": "wide"}'
+
+        def chunks():
+            yield b"{" + (config + b", " if config_first else b"")
+            yield b'"subsample_list": [], "sample_list": ['
+            for number in range(number_of_samples):
+                sample = {f"column{column}": "x" * 20 for column in range(50)}
+                sample["sample_name"] = f"sample{number}"
+                yield (b"," if number else b"") + json.dumps(sample).encode("utf-8")
+            yield b"]" + (b"" if config_first else b", " + config) + b"}"
+
+        def peak_memory(project_filter: ProjectFilter) -> int:
+            tracemalloc.start()
+            read_project(chunks(), project_filter)
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            return peak
+
+        assert peak_memory(ProjectFilter(columns=["column0"])) * 5 < peak_memory(
+            ProjectFilter()
+        )
+
+    def test_load_project(self, mocker):
+        request_mock = mocker.patch(
+            "requests.Session.request",
+            return_value=Mock(
+                status_code=200,
+                iter_content=Mock(return_value=_chunks(PROJECT, 10)),
+            ),
+        )
+
+        project = PEPHubClient().load_project(
+            "namespace/project:tag", columns=["file_path"], where={"time": 1}
+        )
+
+        assert list(project.sample_table.index) == ["extra"]
+        assert "extra" not in project.sample_table.columns
+        assert request_mock.call_args.kwargs["stream"] is True
+
+    def test_load_local_project(self, tmp_path):
+        save_pep(
+            ProjectDict.to_raw_dict(PROJECT),
+            reg_path="namespace/project:tag",
+            project_path=str(tmp_path),
+        )
+
+        project = PEPHubClient().load_project(
+            str(tmp_path / "namespace_project_tag"), columns=["time"]
+        )
+
+        assert list(project.sample_table.columns) == ["sample_name", "time"]